@@ -80,30 +80,66 @@ except TypeError as e:
 
 print("\n--- Implementación personalizada de Tabla Hash ---")
 
+# Marcador para distinguir "sin valor por defecto" de por_defecto=None
+_SIN_VALOR = object()
+
 class TablaHash:
-    def __init__(self, tamaño=10):
+    def __init__(self, tamaño=10, incremental=False, paso_migracion=4):
         # Inicializar con una lista de "cubetas" vacías
         self.cubetas = [[] for _ in range(tamaño)]
         self.tamaño = tamaño
         self.elementos = 0
+        
+        # Redimensionamiento incremental: las cubetas antiguas conviven con las
+        # nuevas y cada operación migra como mucho `paso_migracion` cubetas
+        self.incremental = incremental
+        self.paso_migracion = paso_migracion
+        self.cubetas_antiguas = None
+        self.indice_migracion = 0
     
     def _hash(self, clave):
         # Función hash simple: convertir la clave a un índice
         return hash(clave) % self.tamaño
     
+    def _cubeta_antigua(self, clave):
+        # Cubeta de la tabla antigua donde podría estar la clave (None si ya se migró)
+        if self.cubetas_antiguas is None:
+            return None
+        indice = hash(clave) % len(self.cubetas_antiguas)
+        if indice < self.indice_migracion:
+            return None
+        return self.cubetas_antiguas[indice]
+    
     def insertar(self, clave, valor):
+        self._migrar_paso()
+        
         # Calcular el índice usando la función hash
         indice = self._hash(clave)
         
+        # En modo incremental las cubetas nuevas se crean bajo demanda
+        cubeta = self.cubetas[indice]
+        if cubeta is None:
+            cubeta = self.cubetas[indice] = []
+        
         # Buscar si la clave ya existe en la cubeta
-        for i, (k, v) in enumerate(self.cubetas[indice]):
+        for i, (k, v) in enumerate(cubeta):
             if k == clave:
                 # Actualizar el valor si la clave existe
-                self.cubetas[indice][i] = (clave, valor)
+                cubeta[i] = (clave, valor)
                 return
         
+        # Durante una migración la clave puede seguir en la tabla antigua
+        cubeta_antigua = self._cubeta_antigua(clave)
+        if cubeta_antigua:
+            for i, (k, v) in enumerate(cubeta_antigua):
+                if k == clave:
+                    # Moverla a la tabla nueva con el valor actualizado
+                    del cubeta_antigua[i]
+                    cubeta.append((clave, valor))
+                    return
+        
         # Si la clave no existe, agregarla a la cubeta
-        self.cubetas[indice].append((clave, valor))
+        cubeta.append((clave, valor))
         self.elementos += 1
         
         # Verificar si es necesario redimensionar
@@ -111,28 +147,36 @@ class TablaHash:
             self._redimensionar()
     
     def obtener(self, clave):
+        self._migrar_paso()
+        
         # Calcular el índice usando la función hash
         indice = self._hash(clave)
         
-        # Buscar la clave en la cubeta
-        for k, v in self.cubetas[indice]:
-            if k == clave:
-                return v
+        # Buscar la clave en la cubeta (y en la tabla antigua si se está migrando)
+        for cubeta in (self.cubetas[indice], self._cubeta_antigua(clave)):
+            if cubeta:
+                for k, v in cubeta:
+                    if k == clave:
+                        return v
         
         # Si la clave no se encuentra, lanzar excepción
         raise KeyError(f"Clave no encontrada: {clave}")
     
     def eliminar(self, clave):
+        self._migrar_paso()
+        
         # Calcular el índice usando la función hash
         indice = self._hash(clave)
         
-        # Buscar la clave en la cubeta
-        for i, (k, v) in enumerate(self.cubetas[indice]):
-            if k == clave:
-                # Eliminar el par clave-valor
-                del self.cubetas[indice][i]
-                self.elementos -= 1
-                return
+        # Buscar la clave en la cubeta (y en la tabla antigua si se está migrando)
+        for cubeta in (self.cubetas[indice], self._cubeta_antigua(clave)):
+            if cubeta:
+                for i, (k, v) in enumerate(cubeta):
+                    if k == clave:
+                        # Eliminar el par clave-valor
+                        del cubeta[i]
+                        self.elementos -= 1
+                        return
         
         # Si la clave no se encuentra, lanzar excepción
         raise KeyError(f"Clave no encontrada: {clave}")
@@ -141,21 +185,40 @@ class TablaHash:
         # Calcular el índice usando la función hash
         indice = self._hash(clave)
         
-        # Buscar la clave en la cubeta
-        for k, v in self.cubetas[indice]:
-            if k == clave:
-                return True
+        # Buscar la clave en la cubeta (y en la tabla antigua si se está migrando)
+        for cubeta in (self.cubetas[indice], self._cubeta_antigua(clave)):
+            if cubeta:
+                for k, v in cubeta:
+                    if k == clave:
+                        return True
         
         return False
     
     def _redimensionar(self):
         # Duplicar el tamaño de la tabla
         nuevo_tamaño = self.tamaño * 2
+        
+        if self.incremental:
+            # Terminar una migración pendiente antes de empezar otra
+            self._migrar_paso(len(self.cubetas_antiguas or ()))
+            
+            # La tabla actual pasa a ser la antigua y se migra poco a poco.
+            # Crear cientos de miles de listas vacías también es un pico de
+            # latencia, así que la tabla nueva empieza con cubetas None
+            self.cubetas_antiguas = self.cubetas
+            self.indice_migracion = 0
+            self.cubetas = [None] * nuevo_tamaño
+            self.tamaño = nuevo_tamaño
+            return
+        
+        self._rehash(nuevo_tamaño)
+    
+    def _rehash(self, nuevo_tamaño):
         nuevas_cubetas = [[] for _ in range(nuevo_tamaño)]
         
         # Rehash de todos los elementos
         for cubeta in self.cubetas:
-            for clave, valor in cubeta:
+            for clave, valor in cubeta or ():
                 indice = hash(clave) % nuevo_tamaño
                 nuevas_cubetas[indice].append((clave, valor))
         
@@ -163,12 +226,94 @@ class TablaHash:
         self.cubetas = nuevas_cubetas
         self.tamaño = nuevo_tamaño
     
+    def _migrar_paso(self, cantidad=None):
+        # Mover un número acotado de cubetas de la tabla antigua a la nueva
+        if self.cubetas_antiguas is None:
+            return
+        
+        if cantidad is None:
+            cantidad = self.paso_migracion
+        fin = min(self.indice_migracion + cantidad, len(self.cubetas_antiguas))
+        
+        for i in range(self.indice_migracion, fin):
+            for clave, valor in self.cubetas_antiguas[i] or ():
+                indice = self._hash(clave)
+                if self.cubetas[indice] is None:
+                    self.cubetas[indice] = []
+                self.cubetas[indice].append((clave, valor))
+            self.cubetas_antiguas[i] = None
+        self.indice_migracion = fin
+        
+        # Migración terminada: liberar la tabla antigua
+        if fin == len(self.cubetas_antiguas):
+            self.cubetas_antiguas = None
+            self.indice_migracion = 0
+    
+    def insertar_lote(self, pares):
+        # Materializar el iterable para conocer cuántos elementos llegan
+        pares = list(pares)
+        
+        # El lote se inserta en una sola tabla: terminar la migración pendiente
+        self._migrar_paso(len(self.cubetas_antiguas or ()))
+        
+        # Dimensionar la tabla una sola vez para todo el lote en lugar de
+        # duplicarla varias veces mientras se inserta
+        necesario = int((self.elementos + len(pares)) / 0.7) + 1
+        if necesario > self.tamaño:
+            self._rehash(max(necesario, self.tamaño * 2))
+        
+        # Insertar todo en una pasada, con las variables en locales
+        cubetas = self.cubetas
+        tamaño = self.tamaño
+        nuevos = 0
+        for clave, valor in pares:
+            indice = hash(clave) % tamaño
+            cubeta = cubetas[indice]
+            if cubeta is None:
+                cubeta = cubetas[indice] = []
+            
+            for i, (k, v) in enumerate(cubeta):
+                if k == clave:
+                    # Actualizar el valor si la clave existe (o se repite en el lote)
+                    cubeta[i] = (clave, valor)
+                    break
+            else:
+                cubeta.append((clave, valor))
+                nuevos += 1
+        
+        self.elementos += nuevos
+    
+    def obtener_lote(self, claves, por_defecto=_SIN_VALOR):
+        # Terminar la migración pendiente para buscar en una sola tabla
+        self._migrar_paso(len(self.cubetas_antiguas or ()))
+        
+        cubetas = self.cubetas
+        tamaño = self.tamaño
+        resultados = []
+        
+        # Los resultados se devuelven en el mismo orden que las claves
+        for clave in claves:
+            for k, v in cubetas[hash(clave) % tamaño] or ():
+                if k == clave:
+                    resultados.append(v)
+                    break
+            else:
+                if por_defecto is _SIN_VALOR:
+                    raise KeyError(f"Clave no encontrada: {clave}")
+                resultados.append(por_defecto)
+        
+        return resultados
+    
     def __str__(self):
         # Representación en cadena de la tabla hash
         resultado = "{\n"
         for i, cubeta in enumerate(self.cubetas):
             if cubeta:
                 resultado += f"  Cubeta {i}: {cubeta}\n"
+        if self.cubetas_antiguas is not None:
+            for i, cubeta in enumerate(self.cubetas_antiguas):
+                if cubeta:
+                    resultado += f"  Cubeta antigua {i}: {cubeta}\n"
         resultado += "}"
         return resultado
 
@@ -201,6 +346,629 @@ tabla.eliminar("profesion")
 print("Tabla hash después de eliminar 'profesion':")
 print(tabla)
 
+# Redimensionamiento incremental: en lugar de rehacer toda la tabla en una sola
+# inserción, cada operación migra unas pocas cubetas. La peor latencia de una
+# inserción deja de crecer con el tamaño de la tabla.
+import time
+
+def peor_latencia_insercion(tabla, n):
+    peor = 0
+    for i in range(n):
+        inicio = time.perf_counter()
+        tabla.insertar(i, i)
+        peor = max(peor, time.perf_counter() - inicio)
+    return peor
+
+n = 200000
+print(f"\nPeor inserción (redimensionado completo): "
+      f"{peor_latencia_insercion(TablaHash(), n) * 1000:.3f} ms")
+tabla_incremental = TablaHash(incremental=True)
+print(f"Peor inserción (redimensionado incremental): "
+      f"{peor_latencia_insercion(tabla_incremental, n) * 1000:.3f} ms")
+print(f"Búsqueda durante/después de la migración: {tabla_incremental.obtener(12345)}")
+
+# Carga y consulta por lotes: la tabla se dimensiona una vez para todo el lote
+pares = [(f"clave{i}", i) for i in range(n)]
+
+inicio = time.perf_counter()
+tabla_individual = TablaHash()
+for clave, valor in pares:
+    tabla_individual.insertar(clave, valor)
+print(f"\nInserción de {n} claves una a una: {time.perf_counter() - inicio:.3f} s")
+
+inicio = time.perf_counter()
+tabla_lote = TablaHash()
+tabla_lote.insertar_lote(pares)
+print(f"Inserción de {n} claves con insertar_lote: {time.perf_counter() - inicio:.3f} s")
+
+print(f"obtener_lote: {tabla_lote.obtener_lote(['clave3', 'clave1', 'no_existe'], por_defecto=None)}")
+
+################################################################################
+## Variante: Direccionamiento abierto (sondeo lineal)
+################################################################################
+
+print("\n--- Tabla Hash con direccionamiento abierto ---")
+
+"""
+En lugar de guardar listas de tuplas (clave, valor) en cada cubeta, el
+direccionamiento abierto guarda todo en arreglos paralelos (claves, valores y
+hashes). Si la posición calculada está ocupada, se prueba la siguiente
+(sondeo lineal). Así no se crea una tupla por inserción y los datos quedan
+contiguos en memoria, lo que aprovecha mejor la caché del procesador.
+
+Al eliminar no se puede vaciar la posición (rompería la cadena de sondeo),
+por eso se marca con una "lápida" (tombstone) que las búsquedas saltan y
+las inserciones pueden reutilizar.
+"""
+
+# Marcadores para posiciones vacías y eliminadas
+_VACIO = object()
+_LAPIDA = object()
+
+class TablaHashDireccionAbierta:
+    def __init__(self, tamaño=8):
+        # La capacidad es siempre potencia de 2 para usar una máscara en vez de %
+        capacidad = 8
+        while capacidad < tamaño:
+            capacidad *= 2
+        self._inicializar(capacidad)
+
+    def _inicializar(self, capacidad):
+        # Arreglos paralelos: claves, valores y hashes cacheados
+        self.claves = [_VACIO] * capacidad
+        self.valores = [None] * capacidad
+        self.hashes = [0] * capacidad
+        self.tamaño = capacidad
+        self.mascara = capacidad - 1
+        self.elementos = 0
+        self.lapidas = 0
+
+    def _buscar_posicion(self, clave, h):
+        # Devuelve la posición de la clave o -1 si no está
+        claves = self.claves
+        hashes = self.hashes
+        mascara = self.mascara
+        i = h & mascara
+        while True:
+            k = claves[i]
+            if k is _VACIO:
+                return -1
+            # Comparar primero el hash cacheado evita llamar a __eq__ en colisiones
+            if k is not _LAPIDA and hashes[i] == h and (k is clave or k == clave):
+                return i
+            i = (i + 1) & mascara
+
+    def insertar(self, clave, valor):
+        h = hash(clave)
+        claves = self.claves
+        hashes = self.hashes
+        mascara = self.mascara
+        i = h & mascara
+        primera_lapida = -1
+
+        while True:
+            k = claves[i]
+            if k is _VACIO:
+                break
+            if k is _LAPIDA:
+                # Recordar la primera lápida para reutilizarla
+                if primera_lapida < 0:
+                    primera_lapida = i
+            elif hashes[i] == h and (k is clave or k == clave):
+                # Actualizar el valor si la clave existe
+                self.valores[i] = valor
+                return
+            i = (i + 1) & mascara
+
+        if primera_lapida >= 0:
+            i = primera_lapida
+            self.lapidas -= 1
+
+        claves[i] = clave
+        self.valores[i] = valor
+        hashes[i] = h
+        self.elementos += 1
+
+        # Las lápidas también alargan las cadenas de sondeo, así que cuentan
+        if self.elementos + self.lapidas > self.tamaño * 0.7:
+            self._redimensionar()
+
+    def obtener(self, clave):
+        i = self._buscar_posicion(clave, hash(clave))
+        if i < 0:
+            raise KeyError(f"Clave no encontrada: {clave}")
+        return self.valores[i]
+
+    def eliminar(self, clave):
+        i = self._buscar_posicion(clave, hash(clave))
+        if i < 0:
+            raise KeyError(f"Clave no encontrada: {clave}")
+
+        # Dejar una lápida en lugar de vaciar la posición
+        self.claves[i] = _LAPIDA
+        self.valores[i] = None
+        self.elementos -= 1
+        self.lapidas += 1
+
+    def contiene(self, clave):
+        return self._buscar_posicion(clave, hash(clave)) >= 0
+
+    def _redimensionar(self):
+        claves, valores, hashes = self.claves, self.valores, self.hashes
+
+        # Duplicar solo si hay muchos elementos vivos; si sobran lápidas basta con limpiar
+        nueva_capacidad = self.tamaño * 2 if self.elementos > self.tamaño * 0.35 else self.tamaño
+        self._inicializar(nueva_capacidad)
+
+        # Reinsertar usando los hashes cacheados (no se vuelve a llamar a hash())
+        nuevas_claves, nuevos_valores, nuevos_hashes = self.claves, self.valores, self.hashes
+        mascara = self.mascara
+        for k, v, h in zip(claves, valores, hashes):
+            if k is _VACIO or k is _LAPIDA:
+                continue
+            i = h & mascara
+            while nuevas_claves[i] is not _VACIO:
+                i = (i + 1) & mascara
+            nuevas_claves[i] = k
+            nuevos_valores[i] = v
+            nuevos_hashes[i] = h
+            self.elementos += 1
+
+    def __len__(self):
+        return self.elementos
+
+    def __str__(self):
+        pares = [f"{k!r}: {v!r}" for k, v in zip(self.claves, self.valores)
+                 if k is not _VACIO and k is not _LAPIDA]
+        return "{" + ", ".join(pares) + "}"
+
+# Ejemplo de uso: misma API que TablaHash
+tabla_abierta = TablaHashDireccionAbierta()
+tabla_abierta.insertar("nombre", "Carlos")
+tabla_abierta.insertar("edad", 35)
+tabla_abierta.insertar("ciudad", "Barcelona")
+tabla_abierta.insertar("profesion", "Programador")
+print(f"Tabla con direccionamiento abierto: {tabla_abierta}")
+print(f"Edad: {tabla_abierta.obtener('edad')}")
+
+tabla_abierta.eliminar("profesion")
+print(f"¿Contiene 'profesion' tras eliminarla? {tabla_abierta.contiene('profesion')}")
+print(f"¿Contiene 'ciudad'? {tabla_abierta.contiene('ciudad')}")
+
+# Muchas inserciones y eliminaciones para provocar redimensionamientos
+for n in range(1000):
+    tabla_abierta.insertar(n, n * n)
+for n in range(0, 1000, 2):
+    tabla_abierta.eliminar(n)
+print(f"Elementos: {len(tabla_abierta)}, capacidad: {tabla_abierta.tamaño}, "
+      f"obtener(999): {tabla_abierta.obtener(999)}")
+
+################################################################################
+## Variante: Tabla Hash concurrente por fragmentos (sharding)
+################################################################################
+
+print("\n--- Tabla Hash concurrente por fragmentos ---")
+
+"""
+TablaHash no tiene candados: compartirla entre hilos obliga a protegerla con un
+único candado global y todos los hilos esperan en él. Una tabla fragmentada
+reparte las claves entre N fragmentos según los bits bajos del hash; cada
+fragmento tiene su propio candado y se redimensiona por separado, así que dos
+hilos que escriben en fragmentos distintos no se bloquean.
+
+Las lecturas no toman candado: cada cubeta es una tupla inmutable y las
+escrituras la sustituyen por una tupla nueva (copia en escritura). Un lector
+siempre ve una cubeta completa, la anterior o la nueva, nunca una a medias.
+"""
+
+import threading
+
+class _Fragmento:
+    def __init__(self, tamaño):
+        self.candado = threading.Lock()
+        self.cubetas = [()] * tamaño
+        self.elementos = 0
+
+class TablaHashConcurrente:
+    def __init__(self, fragmentos=16, tamaño=8):
+        # El número de fragmentos se redondea a potencia de 2 (1 sigue siendo 1,
+        # un solo candado) para elegirlo con una máscara
+        bits = (fragmentos - 1).bit_length()
+        self._bits = bits
+        self._mascara = (1 << bits) - 1
+        self._fragmentos = [_Fragmento(tamaño) for _ in range(1 << bits)]
+
+    def _localizar(self, clave):
+        # Bits bajos del hash para el fragmento, el resto para la cubeta
+        h = hash(clave)
+        return self._fragmentos[h & self._mascara], h >> self._bits
+
+    def obtener(self, clave):
+        fragmento, h = self._localizar(clave)
+        # Lectura sin candado: se toma una referencia a la lista de cubetas actual
+        cubetas = fragmento.cubetas
+        for k, v in cubetas[h % len(cubetas)]:
+            if k == clave:
+                return v
+        raise KeyError(f"Clave no encontrada: {clave}")
+
+    def contiene(self, clave):
+        fragmento, h = self._localizar(clave)
+        cubetas = fragmento.cubetas
+        for k, v in cubetas[h % len(cubetas)]:
+            if k == clave:
+                return True
+        return False
+
+    def insertar(self, clave, valor):
+        fragmento, h = self._localizar(clave)
+        with fragmento.candado:
+            self._insertar_en(fragmento, clave, valor, h)
+
+    def _insertar_en(self, fragmento, clave, valor, h):
+        # Debe llamarse con el candado del fragmento tomado
+        cubetas = fragmento.cubetas
+        indice = h % len(cubetas)
+        cubeta = cubetas[indice]
+
+        for i, (k, v) in enumerate(cubeta):
+            if k == clave:
+                # Sustituir la cubeta completa en lugar de modificarla
+                cubetas[indice] = cubeta[:i] + ((clave, valor),) + cubeta[i + 1:]
+                return
+
+        cubetas[indice] = cubeta + ((clave, valor),)
+        fragmento.elementos += 1
+
+        if fragmento.elementos > len(cubetas) * 0.7:
+            self._redimensionar(fragmento)
+
+    def obtener_o_insertar(self, clave, valor):
+        # Devuelve el valor existente o inserta `valor` de forma atómica
+        fragmento, h = self._localizar(clave)
+        with fragmento.candado:
+            cubetas = fragmento.cubetas
+            for k, v in cubetas[h % len(cubetas)]:
+                if k == clave:
+                    return v
+            self._insertar_en(fragmento, clave, valor, h)
+            return valor
+
+    def eliminar(self, clave):
+        fragmento, h = self._localizar(clave)
+        with fragmento.candado:
+            cubetas = fragmento.cubetas
+            indice = h % len(cubetas)
+            cubeta = cubetas[indice]
+            for i, (k, v) in enumerate(cubeta):
+                if k == clave:
+                    cubetas[indice] = cubeta[:i] + cubeta[i + 1:]
+                    fragmento.elementos -= 1
+                    return
+        raise KeyError(f"Clave no encontrada: {clave}")
+
+    def _redimensionar(self, fragmento):
+        # Solo se redimensiona este fragmento; los demás siguen trabajando
+        nuevo_tamaño = len(fragmento.cubetas) * 2
+        nuevas = [[] for _ in range(nuevo_tamaño)]
+        for cubeta in fragmento.cubetas:
+            for clave, valor in cubeta:
+                nuevas[(hash(clave) >> self._bits) % nuevo_tamaño].append((clave, valor))
+
+        # Publicar la tabla nueva con una sola asignación
+        fragmento.cubetas = [tuple(cubeta) for cubeta in nuevas]
+
+    def __len__(self):
+        return sum(fragmento.elementos for fragmento in self._fragmentos)
+
+# Ejemplo de uso: misma API que TablaHash más obtener_o_insertar
+tabla_concurrente = TablaHashConcurrente(fragmentos=4)
+tabla_concurrente.insertar("nombre", "Carlos")
+print(f"obtener_o_insertar existente: {tabla_concurrente.obtener_o_insertar('nombre', 'Ana')}")
+print(f"obtener_o_insertar nueva: {tabla_concurrente.obtener_o_insertar('ciudad', 'Madrid')}")
+print(f"Elementos: {len(tabla_concurrente)}")
+
+def benchmark_concurrente(operaciones=200000, hilos=(1, 2, 4, 8), proporcion_lecturas=0.8):
+    '''
+    Mide el rendimiento (operaciones por segundo) al aumentar el número de hilos:
+    TablaHash protegida por un candado global frente a TablaHashConcurrente con
+    un solo fragmento (la misma estructura con un único candado) y con 16.
+
+    Con el GIL de CPython los hilos no ejecutan bytecode en paralelo, así que la
+    mejora viene de evitar la contención en el candado; en builds sin GIL
+    (free-threaded) los fragmentos permiten escalar con los núcleos.
+    '''
+    import random
+
+    claves = [random.randrange(operaciones) for _ in range(operaciones)]
+    lecturas = [random.random() < proporcion_lecturas for _ in range(operaciones)]
+
+    def con_candado_global(tabla, candado, inicio, fin):
+        for i in range(inicio, fin):
+            with candado:
+                if lecturas[i]:
+                    tabla.contiene(claves[i])
+                else:
+                    tabla.insertar(claves[i], i)
+
+    def con_fragmentos(tabla, inicio, fin):
+        for i in range(inicio, fin):
+            if lecturas[i]:
+                tabla.contiene(claves[i])
+            else:
+                tabla.insertar(claves[i], i)
+
+    def medir(objetivo, argumentos, n_hilos):
+        por_hilo = operaciones // n_hilos
+        trabajadores = [
+            threading.Thread(target=objetivo, args=(*argumentos, h * por_hilo, (h + 1) * por_hilo))
+            for h in range(n_hilos)
+        ]
+        inicio = time.perf_counter()
+        for t in trabajadores:
+            t.start()
+        for t in trabajadores:
+            t.join()
+        return por_hilo * n_hilos / (time.perf_counter() - inicio)
+
+    print(f"{'Hilos':>5} | {'Candado global (ops/s)':>22} | {'1 fragmento (ops/s)':>20} | {'16 fragmentos (ops/s)':>21}")
+    for n_hilos in hilos:
+        global_ops = medir(con_candado_global, (TablaHash(), threading.Lock()), n_hilos)
+        un_fragmento_ops = medir(con_fragmentos, (TablaHashConcurrente(fragmentos=1),), n_hilos)
+        fragmentada_ops = medir(con_fragmentos, (TablaHashConcurrente(),), n_hilos)
+        print(f"{n_hilos:>5} | {global_ops:>22,.0f} | {un_fragmento_ops:>20,.0f} | {fragmentada_ops:>21,.0f}")
+
+print("\nEscalado con el número de hilos:")
+benchmark_concurrente(operaciones=40000, hilos=(1, 2, 4))
+
+################################################################################
+## Variante: Tabla Hash persistente en disco con mmap
+################################################################################
+
+print("\n--- Tabla Hash persistente (mmap) ---")
+
+"""
+Reconstruir una tabla en cada arranque es caro. Esta variante guarda las
+posiciones en un archivo binario de formato fijo (cabecera + posiciones de
+tamaño constante) y lo accede con mmap:
+
+- Abrir una tabla existente es O(1): solo se lee la cabecera y el sistema
+  operativo carga las páginas bajo demanda al consultarlas.
+- Varios procesos lectores que abren el mismo archivo comparten las mismas
+  páginas de la caché del sistema, sin copias.
+
+Usa direccionamiento abierto con sondeo lineal y lápidas, como
+TablaHashDireccionAbierta. Las claves y valores son bytes de ancho máximo fijo
+o números de 8 bytes ("int" o "float"). El hash no puede ser hash() porque
+cambia entre procesos (PYTHONHASHSEED), así que se usa blake2b.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+class TablaHashPersistente:
+    MAGIA = b"TABLAHSH"
+    # magia, versión, tipo clave, tipo valor, ancho clave, ancho valor,
+    # capacidad, elementos, lápidas
+    CABECERA = struct.Struct("<8sHBBIIQQQ")
+    TIPOS = {"bytes": 0, "int": 1, "float": 2}
+
+    VACIO, OCUPADO, LAPIDA = 0, 1, 2
+    # Estado de la posición y hash cacheado, al principio de cada posición
+    ESTADO = struct.Struct("<BQ")
+
+    def __init__(self, ruta, solo_lectura=False):
+        # Abrir una tabla existente: solo se lee la cabecera
+        self.ruta = ruta
+        self.solo_lectura = solo_lectura
+        self._abrir()
+
+    @classmethod
+    def crear(cls, ruta, capacidad=1024, tipo_clave="bytes", ancho_clave=32,
+              tipo_valor="bytes", ancho_valor=32):
+        # Crear el archivo con todas las posiciones vacías (a cero)
+        capacidad = max(capacidad, 8)
+        slot = cls._formato_posicion(tipo_clave, ancho_clave, tipo_valor, ancho_valor)
+        with open(ruta, "wb") as archivo:
+            archivo.write(cls.CABECERA.pack(
+                cls.MAGIA, 1, cls.TIPOS[tipo_clave], cls.TIPOS[tipo_valor],
+                ancho_clave, ancho_valor, capacidad, 0, 0))
+            archivo.truncate(cls.CABECERA.size + capacidad * slot.size)
+        return cls(ruta)
+
+    @classmethod
+    def _formato_posicion(cls, tipo_clave, ancho_clave, tipo_valor, ancho_valor):
+        def campo(tipo, ancho):
+            # bytes: longitud + contenido de ancho fijo; números: 8 bytes
+            return {"bytes": f"H{ancho}s", "int": "q", "float": "d"}[tipo]
+        return struct.Struct("<BQ" + campo(tipo_clave, ancho_clave) + campo(tipo_valor, ancho_valor))
+
+    def _abrir(self):
+        self._archivo = open(self.ruta, "rb" if self.solo_lectura else "r+b")
+        acceso = mmap.ACCESS_READ if self.solo_lectura else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._archivo.fileno(), 0, access=acceso)
+
+        (magia, _, tipo_clave, tipo_valor, self.ancho_clave, self.ancho_valor,
+         self.capacidad, self.elementos, self.lapidas) = self.CABECERA.unpack_from(self._mm, 0)
+        if magia != self.MAGIA:
+            self.cerrar()
+            raise ValueError(f"{self.ruta} no es una tabla hash persistente")
+
+        nombres = {codigo: nombre for nombre, codigo in self.TIPOS.items()}
+        self.tipo_clave = nombres[tipo_clave]
+        self.tipo_valor = nombres[tipo_valor]
+        self._posicion = self._formato_posicion(
+            self.tipo_clave, self.ancho_clave, self.tipo_valor, self.ancho_valor)
+
+    def _guardar_cabecera(self):
+        self.CABECERA.pack_into(
+            self._mm, 0, self.MAGIA, 1, self.TIPOS[self.tipo_clave], self.TIPOS[self.tipo_valor],
+            self.ancho_clave, self.ancho_valor, self.capacidad, self.elementos, self.lapidas)
+
+    def _codificar(self, tipo, ancho, dato):
+        # Convierte una clave o valor en los campos que se guardan en la posición
+        if tipo == "bytes":
+            if not isinstance(dato, bytes):
+                raise TypeError(f"Se esperaban bytes, no {type(dato).__name__}")
+            if len(dato) > ancho:
+                raise ValueError(f"Dato de {len(dato)} bytes supera el ancho fijo de {ancho}")
+            return (len(dato), dato)
+        return (dato,)
+
+    def _decodificar(self, tipo, campos):
+        if tipo == "bytes":
+            longitud, dato = campos
+            return dato[:longitud]
+        return campos[0]
+
+    def _hash(self, campos_clave):
+        # Hash estable entre procesos a partir de la representación binaria
+        if self.tipo_clave == "bytes":
+            binario = campos_clave[1]
+        else:
+            binario = struct.pack("<d" if self.tipo_clave == "float" else "<q", campos_clave[0])
+        return int.from_bytes(hashlib.blake2b(binario, digest_size=8).digest(), "little")
+
+    def _desplazamiento(self, i):
+        return self.CABECERA.size + i * self._posicion.size
+
+    def _buscar_posicion(self, campos_clave, h):
+        # Devuelve (posición de la clave o -1, primera posición libre para insertar)
+        mm = self._mm
+        n_campos_clave = len(campos_clave)
+        i = h % self.capacidad
+        primera_libre = -1
+        while True:
+            desplazamiento = self._desplazamiento(i)
+            estado, h_guardado = self.ESTADO.unpack_from(mm, desplazamiento)
+            if estado == self.VACIO:
+                return -1, (primera_libre if primera_libre >= 0 else i)
+            if estado == self.LAPIDA:
+                if primera_libre < 0:
+                    primera_libre = i
+            elif h_guardado == h:
+                campos = self._posicion.unpack_from(mm, desplazamiento)
+                guardada = campos[2:2 + n_campos_clave]
+                if self._decodificar(self.tipo_clave, guardada) == self._decodificar(self.tipo_clave, campos_clave):
+                    return i, primera_libre
+            i = (i + 1) % self.capacidad
+
+    def insertar(self, clave, valor):
+        if self.solo_lectura:
+            raise PermissionError("La tabla está abierta en modo solo lectura")
+
+        campos_clave = self._codificar(self.tipo_clave, self.ancho_clave, clave)
+        campos_valor = self._codificar(self.tipo_valor, self.ancho_valor, valor)
+        h = self._hash(campos_clave)
+
+        i, libre = self._buscar_posicion(campos_clave, h)
+        if i < 0:
+            i = libre
+            if self.ESTADO.unpack_from(self._mm, self._desplazamiento(i))[0] == self.LAPIDA:
+                self.lapidas -= 1
+            self.elementos += 1
+
+        self._posicion.pack_into(self._mm, self._desplazamiento(i),
+                                 self.OCUPADO, h, *campos_clave, *campos_valor)
+        self._guardar_cabecera()
+
+        if self.elementos + self.lapidas > self.capacidad * 0.7:
+            self._redimensionar()
+
+    def obtener(self, clave):
+        campos_clave = self._codificar(self.tipo_clave, self.ancho_clave, clave)
+        i, _ = self._buscar_posicion(campos_clave, self._hash(campos_clave))
+        if i < 0:
+            raise KeyError(f"Clave no encontrada: {clave}")
+        campos = self._posicion.unpack_from(self._mm, self._desplazamiento(i))
+        return self._decodificar(self.tipo_valor, campos[2 + len(campos_clave):])
+
+    def contiene(self, clave):
+        campos_clave = self._codificar(self.tipo_clave, self.ancho_clave, clave)
+        return self._buscar_posicion(campos_clave, self._hash(campos_clave))[0] >= 0
+
+    def eliminar(self, clave):
+        if self.solo_lectura:
+            raise PermissionError("La tabla está abierta en modo solo lectura")
+
+        campos_clave = self._codificar(self.tipo_clave, self.ancho_clave, clave)
+        i, _ = self._buscar_posicion(campos_clave, self._hash(campos_clave))
+        if i < 0:
+            raise KeyError(f"Clave no encontrada: {clave}")
+
+        # Marcar solo el estado como lápida; el resto de la posición se ignora
+        self.ESTADO.pack_into(self._mm, self._desplazamiento(i), self.LAPIDA, 0)
+        self.elementos -= 1
+        self.lapidas += 1
+        self._guardar_cabecera()
+
+    def _redimensionar(self):
+        # Escribir una tabla nueva al lado y sustituir el archivo de forma atómica.
+        # Los lectores que ya tenían el archivo abierto siguen viendo la versión anterior.
+        temporal = self.ruta + ".tmp"
+        # Duplicar solo si hay muchos elementos vivos; si sobran lápidas basta con
+        # limpiarlas a la misma capacidad (si no, borrar mucho haría crecer el archivo)
+        nueva_capacidad = self.capacidad * 2 if self.elementos > self.capacidad * 0.35 else self.capacidad
+        nueva = TablaHashPersistente.crear(
+            temporal, nueva_capacidad, self.tipo_clave, self.ancho_clave,
+            self.tipo_valor, self.ancho_valor)
+        for i in range(self.capacidad):
+            desplazamiento = self._desplazamiento(i)
+            if self.ESTADO.unpack_from(self._mm, desplazamiento)[0] != self.OCUPADO:
+                continue
+            # Copiar la posición tal cual, reutilizando el hash guardado
+            campos = self._posicion.unpack_from(self._mm, desplazamiento)
+            j = campos[1] % nueva.capacidad
+            while nueva.ESTADO.unpack_from(nueva._mm, nueva._desplazamiento(j))[0] != self.VACIO:
+                j = (j + 1) % nueva.capacidad
+            nueva._posicion.pack_into(nueva._mm, nueva._desplazamiento(j), *campos)
+            nueva.elementos += 1
+        nueva._guardar_cabecera()
+        nueva.cerrar()
+
+        self.cerrar()
+        os.replace(temporal, self.ruta)
+        self._abrir()
+
+    def sincronizar(self):
+        # Forzar la escritura de las páginas modificadas en disco
+        if not self.solo_lectura:
+            self._mm.flush()
+
+    def cerrar(self):
+        if self._mm is not None:
+            self.sincronizar()
+            self._mm.close()
+            self._archivo.close()
+            self._mm = None
+
+    def __len__(self):
+        return self.elementos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cerrar()
+        return False
+
+# Ejemplo de uso: crear la tabla, cerrarla y volver a abrirla
+import tempfile
+
+ruta_tabla = os.path.join(tempfile.mkdtemp(), "usuarios.tabla")
+with TablaHashPersistente.crear(ruta_tabla, capacidad=8, ancho_clave=16, tipo_valor="int") as persistente:
+    for i in range(20):
+        persistente.insertar(f"usuario{i}".encode(), i * 100)
+    persistente.eliminar(b"usuario3")
+
+# Reabrir en modo solo lectura (como haría otro proceso): no se reconstruye nada
+with TablaHashPersistente(ruta_tabla, solo_lectura=True) as lectura:
+    print(f"Elementos tras reabrir: {len(lectura)}, capacidad: {lectura.capacidad}")
+    print(f"usuario7 -> {lectura.obtener(b'usuario7')}")
+    print(f"¿Contiene usuario3? {lectura.contiene(b'usuario3')}")
+
 ################################################################################
 ## Aplicaciones de las Tablas Hash
 ################################################################################
@@ -223,24 +991,266 @@ for palabra, frecuencia in frecuencias.items():
     print(f"  '{palabra}': {frecuencia}")
 
 # 2. Caché de resultados (memoización)
-def fibonacci_con_cache(n, cache={}):
+
+# Un diccionario usado como caché crece sin límite. Una caché acotada desaloja
+# entradas al llenarse: LRU quita la usada hace más tiempo y LFU la usada menos
+# veces. Ambas son O(1) combinando un diccionario (clave -> nodo) con una lista
+# doblemente enlazada cuyos nodos son las propias entradas.
+import sys
+
+class _NodoCache:
+    __slots__ = ("clave", "valor", "tamaño", "frecuencia", "anterior", "siguiente")
+
+    def __init__(self, clave=None, valor=None, tamaño=0):
+        self.clave = clave
+        self.valor = valor
+        self.tamaño = tamaño
+        self.frecuencia = 1
+        self.anterior = self
+        self.siguiente = self
+
+class _ListaDoble:
+    # Lista circular con un nodo centinela: el más reciente va al principio
+    def __init__(self):
+        self.centinela = _NodoCache()
+        self.longitud = 0
+
+    def agregar_al_principio(self, nodo):
+        nodo.anterior = self.centinela
+        nodo.siguiente = self.centinela.siguiente
+        self.centinela.siguiente.anterior = nodo
+        self.centinela.siguiente = nodo
+        self.longitud += 1
+
+    def quitar(self, nodo):
+        nodo.anterior.siguiente = nodo.siguiente
+        nodo.siguiente.anterior = nodo.anterior
+        self.longitud -= 1
+
+    def ultimo(self):
+        return self.centinela.anterior
+
+class _CacheAcotada:
+    def __init__(self, max_entradas=None, max_bytes=None, medir=sys.getsizeof):
+        if max_entradas is None and max_bytes is None:
+            raise ValueError("Se necesita max_entradas, max_bytes o ambos")
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.medir = medir
+        self.nodos = {}
+        self.bytes = 0
+
+        # Contadores de aciertos, fallos, desalojos y valores rechazados por tamaño
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.rechazos = 0
+
+    def obtener(self, clave, por_defecto=None):
+        nodo = self.nodos.get(clave)
+        if nodo is None:
+            self.fallos += 1
+            return por_defecto
+        self.aciertos += 1
+        self._usar(nodo)
+        return nodo.valor
+
+    def insertar(self, clave, valor):
+        # Devuelve si el valor se guardó.
+        # Con límite en bytes se mide el valor; si no, no hace falta medir nada
+        tamaño = self.medir(valor) if self.max_bytes is not None else 0
+        
+        # Un valor mayor que max_bytes no cabría ni con la caché vacía: no se
+        # guarda ni se desaloja nada por él. Si la clave ya estaba, su valor
+        # anterior queda obsoleto y se quita
+        if self.max_bytes is not None and tamaño > self.max_bytes:
+            self.invalidar(clave)
+            self.rechazos += 1
+            return False
+        
+        # Si la clave existe, sacarla mientras se hace sitio para que no se desaloje a sí misma
+        nodo = self.nodos.pop(clave, None)
+        if nodo is not None:
+            self._quitar(nodo)
+            self.bytes -= nodo.tamaño
+        
+        # Desalojar hasta que quepa la entrada
+        while self.nodos and self._excede_limites(tamaño):
+            victima = self._victima()
+            self._quitar(victima)
+            del self.nodos[victima.clave]
+            self.bytes -= victima.tamaño
+            self.desalojos += 1
+        
+        if nodo is not None:
+            nodo.valor = valor
+            nodo.tamaño = tamaño
+            self._reinsertar(nodo)
+        else:
+            nodo = _NodoCache(clave, valor, tamaño)
+            self._agregar(nodo)
+        self.nodos[clave] = nodo
+        self.bytes += tamaño
+        return True
+
+    def invalidar(self, clave):
+        # Elimina una entrada concreta; devuelve si existía
+        nodo = self.nodos.pop(clave, None)
+        if nodo is None:
+            return False
+        self._quitar(nodo)
+        self.bytes -= nodo.tamaño
+        return True
+
+    def limpiar(self):
+        for nodo in list(self.nodos.values()):
+            self.invalidar(nodo.clave)
+
+    def contiene(self, clave):
+        return clave in self.nodos
+
+    def _excede_limites(self, tamaño):
+        # ¿Se pasaría de algún límite al añadir una entrada de `tamaño` bytes?
+        return ((self.max_entradas is not None and len(self.nodos) + 1 > self.max_entradas)
+                or (self.max_bytes is not None and self.bytes + tamaño > self.max_bytes))
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self.nodos),
+            "bytes": self.bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "rechazos": self.rechazos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def __len__(self):
+        return len(self.nodos)
+
+class CacheLRU(_CacheAcotada):
+    # Desaloja la entrada usada hace más tiempo
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lista = _ListaDoble()
+
+    def _agregar(self, nodo):
+        self.lista.agregar_al_principio(nodo)
+
+    def _usar(self, nodo):
+        # Mover al principio: es la más reciente
+        self.lista.quitar(nodo)
+        self.lista.agregar_al_principio(nodo)
+
+    def _reinsertar(self, nodo):
+        self.lista.agregar_al_principio(nodo)
+
+    def _quitar(self, nodo):
+        self.lista.quitar(nodo)
+
+    def _victima(self):
+        return self.lista.ultimo()
+
+class CacheLFU(_CacheAcotada):
+    # Desaloja la entrada usada menos veces (y entre empates, la menos reciente).
+    # Hay una lista por frecuencia y se recuerda la frecuencia mínima.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listas = {}
+        self.frecuencia_minima = 0
+
+    def _lista(self, frecuencia):
+        lista = self.listas.get(frecuencia)
+        if lista is None:
+            lista = self.listas[frecuencia] = _ListaDoble()
+        return lista
+
+    def _agregar(self, nodo):
+        nodo.frecuencia = 1
+        self._lista(1).agregar_al_principio(nodo)
+        self.frecuencia_minima = 1
+
+    def _usar(self, nodo):
+        # Pasar el nodo a la lista de la frecuencia siguiente
+        self._quitar(nodo)
+        if nodo.frecuencia == self.frecuencia_minima and nodo.frecuencia not in self.listas:
+            self.frecuencia_minima += 1
+        nodo.frecuencia += 1
+        self._lista(nodo.frecuencia).agregar_al_principio(nodo)
+
+    def _reinsertar(self, nodo):
+        # Actualizar una entrada cuenta como un uso más
+        nodo.frecuencia += 1
+        self._lista(nodo.frecuencia).agregar_al_principio(nodo)
+        if nodo.frecuencia < self.frecuencia_minima or self.frecuencia_minima not in self.listas:
+            self.frecuencia_minima = min(self.listas)
+
+    def _quitar(self, nodo):
+        lista = self.listas[nodo.frecuencia]
+        lista.quitar(nodo)
+        if lista.longitud == 0:
+            del self.listas[nodo.frecuencia]
+
+    def _victima(self):
+        # La frecuencia mínima puede haber quedado obsoleta tras una invalidación
+        if self.frecuencia_minima not in self.listas:
+            self.frecuencia_minima = min(self.listas)
+        return self.listas[self.frecuencia_minima].ultimo()
+
+def memoizar(cache):
+    # Decorador que guarda los resultados de una función en la caché indicada
+    def decorador(funcion):
+        def envoltura(*args):
+            resultado = cache.obtener(args, _SIN_VALOR)
+            if resultado is _SIN_VALOR:
+                resultado = funcion(*args)
+                cache.insertar(args, resultado)
+            return resultado
+        envoltura.cache = cache
+        envoltura.__name__ = funcion.__name__
+        return envoltura
+    return decorador
+
+# La caché ya no es un {} por defecto que comparten todas las llamadas y crece
+# para siempre: por defecto se usa una caché acotada y cada llamador puede
+# pasar la suya
+cache_fibonacci = CacheLRU(max_entradas=256)
+
+def fibonacci_con_cache(n, cache=None):
+    if cache is None:
+        cache = cache_fibonacci
+    
     # Verificar si el resultado ya está en la caché
-    if n in cache:
-        return cache[n]
+    resultado = cache.obtener(n, _SIN_VALOR)
+    if resultado is not _SIN_VALOR:
+        return resultado
     
     # Calcular el resultado si no está en la caché
     if n <= 1:
         resultado = n
     else:
-        resultado = fibonacci_con_cache(n-1) + fibonacci_con_cache(n-2)
+        resultado = fibonacci_con_cache(n-1, cache) + fibonacci_con_cache(n-2, cache)
     
     # Almacenar el resultado en la caché
-    cache[n] = resultado
+    cache.insertar(n, resultado)
     return resultado
 
 print("\nSecuencia de Fibonacci con memoización:")
 for i in range(10):
     print(f"fibonacci({i}) = {fibonacci_con_cache(i)}")
+print(f"Estadísticas de la caché: {cache_fibonacci.estadisticas()}")
+
+# La misma caché sirve como decorador para cualquier función
+@memoizar(CacheLFU(max_entradas=2))
+def cuadrado_lento(x):
+    return x * x
+
+for x in [2, 2, 2, 3, 4, 2]:
+    cuadrado_lento(x)
+print(f"LFU tras [2, 2, 2, 3, 4, 2]: ¿contiene 2? {cuadrado_lento.cache.contiene((2,))}, "
+      f"¿contiene 3? {cuadrado_lento.cache.contiene((3,))}")
+print(f"Estadísticas LFU: {cuadrado_lento.cache.estadisticas()}")
 
 # 3. Índice invertido (como en motores de búsqueda)
 documentos = {
@@ -251,6 +251,23 @@ print(f"Elemento desencolado: {cola_prioridad.desencolar()}")
 print(f"Elemento desencolado: {cola_prioridad.desencolar()}")
 print(f"Cola de prioridad después de desencolar: {cola_prioridad}")
 
+# ColaPrioridad no puede cambiar la prioridad de una tarea ni quitarla sin
+# recorrer toda la lista. La cola indexada de 10-heap-kernel.py guarda la
+# posición de cada item en el montón y lo hace en O(log n)
+import importlib
+monton = importlib.import_module("10-heap-kernel")
+
+print("\n--- Cola de prioridad indexada ---")
+cola_indexada = monton.ColaPrioridadIndexada()
+cola_indexada.encolar("Tarea A", 3)
+cola_indexada.encolar("Tarea B", 1)
+cola_indexada.encolar("Tarea C", 2)
+cola_indexada.cambiar_prioridad("Tarea A", 0)  # Ahora es la más urgente
+cola_indexada.eliminar("Tarea C")
+print(f"Cola indexada: {cola_indexada}")
+print(f"¿Contiene 'Tarea C'? {cola_indexada.contiene('Tarea C')}")
+print(f"Elemento desencolado: {cola_indexada.desencolar()}")
+
 ################################################################################
 ## Aplicaciones prácticas
 ################################################################################
@@ -312,6 +329,29 @@ def dfs(grafo, inicio):
 print("Recorrido DFS del grafo:")
 dfs(grafo, 'A')
 
+# 3. Camino más corto con pesos usando la cola de prioridad indexada
+# (Dijkstra, A* y búsqueda bidireccional están en 11-shortest-paths.py)
+caminos = importlib.import_module("11-shortest-paths")
+
+grafo_con_pesos = {
+    'A': {'B': 4, 'C': 1},
+    'B': {'D': 1},
+    'C': {'B': 2, 'E': 7},
+    'D': {'E': 3},
+    'E': {},
+}
+distancia, camino = caminos.camino_mas_corto(grafo_con_pesos, 'A', 'E')
+print(f"\nCamino más corto de A a E: {camino} (distancia {distancia})")
+
+# 4. El mismo grafo en formato CSR (12-csr-graph.py): dos arrays de enteros
+# en lugar de un diccionario de listas, y un bytearray como visitados
+csr = importlib.import_module("12-csr-graph")
+
+grafo_csr = csr.GrafoCSR.desde_diccionario(grafo)
+print(f"\nBFS sobre CSR: {grafo_csr.a_etiquetas(grafo_csr.bfs('A'))}")
+print(f"DFS sobre CSR: {grafo_csr.a_etiquetas(grafo_csr.dfs('A'))}")
+print(f"Componentes conexas: {grafo_csr.componentes_conexas()[0]}")
+
 ################################################################################
 ## Comparación de rendimiento
 ################################################################################
@@ -454,40 +494,16 @@ print("""
 """)
 
 # Ejemplo de solución para el ejercicio 1: Heapsort completo
-def heapsort_completo(arr):
-    # Convertir el arreglo en un montón máximo
-    def heapify(arr, n, i):
-        largest = i
-        left = 2 * i + 1
-        right = 2 * i + 2
-        
-        if left < n and arr[left] > arr[largest]:
-            largest = left
-        
-        if right < n and arr[right] > arr[largest]:
-            largest = right
-        
-        if largest != i:
-            arr[i], arr[largest] = arr[largest], arr[i]
-            heapify(arr, n, largest)
-    
-    n = len(arr)
-    
-    # Construir un montón máximo
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
-    
-    # Extraer elementos uno por uno
-    for i in range(n - 1, 0, -1):
-        arr[0], arr[i] = arr[i], arr[0]  # Intercambiar
-        heapify(arr, i, 0)
-    
-    return arr
+# El heapify recursivo se sustituye por el núcleo de 10-heap-kernel.py
+# (hundimiento iterativo de Floyd, montones d-arios y key=)
+def heapsort_completo(arr, key=None, d=2):
+    return monton.heap_sort(arr, key=key, d=d)
 
 # Probar heapsort
 arr = [12, 11, 13, 5, 6, 7]
 print(f"\nArreglo original: {arr}")
 print(f"Arreglo ordenado con heapsort: {heapsort_completo(arr)}")
+print(f"Los 3 mayores sin ordenar todo: {monton.top_k([12, 11, 13, 5, 6, 7], 3)}")
 
 # Ejemplo de solución para el ejercicio 2: Calculadora con paréntesis
 def evaluar_expresion(expresion):
@@ -19,108 +19,368 @@ Esta organización permite búsquedas muy eficientes, ya que en cada paso podemo
   una estructura de datos fundamental para búsquedas eficientes.
 """
 
+import heapq
+import random
+import time
+
 class Nodo:
     def __init__(self, valor):
         self.valor = valor
         self.izquierdo = None
         self.derecho = None
+        self.altura = 1  # Solo lo usan los árboles balanceados (ArbolAVL)
+        self.tamaño = 1  # Número de nodos del subárbol que empieza en este nodo
 
 class ArbolBinarioBusqueda:
     def __init__(self):
         self.raiz = None
     
+    @classmethod
+    def desde_ordenados(cls, valores):
+        # Construye un árbol perfectamente balanceado a partir de valores ya
+        # ordenados en O(n): el valor central de cada tramo es la raíz del subárbol
+        valores = list(valores)
+        for i in range(1, len(valores)):
+            if valores[i] < valores[i - 1]:
+                raise ValueError("Los valores deben estar ordenados")
+        
+        arbol = cls()
+        arbol.raiz = cls._construir_balanceado(valores, 0, len(valores))
+        return arbol
+    
+    @staticmethod
+    def _construir_balanceado(valores, inicio, fin):
+        # La profundidad de la recursión es log2(n), no n
+        if inicio >= fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = Nodo(valores[medio])
+        nodo.izquierdo = ArbolBinarioBusqueda._construir_balanceado(valores, inicio, medio)
+        nodo.derecho = ArbolBinarioBusqueda._construir_balanceado(valores, medio + 1, fin)
+        nodo.tamaño = fin - inicio
+        nodo.altura = 1 + max(nodo.izquierdo.altura if nodo.izquierdo else 0,
+                              nodo.derecho.altura if nodo.derecho else 0)
+        return nodo
+    
+    def fusionar(self, otro):
+        # Mezcla los recorridos inorden de ambos árboles (ya ordenados) en O(n + m)
+        # y reconstruye este árbol balanceado con el resultado
+        self.raiz = self.desde_ordenados(heapq.merge(self, otro)).raiz
+    
     def insertar(self, valor):
+        nuevo = Nodo(valor)
         if self.raiz is None:
-            self.raiz = Nodo(valor)
-        else:
-            self._insertar_recursivo(self.raiz, valor)
+            self.raiz = nuevo
+            return
+        
+        # Descender con un bucle en lugar de recursión: sin límite de profundidad
+        nodo_actual = self.raiz
+        while True:
+            # El nuevo nodo quedará dentro de este subárbol
+            nodo_actual.tamaño += 1
+            # Si el valor es menor, vamos a la izquierda
+            if valor < nodo_actual.valor:
+                if nodo_actual.izquierdo is None:
+                    nodo_actual.izquierdo = nuevo
+                    return
+                nodo_actual = nodo_actual.izquierdo
+            # Si el valor es mayor o igual, vamos a la derecha
+            else:
+                if nodo_actual.derecho is None:
+                    nodo_actual.derecho = nuevo
+                    return
+                nodo_actual = nodo_actual.derecho
     
-    def _insertar_recursivo(self, nodo_actual, valor):
-        # Si el valor es menor, vamos a la izquierda
-        if valor < nodo_actual.valor:
-            if nodo_actual.izquierdo is None:
-                nodo_actual.izquierdo = Nodo(valor)
+    def buscar(self, valor):
+        nodo_actual = self.raiz
+        while nodo_actual is not None:
+            # Encontramos el valor
+            if nodo_actual.valor == valor:
+                return True
+            
+            # Si el valor es menor, buscamos a la izquierda; si no, a la derecha
+            if valor < nodo_actual.valor:
+                nodo_actual = nodo_actual.izquierdo
             else:
-                self._insertar_recursivo(nodo_actual.izquierdo, valor)
-        # Si el valor es mayor o igual, vamos a la derecha
-        else:
-            if nodo_actual.derecho is None:
-                nodo_actual.derecho = Nodo(valor)
+                nodo_actual = nodo_actual.derecho
+        
+        # Llegamos a un nodo vacío: el valor no está
+        return False
+    
+    def __iter__(self):
+        # Recorrido inorden perezoso: la pila guarda solo el camino actual,
+        # así que usa memoria O(altura) en lugar de construir una lista
+        pila = []
+        nodo = self.raiz
+        while pila or nodo is not None:
+            # Primero bajamos todo lo posible por el subárbol izquierdo
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.izquierdo
+            # Luego visitamos el nodo actual
+            nodo = pila.pop()
+            yield nodo.valor
+            # Finalmente recorremos el subárbol derecho
+            nodo = nodo.derecho
+    
+    def recorrido_inorden(self):
+        return list(self)
+    
+    ############################################################################
+    # Consultas por rango y estadísticos de orden
+    ############################################################################
+    
+    # Cada nodo guarda el tamaño de su subárbol, así que podemos saber cuántos
+    # valores hay a la izquierda de un nodo sin recorrerlos: estas consultas
+    # cuestan O(altura) (+ el tamaño de la salida) en lugar de O(n)
+    
+    @staticmethod
+    def _tamaño(nodo):
+        return nodo.tamaño if nodo is not None else 0
+    
+    def __len__(self):
+        return self._tamaño(self.raiz)
+    
+    def _contar_menores(self, valor, incluir_iguales=False):
+        # Número de valores < valor (o <= valor si incluir_iguales)
+        cuenta = 0
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.valor < valor or (incluir_iguales and nodo.valor == valor):
+                # El nodo y todo su subárbol izquierdo quedan por debajo
+                cuenta += self._tamaño(nodo.izquierdo) + 1
+                nodo = nodo.derecho
             else:
-                self._insertar_recursivo(nodo_actual.derecho, valor)
+                nodo = nodo.izquierdo
+        return cuenta
     
-    def buscar(self, valor):
-        return self._buscar_recursivo(self.raiz, valor)
+    def rank(self, valor):
+        # Posición que ocuparía `valor` en el recorrido inorden (valores menores que él)
+        return self._contar_menores(valor)
     
-    def _buscar_recursivo(self, nodo_actual, valor):
-        # Caso base: no encontramos el valor o llegamos a un nodo vacío
-        if nodo_actual is None:
-            return False
+    def contar_rango(self, lo, hi):
+        # Número de valores con lo <= valor <= hi
+        if hi < lo:
+            return 0
+        return self._contar_menores(hi, incluir_iguales=True) - self._contar_menores(lo)
+    
+    def k_esimo(self, k):
+        # Valor en la posición k del recorrido inorden (k empieza en 0, como en una lista)
+        if not 0 <= k < len(self):
+            raise IndexError(f"Posición fuera de rango: {k}")
         
-        # Encontramos el valor
-        if nodo_actual.valor == valor:
-            return True
+        nodo = self.raiz
+        while True:
+            izquierda = self._tamaño(nodo.izquierdo)
+            if k < izquierda:
+                nodo = nodo.izquierdo
+            elif k == izquierda:
+                return nodo.valor
+            else:
+                # Saltar el subárbol izquierdo y el propio nodo
+                k -= izquierda + 1
+                nodo = nodo.derecho
+    
+    def rango(self, lo, hi):
+        # Generador de los valores con lo <= valor <= hi, en orden
+        pila = []
+        nodo = self.raiz
+        while pila or nodo is not None:
+            # Bajar a la izquierda solo mientras pueda haber valores >= lo
+            while nodo is not None:
+                if nodo.valor < lo:
+                    nodo = nodo.derecho
+                else:
+                    pila.append(nodo)
+                    nodo = nodo.izquierdo
+            if not pila:
+                return
+            nodo = pila.pop()
+            if hi < nodo.valor:
+                return
+            yield nodo.valor
+            nodo = nodo.derecho
+    
+    def sucesor(self, valor):
+        # Menor valor estrictamente mayor que `valor` (None si no existe)
+        candidato = None
+        nodo = self.raiz
+        while nodo is not None:
+            if valor < nodo.valor:
+                candidato = nodo.valor
+                nodo = nodo.izquierdo
+            else:
+                nodo = nodo.derecho
+        return candidato
+    
+    def predecesor(self, valor):
+        # Mayor valor estrictamente menor que `valor` (None si no existe)
+        candidato = None
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.valor < valor:
+                candidato = nodo.valor
+                nodo = nodo.derecho
+            else:
+                nodo = nodo.izquierdo
+        return candidato
+    
+    def eliminar(self, valor):
+        # Buscar el nodo a eliminar recordando su padre y el camino recorrido
+        padre = None
+        nodo = self.raiz
+        camino = []
+        while nodo is not None and nodo.valor != valor:
+            camino.append(nodo)
+            padre = nodo
+            nodo = nodo.izquierdo if valor < nodo.valor else nodo.derecho
         
-        # Si el valor es menor, buscamos a la izquierda
-        if valor < nodo_actual.valor:
-            return self._buscar_recursivo(nodo_actual.izquierdo, valor)
-        # Si el valor es mayor, buscamos a la derecha
+        # El valor no está en el árbol
+        if nodo is None:
+            return
+        
+        # Caso 3: Nodo con dos hijos
+        if nodo.izquierdo is not None and nodo.derecho is not None:
+            # Encontrar el sucesor inorden (el menor valor en el subárbol derecho)
+            padre_sucesor = nodo
+            sucesor = nodo.derecho
+            camino.append(nodo)
+            while sucesor.izquierdo is not None:
+                camino.append(sucesor)
+                padre_sucesor = sucesor
+                sucesor = sucesor.izquierdo
+            # Copiar su valor y pasar a eliminar el sucesor, que tiene como mucho un hijo
+            nodo.valor = sucesor.valor
+            padre, nodo = padre_sucesor, sucesor
+        
+        # Todos los ancestros del nodo que se quita tienen un nodo menos
+        for ancestro in camino:
+            ancestro.tamaño -= 1
+        
+        # Casos 1 y 2: Nodo hoja o con un solo hijo, el hijo ocupa su lugar
+        hijo = nodo.izquierdo if nodo.izquierdo is not None else nodo.derecho
+        if padre is None:
+            self.raiz = hijo
+        elif padre.izquierdo is nodo:
+            padre.izquierdo = hijo
         else:
-            return self._buscar_recursivo(nodo_actual.derecho, valor)
+            padre.derecho = hijo
     
-    def recorrido_inorden(self):
-        resultado = []
-        self._inorden_recursivo(self.raiz, resultado)
-        return resultado
-    
-    def _inorden_recursivo(self, nodo, resultado):
-        if nodo:
-            # Primero recorremos el subárbol izquierdo
-            self._inorden_recursivo(nodo.izquierdo, resultado)
-            # Luego visitamos el nodo actual
-            resultado.append(nodo.valor)
-            # Finalmente recorremos el subárbol derecho
-            self._inorden_recursivo(nodo.derecho, resultado)
+    def _encontrar_minimo(self, nodo):
+        actual = nodo
+        # El valor mínimo siempre está en el extremo izquierdo
+        while actual.izquierdo is not None:
+            actual = actual.izquierdo
+        return actual
+
+################################################################################## Árbol balanceado: AVL
+################################################################################
+
+'''
+Si los valores llegan ordenados (por ejemplo ids crecientes), el árbol anterior
+degenera en una lista enlazada: cada operación pasa a ser O(n).
+
+Un árbol AVL guarda la altura de cada nodo y, tras insertar o eliminar, corrige
+con rotaciones cualquier nodo cuyos subárboles difieran en altura más de 1.
+Así la altura se mantiene en O(log n) sea cual sea el orden de llegada.
+
+    Rotación a la derecha sobre y:
+
+          y              x
+         / \            / \
+        x   C    ->    A   y
+       / \                / \
+      A   B              B   C
+'''
+
+class ArbolAVL(ArbolBinarioBusqueda):
+    # Misma API que ArbolBinarioBusqueda: buscar y recorrido_inorden se heredan
+    
+    def insertar(self, valor):
+        self.raiz = self._insertar_avl(self.raiz, valor)
+    
+    def _insertar_avl(self, nodo, valor):
+        if nodo is None:
+            return Nodo(valor)
+        
+        if valor < nodo.valor:
+            nodo.izquierdo = self._insertar_avl(nodo.izquierdo, valor)
+        else:
+            nodo.derecho = self._insertar_avl(nodo.derecho, valor)
+        
+        return self._rebalancear(nodo)
     
     def eliminar(self, valor):
-        self.raiz = self._eliminar_recursivo(self.raiz, valor)
+        self.raiz = self._eliminar_avl(self.raiz, valor)
     
-    def _eliminar_recursivo(self, nodo, valor):
-        # Caso base: árbol vacío
+    def _eliminar_avl(self, nodo, valor):
         if nodo is None:
             return None
         
-        # Buscar el nodo a eliminar
         if valor < nodo.valor:
-            nodo.izquierdo = self._eliminar_recursivo(nodo.izquierdo, valor)
+            nodo.izquierdo = self._eliminar_avl(nodo.izquierdo, valor)
         elif valor > nodo.valor:
-            nodo.derecho = self._eliminar_recursivo(nodo.derecho, valor)
+            nodo.derecho = self._eliminar_avl(nodo.derecho, valor)
         else:
-            # Caso 1: Nodo hoja (sin hijos)
-            if nodo.izquierdo is None and nodo.derecho is None:
-                return None
-            
-            # Caso 2: Nodo con un solo hijo
-            elif nodo.izquierdo is None:
+            # Con un hijo o ninguno, el hijo ocupa su lugar
+            if nodo.izquierdo is None:
                 return nodo.derecho
-            elif nodo.derecho is None:
+            if nodo.derecho is None:
                 return nodo.izquierdo
             
-            # Caso 3: Nodo con dos hijos
-            # Encontrar el sucesor inorden (el menor valor en el subárbol derecho)
+            # Con dos hijos, copiar el sucesor inorden y eliminarlo del subárbol derecho
             sucesor = self._encontrar_minimo(nodo.derecho)
             nodo.valor = sucesor.valor
-            # Eliminar el sucesor
-            nodo.derecho = self._eliminar_recursivo(nodo.derecho, sucesor.valor)
+            nodo.derecho = self._eliminar_avl(nodo.derecho, sucesor.valor)
         
-        return nodo
+        return self._rebalancear(nodo)
     
-    def _encontrar_minimo(self, nodo):
-        actual = nodo
-        # El valor mínimo siempre está en el extremo izquierdo
-        while actual.izquierdo is not None:
-            actual = actual.izquierdo
-        return actual
+    @staticmethod
+    def _altura(nodo):
+        return nodo.altura if nodo is not None else 0
+    
+    def _actualizar(self, nodo):
+        nodo.altura = 1 + max(self._altura(nodo.izquierdo), self._altura(nodo.derecho))
+        nodo.tamaño = 1 + self._tamaño(nodo.izquierdo) + self._tamaño(nodo.derecho)
+    
+    def _factor_balance(self, nodo):
+        return self._altura(nodo.izquierdo) - self._altura(nodo.derecho)
+    
+    def _rotar_derecha(self, y):
+        x = y.izquierdo
+        y.izquierdo = x.derecho
+        x.derecho = y
+        self._actualizar(y)
+        self._actualizar(x)
+        return x
+    
+    def _rotar_izquierda(self, x):
+        y = x.derecho
+        x.derecho = y.izquierdo
+        y.izquierdo = x
+        self._actualizar(x)
+        self._actualizar(y)
+        return y
+    
+    def _rebalancear(self, nodo):
+        self._actualizar(nodo)
+        balance = self._factor_balance(nodo)
+        
+        # Subárbol izquierdo demasiado alto
+        if balance > 1:
+            # Caso izquierda-derecha: primero rotar el hijo
+            if self._factor_balance(nodo.izquierdo) < 0:
+                nodo.izquierdo = self._rotar_izquierda(nodo.izquierdo)
+            return self._rotar_derecha(nodo)
+        
+        # Subárbol derecho demasiado alto
+        if balance < -1:
+            # Caso derecha-izquierda: primero rotar el hijo
+            if self._factor_balance(nodo.derecho) > 0:
+                nodo.derecho = self._rotar_derecha(nodo.derecho)
+            return self._rotar_izquierda(nodo)
+        
+        return nodo
 
 # Ejemplo de uso
 arbol = ArbolBinarioBusqueda()
@@ -142,6 +402,12 @@ print(f"¿Existe el valor 90? {arbol.buscar(90)}")
 # Recorrido inorden (debe mostrar los elementos ordenados)
 print(f"Recorrido inorden: {arbol.recorrido_inorden()}")
 
+# El árbol también es iterable: los valores se generan uno a uno, en orden
+print("Recorrido perezoso:", end=" ")
+for valor in arbol:
+    print(valor, end=" ")
+print()
+
 # Eliminar un elemento
 print("Eliminando el elemento 30...")
 arbol.eliminar(30)
@@ -157,6 +423,279 @@ def visualizar_arbol(nodo, nivel=0, prefijo="Raíz: "):
 print("\nEstructura del árbol:")
 visualizar_arbol(arbol.raiz)
 
+# Con valores ordenados el árbol AVL sigue balanceado
+arbol_avl = ArbolAVL()
+for valor in range(1, 8):
+    arbol_avl.insertar(valor)
+print("\nÁrbol AVL tras insertar 1..7 en orden:")
+visualizar_arbol(arbol_avl.raiz)
+
+# Consultas por rango y estadísticos de orden sin recorrer todo el árbol
+print(f"\nValores entre 3 y 6: {list(arbol_avl.rango(3, 6))}")
+print(f"Cantidad de valores entre 2 y 5: {arbol_avl.contar_rango(2, 5)}")
+print(f"Tercer menor valor (k=2): {arbol_avl.k_esimo(2)}")
+print(f"rank(5) (valores menores que 5): {arbol_avl.rank(5)}")
+print(f"Sucesor de 4: {arbol_avl.sucesor(4)}, predecesor de 4: {arbol_avl.predecesor(4)}")
+
+# Construcción directa desde datos ordenados (por ejemplo un volcado nocturno)
+arbol_ordenado = ArbolBinarioBusqueda.desde_ordenados([10, 20, 30, 40, 50, 60, 70])
+print("\nÁrbol construido con desde_ordenados:")
+visualizar_arbol(arbol_ordenado.raiz)
+
+arbol_ordenado.fusionar(ArbolAVL.desde_ordenados([15, 35, 55]))
+print(f"Tras fusionar con [15, 35, 55]: {arbol_ordenado.recorrido_inorden()}")
+
+n = 100000
+inicio = time.perf_counter()
+ArbolAVL.desde_ordenados(range(n))
+print(f"desde_ordenados con {n} valores: {time.perf_counter() - inicio:.4f} segundos")
+inicio = time.perf_counter()
+arbol_insertado = ArbolAVL()
+for valor in range(n):
+    arbol_insertado.insertar(valor)
+print(f"{n} llamadas a insertar (AVL): {time.perf_counter() - inicio:.4f} segundos")
+
+# Comparación de rendimiento con entradas ordenadas, inversas y aleatorias
+def comparar_arboles(n=2000):
+    entradas = {
+        "ordenada": list(range(n)),
+        "inversa": list(range(n, 0, -1)),
+        "aleatoria": random.sample(range(n), n),
+    }
+    
+    print(f"\nInsertar y buscar {n} valores:")
+    for nombre, datos in entradas.items():
+        for clase in (ArbolBinarioBusqueda, ArbolAVL):
+            arbol_prueba = clase()
+            inicio = time.perf_counter()
+            for valor in datos:
+                arbol_prueba.insertar(valor)
+            for valor in datos:
+                arbol_prueba.buscar(valor)
+            print(f"  {nombre:<9} {clase.__name__:<21}: {time.perf_counter() - inicio:.4f} segundos")
+
+comparar_arboles()
+
+################################################################################## Almacenamiento compacto: estructura de arreglos
+################################################################################
+
+'''
+Cada Nodo es un objeto de Python con su propio __dict__: más de 150 bytes por
+clave antes de contar el valor. Un árbol con millones de claves puede guardarse
+como "estructura de arreglos": un arreglo por campo, donde el nodo i es la
+posición i de cada arreglo.
+
+- claves:     array('q')  -> 8 bytes por clave (enteros de 64 bits)
+- izquierdos: array('i')  -> 4 bytes, índice del hijo izquierdo (-1 = ninguno)
+- derechos:   array('i')  -> 4 bytes, índice del hijo derecho (-1 = ninguno)
+
+Unos 16 bytes por clave en total. Las posiciones de los nodos eliminados se
+encadenan en una lista libre (usando el propio arreglo de izquierdos) y se
+reutilizan en las siguientes inserciones.
+'''
+
+from array import array
+
+NULO = -1
+
+class VistaNodo:
+    # Vista de solo lectura de un nodo del árbol compacto, con la misma
+    # interfaz que Nodo (valor, izquierdo, derecho); __slots__ evita el __dict__
+    __slots__ = ("_arbol", "_indice")
+    
+    def __init__(self, arbol, indice):
+        self._arbol = arbol
+        self._indice = indice
+    
+    @property
+    def valor(self):
+        return self._arbol.claves[self._indice]
+    
+    @property
+    def izquierdo(self):
+        return self._arbol._vista(self._arbol.izquierdos[self._indice])
+    
+    @property
+    def derecho(self):
+        return self._arbol._vista(self._arbol.derechos[self._indice])
+
+class ArbolCompacto:
+    def __init__(self):
+        self.claves = array('q')
+        self.izquierdos = array('i')
+        self.derechos = array('i')
+        self.indice_raiz = NULO
+        self.libre = NULO  # Primera posición de la lista libre
+        self.elementos = 0
+    
+    def _vista(self, indice):
+        return VistaNodo(self, indice) if indice != NULO else None
+    
+    @property
+    def raiz(self):
+        return self._vista(self.indice_raiz)
+    
+    def __len__(self):
+        return self.elementos
+    
+    def _nuevo_nodo(self, valor):
+        # Reutilizar una posición libre si la hay; si no, crecer los arreglos
+        if self.libre != NULO:
+            i = self.libre
+            self.libre = self.izquierdos[i]
+            self.claves[i] = valor
+            self.izquierdos[i] = NULO
+            self.derechos[i] = NULO
+        else:
+            i = len(self.claves)
+            self.claves.append(valor)
+            self.izquierdos.append(NULO)
+            self.derechos.append(NULO)
+        self.elementos += 1
+        return i
+    
+    def insertar(self, valor):
+        nuevo = self._nuevo_nodo(valor)
+        if self.indice_raiz == NULO:
+            self.indice_raiz = nuevo
+            return
+        
+        claves, izquierdos, derechos = self.claves, self.izquierdos, self.derechos
+        i = self.indice_raiz
+        while True:
+            if valor < claves[i]:
+                if izquierdos[i] == NULO:
+                    izquierdos[i] = nuevo
+                    return
+                i = izquierdos[i]
+            else:
+                if derechos[i] == NULO:
+                    derechos[i] = nuevo
+                    return
+                i = derechos[i]
+    
+    def buscar(self, valor):
+        claves, izquierdos, derechos = self.claves, self.izquierdos, self.derechos
+        i = self.indice_raiz
+        while i != NULO:
+            clave = claves[i]
+            if clave == valor:
+                return True
+            i = izquierdos[i] if valor < clave else derechos[i]
+        return False
+    
+    def eliminar(self, valor):
+        claves, izquierdos, derechos = self.claves, self.izquierdos, self.derechos
+        
+        # Buscar el nodo recordando su padre
+        padre = NULO
+        i = self.indice_raiz
+        while i != NULO and claves[i] != valor:
+            padre = i
+            i = izquierdos[i] if valor < claves[i] else derechos[i]
+        if i == NULO:
+            return
+        
+        # Con dos hijos: copiar el sucesor inorden y eliminar el sucesor
+        if izquierdos[i] != NULO and derechos[i] != NULO:
+            padre_sucesor = i
+            sucesor = derechos[i]
+            while izquierdos[sucesor] != NULO:
+                padre_sucesor = sucesor
+                sucesor = izquierdos[sucesor]
+            claves[i] = claves[sucesor]
+            padre, i = padre_sucesor, sucesor
+        
+        # Con un hijo o ninguno, el hijo ocupa su lugar
+        hijo = izquierdos[i] if izquierdos[i] != NULO else derechos[i]
+        if padre == NULO:
+            self.indice_raiz = hijo
+        elif izquierdos[padre] == i:
+            izquierdos[padre] = hijo
+        else:
+            derechos[padre] = hijo
+        
+        # Devolver la posición a la lista libre
+        izquierdos[i] = self.libre
+        self.libre = i
+        self.elementos -= 1
+    
+    def __iter__(self):
+        claves, izquierdos, derechos = self.claves, self.izquierdos, self.derechos
+        pila = []
+        i = self.indice_raiz
+        while pila or i != NULO:
+            while i != NULO:
+                pila.append(i)
+                i = izquierdos[i]
+            i = pila.pop()
+            yield claves[i]
+            i = derechos[i]
+    
+    def recorrido_inorden(self):
+        return list(self)
+    
+    @classmethod
+    def desde_ordenados(cls, valores):
+        # Con datos ordenados, el nodo i guarda el i-ésimo valor: basta con
+        # calcular los hijos del punto medio de cada tramo (sin pila de llamadas)
+        arbol = cls()
+        arbol.claves = claves = array('q', valores)
+        n = len(claves)
+        for i in range(1, n):
+            if claves[i] < claves[i - 1]:
+                raise ValueError("Los valores deben estar ordenados")
+
+        arbol.izquierdos = array('i', [NULO]) * n
+        arbol.derechos = array('i', [NULO]) * n
+        arbol.elementos = n
+        if n == 0:
+            return arbol
+        
+        arbol.indice_raiz = (n - 1) // 2
+        pendientes = [(0, n)]
+        while pendientes:
+            inicio, fin = pendientes.pop()
+            medio = (inicio + fin - 1) // 2
+            if inicio < medio:
+                arbol.izquierdos[medio] = (inicio + medio - 1) // 2
+                pendientes.append((inicio, medio))
+            if medio + 1 < fin:
+                arbol.derechos[medio] = (medio + 1 + fin - 1) // 2
+                pendientes.append((medio + 1, fin))
+        return arbol
+
+arbol_compacto = ArbolCompacto()
+for valor in [50, 30, 70, 20, 40, 60, 80]:
+    arbol_compacto.insertar(valor)
+arbol_compacto.eliminar(30)
+arbol_compacto.insertar(35)  # Reutiliza la posición que dejó el 30
+print(f"\nÁrbol compacto inorden: {arbol_compacto.recorrido_inorden()}, "
+      f"posiciones usadas: {len(arbol_compacto.claves)}")
+print("Estructura del árbol compacto:")
+visualizar_arbol(arbol_compacto.raiz)
+
+# Memoria por clave: árbol de objetos Nodo frente al árbol compacto
+import tracemalloc
+
+def bytes_por_clave(construir, n):
+    tracemalloc.start()
+    arbol_medido = construir(range(n))
+    usados = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del arbol_medido
+    return usados / n
+
+def comparar_memoria(tamaños=(1_000_000, 10_000_000)):
+    for n in tamaños:
+        print(f"\nBytes por clave con {n:,} claves:")
+        print(f"  ArbolBinarioBusqueda (Nodo): {bytes_por_clave(ArbolBinarioBusqueda.desde_ordenados, n):.1f}")
+        print(f"  ArbolCompacto (arreglos):    {bytes_por_clave(ArbolCompacto.desde_ordenados, n):.1f}")
+
+comparar_memoria(tamaños=(100_000,))
+# Con 1M y 10M claves (descomenta para ejecutar; el árbol de Nodo necesita varios GB)
+# comparar_memoria()
+
 # Aplicaciones prácticas
 print("\nAplicaciones prácticas de los árboles de búsqueda binaria:")
 print("1. Búsquedas eficientes en conjuntos de datos ordenados")
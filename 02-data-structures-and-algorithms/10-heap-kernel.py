@@ -0,0 +1,540 @@
+"""
+  Núcleo de Montones (Heaps)
+
+  heap_sort en 6-sorting-algorithms.py y heapsort_completo en
+  03-Heaps-Stacks-and-Queues.py definían en cada llamada un heapify recursivo
+  anidado. Este archivo reúne las operaciones de montón en un solo lugar:
+
+  - hundimiento (sift-down) iterativo con la variante "de abajo arriba" de Floyd
+  - montones d-arios (cada nodo tiene d hijos)
+  - parámetro key= como en sorted()
+  - ordenamiento parcial en su sitio: nsmallest y top_k
+  - colas de prioridad con cambio de prioridad y eliminación en O(log n)
+
+  Los nombres de archivo con guiones no se pueden importar con `import`, así
+  que los demás archivos lo cargan con importlib.import_module("10-heap-kernel").
+"""
+
+import operator
+
+################################################################################
+## Operaciones básicas
+################################################################################
+
+'''
+En un montón d-ario guardado en una lista, los hijos del nodo i están en las
+posiciones d*i + 1 ... d*i + d y su padre en (i - 1) // d.
+
+El parámetro `antes(a, b)` indica si `a` debe estar más cerca de la raíz que
+`b`: operator.gt da un montón de máximos y operator.lt uno de mínimos.
+
+Hundimiento de Floyd: el hundimiento clásico compara en cada nivel el elemento
+con el mayor de sus hijos. Como el elemento que se hunde suele venir de una
+hoja (tras intercambiarlo con la raíz), casi siempre acaba de nuevo abajo. Floyd
+baja primero el "hueco" hasta una hoja siguiendo al mejor hijo, sin comparar
+con el elemento, y luego lo sube unos pocos niveles. En montones binarios esto
+reduce las comparaciones casi a la mitad.
+'''
+
+def hundir(arr, raiz, tamaño, d=2, antes=operator.gt, inicio=0):
+    '''
+    Restaura la propiedad de montón en el subárbol de `raiz`, suponiendo que
+    sus hijos ya son montones. El montón ocupa arr[inicio:inicio + tamaño].
+    '''
+    # Los montones binarios de máximos y de mínimos (los de heap_sort, top_k y
+    # nsmallest) usan versiones con la comparación escrita en línea: llamar a
+    # `antes` en cada comparación multiplica el tiempo por tres
+    if d == 2:
+        if antes is operator.gt:
+            return _hundir_binario_max(arr, inicio + raiz, inicio, inicio + tamaño)
+        if antes is operator.lt:
+            return _hundir_binario_min(arr, inicio + raiz, inicio, inicio + tamaño)
+
+    elemento = arr[inicio + raiz]
+    posicion = raiz
+
+    # Bajar el hueco hasta una hoja por el camino de los mejores hijos
+    while True:
+        primero = d * posicion + 1
+        if primero >= tamaño:
+            break
+        mejor = primero
+        for hijo in range(primero + 1, min(primero + d, tamaño)):
+            if antes(arr[inicio + hijo], arr[inicio + mejor]):
+                mejor = hijo
+        arr[inicio + posicion] = arr[inicio + mejor]
+        posicion = mejor
+
+    # Subir el elemento desde la hoja hasta su sitio (sin pasar de la raíz)
+    while posicion > raiz:
+        padre = (posicion - 1) // d
+        if not antes(elemento, arr[inicio + padre]):
+            break
+        arr[inicio + posicion] = arr[inicio + padre]
+        posicion = padre
+    arr[inicio + posicion] = elemento
+
+def _hundir_binario_max(arr, raiz, inicio, fin):
+    # Igual que hundir() con d=2 y antes=operator.gt, con posiciones absolutas
+    elemento = arr[raiz]
+    posicion = raiz
+    hijo = 2 * posicion - inicio + 1
+    while hijo < fin:
+        if hijo + 1 < fin and arr[hijo] < arr[hijo + 1]:
+            hijo += 1
+        arr[posicion] = arr[hijo]
+        posicion = hijo
+        hijo = 2 * posicion - inicio + 1
+
+    while posicion > raiz:
+        padre = inicio + (posicion - inicio - 1) // 2
+        if not arr[padre] < elemento:
+            break
+        arr[posicion] = arr[padre]
+        posicion = padre
+    arr[posicion] = elemento
+
+def _hundir_binario_min(arr, raiz, inicio, fin):
+    # Igual que hundir() con d=2 y antes=operator.lt, con posiciones absolutas
+    elemento = arr[raiz]
+    posicion = raiz
+    hijo = 2 * posicion - inicio + 1
+    while hijo < fin:
+        if hijo + 1 < fin and arr[hijo + 1] < arr[hijo]:
+            hijo += 1
+        arr[posicion] = arr[hijo]
+        posicion = hijo
+        hijo = 2 * posicion - inicio + 1
+
+    while posicion > raiz:
+        padre = inicio + (posicion - inicio - 1) // 2
+        if not elemento < arr[padre]:
+            break
+        arr[posicion] = arr[padre]
+        posicion = padre
+    arr[posicion] = elemento
+
+def flotar(arr, posicion, d=2, antes=operator.gt, inicio=0):
+    '''Sube arr[inicio + posicion] hasta su sitio (sift-up) y devuelve la posición final'''
+    elemento = arr[inicio + posicion]
+    while posicion > 0:
+        padre = (posicion - 1) // d
+        if not antes(elemento, arr[inicio + padre]):
+            break
+        arr[inicio + posicion] = arr[inicio + padre]
+        posicion = padre
+    arr[inicio + posicion] = elemento
+    return posicion
+
+def construir_monton(arr, d=2, antes=operator.gt, inicio=0, tamaño=None):
+    '''Convierte arr[inicio:inicio + tamaño] en un montón en O(n)'''
+    if tamaño is None:
+        tamaño = len(arr) - inicio
+    for i in range((tamaño - 2) // d, -1, -1):
+        hundir(arr, i, tamaño, d, antes, inicio)
+
+def _decorar(arr, key):
+    # La clave se calcula una vez por elemento y el índice desempata, así que
+    # nunca se comparan los elementos originales
+    return [(key(x), i, x) for i, x in enumerate(arr)]
+
+################################################################################
+## Ordenamiento
+################################################################################
+
+def heap_sort(arr, key=None, d=2):
+    '''
+    Ordena `arr` en su sitio (de menor a mayor) y lo devuelve.
+    Complejidad: O(n log n) con memoria adicional O(1) (O(n) si se usa key)
+    '''
+    if key is not None:
+        decorados = heap_sort(_decorar(arr, key), d=d)
+        arr[:] = [x for _, _, x in decorados]
+        return arr
+
+    n = len(arr)
+    construir_monton(arr, d)
+    # Llevar el máximo al final y reducir el montón
+    for ultimo in range(n - 1, 0, -1):
+        arr[0], arr[ultimo] = arr[ultimo], arr[0]
+        hundir(arr, 0, ultimo, d)
+    return arr
+
+def _seleccionar(arr, k, d, antes):
+    '''
+    Deja en arr[:k] los k elementos que irían primero según el orden opuesto a
+    `antes`, ya ordenados. O(n log k)
+    '''
+    k = max(0, min(k, len(arr)))
+    if k == 0:
+        return []
+
+    # Montón de los k mejores candidatos, con el peor de ellos en la raíz
+    construir_monton(arr, d, antes, tamaño=k)
+    for i in range(k, len(arr)):
+        if antes(arr[0], arr[i]):
+            arr[0], arr[i] = arr[i], arr[0]
+            hundir(arr, 0, k, d, antes)
+
+    # Ordenar el montón de tamaño k
+    for ultimo in range(k - 1, 0, -1):
+        arr[0], arr[ultimo] = arr[ultimo], arr[0]
+        hundir(arr, 0, ultimo, d, antes)
+    return arr[:k]
+
+def nsmallest(arr, k, key=None, d=2):
+    '''
+    Los k elementos más pequeños, de menor a mayor, sin ordenar la lista
+    completa. Reordena `arr` en su sitio: arr[:k] queda con el resultado.
+    '''
+    if key is not None:
+        decorados = _decorar(arr, key)
+        resultado = [x for _, _, x in _seleccionar(decorados, k, d, operator.gt)]
+        arr[:] = [x for _, _, x in decorados]
+        return resultado
+    return _seleccionar(arr, k, d, operator.gt)
+
+def top_k(arr, k, key=None, d=2):
+    '''
+    Los k elementos más grandes, de mayor a menor, sin ordenar la lista
+    completa. Reordena `arr` en su sitio: arr[:k] queda con el resultado.
+    '''
+    if key is not None:
+        decorados = _decorar(arr, key)
+        # Entre claves iguales se prefiere el primer elemento, como sorted(reverse=True)
+        invertidos = [(clave, -i, x) for clave, i, x in decorados]
+        resultado = [x for _, _, x in _seleccionar(invertidos, k, d, operator.lt)]
+        arr[:] = [x for _, _, x in invertidos]
+        return resultado
+    return _seleccionar(arr, k, d, operator.lt)
+
+################################################################################
+## Cola de prioridad indexada
+################################################################################
+
+'''
+ColaPrioridad (03-Heaps-Stacks-and-Queues.py) guarda tuplas
+(prioridad, índice, item) en un heapq. Cambiar la prioridad de un item o
+quitarlo obliga a buscarlo en la lista (O(n)), así que en la práctica se vuelve
+a encolar y el montón se llena de duplicados.
+
+ColaPrioridadIndexada mantiene un diccionario item -> posición en el montón que
+se actualiza en cada movimiento. Con él, cambiar_prioridad, eliminar y contiene
+cuestan O(log n), O(log n) y O(1).
+
+ColaPrioridadPerezosa es el modo de eliminación perezosa: en lugar de mover la
+entrada antigua, la marca como eliminada y añade una nueva. Cada operación es
+más simple (una subida o un hundimiento del núcleo de este archivo), a cambio
+de que el montón crezca con entradas muertas; cuando son más de la mitad se
+reconstruye en O(n).
+
+En ambas, menor número = mayor prioridad, y a igual prioridad sale primero el
+que se encoló (o se cambió) antes. Los items deben ser hashables.
+'''
+
+class ColaPrioridadIndexada:
+    def __init__(self, d=2):
+        self.d = d
+        self.monton = []      # Entradas (prioridad, orden, item)
+        self.posiciones = {}  # item -> posición de su entrada en el montón
+        self.contador = 0     # Desempata prioridades iguales por orden de llegada
+
+    def __len__(self):
+        return len(self.monton)
+
+    def __contains__(self, item):
+        return item in self.posiciones
+
+    def contiene(self, item):
+        return item in self.posiciones
+
+    def esta_vacia(self):
+        return not self.monton
+
+    def _nueva_entrada(self, item, prioridad):
+        self.contador += 1
+        return (prioridad, self.contador, item)
+
+    def encolar(self, item, prioridad):
+        '''Añade el item; si ya estaba, equivale a cambiar_prioridad'''
+        if item in self.posiciones:
+            self.cambiar_prioridad(item, prioridad)
+            return
+        self.monton.append(self._nueva_entrada(item, prioridad))
+        self._subir(len(self.monton) - 1)
+
+    def ver_frente(self):
+        if not self.monton:
+            raise IndexError("La cola de prioridad está vacía")
+        return self.monton[0][2]
+
+    def prioridad(self, item):
+        return self.monton[self.posiciones[item]][0]
+
+    def desencolar(self):
+        if not self.monton:
+            raise IndexError("La cola de prioridad está vacía")
+        return self._quitar_en(0)[2]
+
+    def cambiar_prioridad(self, item, prioridad):
+        '''Sube o hunde la entrada del item según la nueva prioridad: O(log n)'''
+        posicion = self.posiciones[item]  # KeyError si no está
+        anterior = self.monton[posicion]
+        entrada = self._nueva_entrada(item, prioridad)
+        self.monton[posicion] = entrada
+        if entrada < anterior:
+            self._subir(posicion)
+        else:
+            self._bajar(posicion)
+
+    def eliminar(self, item):
+        '''Quita el item de la cola: O(log n)'''
+        self._quitar_en(self.posiciones[item])  # KeyError si no está
+
+    def _quitar_en(self, posicion):
+        monton = self.monton
+        entrada = monton[posicion]
+        del self.posiciones[entrada[2]]
+
+        # El último ocupa el hueco y se recoloca hacia arriba o hacia abajo
+        ultima = monton.pop()
+        if posicion < len(monton):
+            monton[posicion] = ultima
+            if ultima < entrada:
+                self._subir(posicion)
+            else:
+                self._bajar(posicion)
+        return entrada
+
+    def _subir(self, posicion):
+        monton, posiciones, d = self.monton, self.posiciones, self.d
+        entrada = monton[posicion]
+        while posicion > 0:
+            padre = (posicion - 1) // d
+            if not entrada < monton[padre]:
+                break
+            monton[posicion] = monton[padre]
+            posiciones[monton[posicion][2]] = posicion
+            posicion = padre
+        monton[posicion] = entrada
+        posiciones[entrada[2]] = posicion
+
+    def _bajar(self, posicion):
+        monton, posiciones, d = self.monton, self.posiciones, self.d
+        tamaño = len(monton)
+        entrada = monton[posicion]
+        while True:
+            primero = d * posicion + 1
+            if primero >= tamaño:
+                break
+            menor = primero
+            for hijo in range(primero + 1, min(primero + d, tamaño)):
+                if monton[hijo] < monton[menor]:
+                    menor = hijo
+            if not monton[menor] < entrada:
+                break
+            monton[posicion] = monton[menor]
+            posiciones[monton[posicion][2]] = posicion
+            posicion = menor
+        monton[posicion] = entrada
+        posiciones[entrada[2]] = posicion
+
+    def __str__(self):
+        return str([(prioridad, item) for prioridad, _, item in self.monton])
+
+_ELIMINADA = object()
+
+class ColaPrioridadPerezosa:
+    def __init__(self, d=2):
+        self.d = d
+        self.monton = []    # Entradas [prioridad, orden, item]; item = _ELIMINADA si está muerta
+        self.entradas = {}  # item -> su entrada viva
+        self.muertas = 0
+        self.contador = 0
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def __contains__(self, item):
+        return item in self.entradas
+
+    def contiene(self, item):
+        return item in self.entradas
+
+    def esta_vacia(self):
+        return not self.entradas
+
+    def encolar(self, item, prioridad):
+        '''Añade el item; si ya estaba, su entrada anterior queda muerta'''
+        if item in self.entradas:
+            self._matar(item)
+        self.contador += 1
+        entrada = [prioridad, self.contador, item]
+        self.entradas[item] = entrada
+        self.monton.append(entrada)
+        flotar(self.monton, len(self.monton) - 1, self.d, operator.lt)
+
+    def cambiar_prioridad(self, item, prioridad):
+        if item not in self.entradas:
+            raise KeyError(item)
+        self.encolar(item, prioridad)
+
+    def eliminar(self, item):
+        if item not in self.entradas:
+            raise KeyError(item)
+        self._matar(item)
+
+    def prioridad(self, item):
+        return self.entradas[item][0]
+
+    def ver_frente(self):
+        self._descartar_muertas()
+        if not self.monton:
+            raise IndexError("La cola de prioridad está vacía")
+        return self.monton[0][2]
+
+    def desencolar(self):
+        self._descartar_muertas()
+        if not self.monton:
+            raise IndexError("La cola de prioridad está vacía")
+        item = self._sacar_raiz()[2]
+        del self.entradas[item]
+        return item
+
+    def _matar(self, item):
+        self.entradas.pop(item)[2] = _ELIMINADA
+        self.muertas += 1
+        if self.muertas > len(self.monton) // 2:
+            self.compactar()
+
+    def compactar(self):
+        '''Quita las entradas muertas y reconstruye el montón: O(n)'''
+        self.monton = [entrada for entrada in self.monton if entrada[2] is not _ELIMINADA]
+        construir_monton(self.monton, self.d, operator.lt)
+        self.muertas = 0
+
+    def _descartar_muertas(self):
+        while self.monton and self.monton[0][2] is _ELIMINADA:
+            self._sacar_raiz()
+            self.muertas -= 1
+
+    def _sacar_raiz(self):
+        ultima = self.monton.pop()
+        if not self.monton:
+            return ultima
+        raiz = self.monton[0]
+        self.monton[0] = ultima
+        hundir(self.monton, 0, len(self.monton), self.d, operator.lt)
+        return raiz
+
+    def __str__(self):
+        return str(sorted((prioridad, item) for item, (prioridad, _, _) in self.entradas.items()))
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+# Otros archivos importan este módulo, así que el ejemplo solo se ejecuta
+# cuando se lanza directamente
+if __name__ == "__main__":
+    import heapq
+    import random
+    import time
+
+    datos = [64, 34, 25, 12, 22, 11, 90]
+    print(f"Heap sort: {heap_sort(datos.copy())}")
+    print(f"Heap sort ternario (d=3): {heap_sort(datos.copy(), d=3)}")
+    print(f"Heap sort por última cifra: {heap_sort(datos.copy(), key=lambda x: x % 10)}")
+    print(f"3 más pequeños: {nsmallest(datos.copy(), 3)}")
+    print(f"3 más grandes: {top_k(datos.copy(), 3)}")
+
+    # Comparaciones: hundimiento clásico frente a Floyd
+    class Contador:
+        comparaciones = 0
+
+        def __init__(self, valor):
+            self.valor = valor
+
+        def __lt__(self, otro):
+            Contador.comparaciones += 1
+            return self.valor < otro.valor
+
+        def __gt__(self, otro):
+            Contador.comparaciones += 1
+            return self.valor > otro.valor
+
+    def hundir_clasico(arr, raiz, tamaño):
+        while True:
+            mayor = raiz
+            izquierdo, derecho = 2 * raiz + 1, 2 * raiz + 2
+            if izquierdo < tamaño and arr[izquierdo] > arr[mayor]:
+                mayor = izquierdo
+            if derecho < tamaño and arr[derecho] > arr[mayor]:
+                mayor = derecho
+            if mayor == raiz:
+                return
+            arr[raiz], arr[mayor] = arr[mayor], arr[raiz]
+            raiz = mayor
+
+    valores = [Contador(random.random()) for _ in range(20000)]
+
+    copia = valores.copy()
+    Contador.comparaciones = 0
+    for i in range(len(copia) // 2 - 1, -1, -1):
+        hundir_clasico(copia, i, len(copia))
+    for ultimo in range(len(copia) - 1, 0, -1):
+        copia[0], copia[ultimo] = copia[ultimo], copia[0]
+        hundir_clasico(copia, 0, ultimo)
+    print(f"\nComparaciones con hundimiento clásico: {Contador.comparaciones}")
+
+    Contador.comparaciones = 0
+    heap_sort(valores.copy())
+    print(f"Comparaciones con hundimiento de Floyd: {Contador.comparaciones}")
+
+    # Top-N de una lista grande sin ordenarla entera
+    numeros = [random.random() for _ in range(1_000_000)]
+
+    inicio = time.perf_counter()
+    mejores = sorted(numeros, reverse=True)[:10]
+    print(f"\nsorted()[:10]: {time.perf_counter() - inicio:.3f} s")
+
+    inicio = time.perf_counter()
+    resultado = top_k(numeros.copy(), 10)
+    print(f"top_k(10): {time.perf_counter() - inicio:.3f} s")
+    print(f"¿Mismo resultado? {resultado == mejores == heapq.nlargest(10, numeros)}")
+
+    # Planificador que cambia prioridades constantemente: heapq con duplicados
+    # frente a las colas con cambio de prioridad
+    cambios = [(random.randrange(1000), random.random()) for _ in range(200_000)]
+
+    inicio = time.perf_counter()
+    con_duplicados = []
+    vigente = {}
+    for trabajo, prioridad in cambios:
+        vigente[trabajo] = prioridad
+        heapq.heappush(con_duplicados, (prioridad, trabajo))
+    print(f"\nheapq con duplicados: {len(con_duplicados)} entradas para {len(vigente)} trabajos "
+          f"({time.perf_counter() - inicio:.3f} s)")
+
+    for Cola in (ColaPrioridadIndexada, ColaPrioridadPerezosa):
+        inicio = time.perf_counter()
+        cola = Cola()
+        for trabajo, prioridad in cambios:
+            cola.encolar(trabajo, prioridad)
+        print(f"{Cola.__name__}: {len(cola.monton)} entradas para {len(cola)} trabajos "
+              f"({time.perf_counter() - inicio:.3f} s)")
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Un hundimiento iterativo evita redefinir funciones y crear marcos de pila
+   en cada nivel
+2. La variante de Floyd reduce casi a la mitad las comparaciones de heap sort
+3. Con d > 2 el montón es menos profundo (útil cuando subir elementos es más
+   frecuente que hundirlos, como en colas de prioridad)
+4. Para obtener los k mejores de n elementos basta un montón de tamaño k: O(n log k)
+5. Un mapa item -> posición permite cambiar prioridades y eliminar en O(log n)
+   sin llenar el montón de duplicados
+'''
@@ -0,0 +1,364 @@
+"""
+  Caminos Más Cortos en Grafos con Pesos
+
+  03-Heaps-Stacks-and-Queues.py recorre grafos sin pesos con bfs/dfs y
+  menciona que los montones sirven para "algoritmos como Dijkstra". Este
+  archivo implementa esos algoritmos sobre grafos con pesos no negativos:
+
+  - Dijkstra, con terminación temprana al llegar al destino
+  - A* con heurísticas intercambiables
+  - Dijkstra bidireccional
+  - consultas por lotes de muchos orígenes a muchos destinos
+
+  El grafo es un diccionario nodo -> vecinos, como en 03, pero cada vecino
+  lleva su peso: una lista de pares (vecino, peso) o un diccionario {vecino: peso}.
+"""
+
+import heapq
+import importlib
+import math
+
+INFINITO = math.inf
+
+################################################################################
+## Colas de prioridad
+################################################################################
+
+'''
+Dijkstra necesita "disminuir la prioridad" de un nodo cuando encuentra un
+camino mejor. La ColaPrioridadIndexada de 10-heap-kernel.py lo hace en
+O(log n) y nunca guarda más de una entrada por nodo. Si ese archivo no está
+disponible se usa heapq, que encola el nodo otra vez y descarta al sacarlas las
+entradas que ya no son la mejor.
+'''
+
+class ColaHeapq:
+    '''Misma interfaz que ColaPrioridadIndexada usando heapq con entradas repetidas'''
+
+    def __init__(self):
+        self.monton = []
+        self.mejor = {}  # item -> prioridad de su entrada vigente
+        self.contador = 0
+
+    def __len__(self):
+        return len(self.mejor)
+
+    def esta_vacia(self):
+        return not self.mejor
+
+    def encolar(self, item, prioridad):
+        self.mejor[item] = prioridad
+        self.contador += 1
+        heapq.heappush(self.monton, (prioridad, self.contador, item))
+
+    def _descartar_obsoletas(self):
+        monton, mejor = self.monton, self.mejor
+        while monton and mejor.get(monton[0][2], INFINITO) != monton[0][0]:
+            heapq.heappop(monton)
+
+    def ver_frente(self):
+        self._descartar_obsoletas()
+        if not self.monton:
+            raise IndexError("La cola de prioridad está vacía")
+        return self.monton[0][2]
+
+    def desencolar(self):
+        self._descartar_obsoletas()
+        if not self.monton:
+            raise IndexError("La cola de prioridad está vacía")
+        item = heapq.heappop(self.monton)[2]
+        del self.mejor[item]
+        return item
+
+try:
+    ColaPrioridadIndexada = importlib.import_module("10-heap-kernel").ColaPrioridadIndexada
+except ImportError:
+    ColaPrioridadIndexada = None
+
+# Cola que usan los algoritmos si no se indica otra
+ColaPorDefecto = ColaPrioridadIndexada or ColaHeapq
+
+################################################################################
+## Utilidades
+################################################################################
+
+def _aristas(grafo, nodo):
+    adyacentes = grafo.get(nodo, ())
+    return adyacentes.items() if isinstance(adyacentes, dict) else adyacentes
+
+def invertir_grafo(grafo):
+    '''Grafo con todas las aristas invertidas (para buscar desde el destino)'''
+    inverso = {}
+    for nodo in grafo:
+        for vecino, peso in _aristas(grafo, nodo):
+            inverso.setdefault(vecino, []).append((nodo, peso))
+    return inverso
+
+def reconstruir_camino(previos, origen, destino):
+    '''Sigue los predecesores desde el destino; None si no se alcanzó'''
+    if destino not in previos:
+        return None
+    camino = []
+    nodo = destino
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = previos[nodo]
+    camino.reverse()
+    return camino if camino[0] == origen else None
+
+################################################################################
+## Dijkstra
+################################################################################
+
+def _dijkstra(grafo, origen, objetivos, Cola):
+    '''
+    Dijkstra desde `origen`. Si `objetivos` es un conjunto, termina en cuanto
+    todos ellos han salido de la cola (su distancia ya es definitiva).
+    '''
+    distancias = {origen: 0}
+    previos = {origen: None}
+    pendientes = set(objetivos) if objetivos is not None else None
+    cola = Cola()
+    cola.encolar(origen, 0)
+
+    while not cola.esta_vacia():
+        nodo = cola.desencolar()
+        if pendientes is not None:
+            pendientes.discard(nodo)
+            if not pendientes:
+                break
+
+        distancia = distancias[nodo]
+        for vecino, peso in _aristas(grafo, nodo):
+            nueva = distancia + peso
+            if nueva < distancias.get(vecino, INFINITO):
+                distancias[vecino] = nueva
+                previos[vecino] = nodo
+                cola.encolar(vecino, nueva)
+
+    return distancias, previos
+
+def dijkstra(grafo, origen, destino=None, Cola=None):
+    '''
+    Distancias mínimas desde `origen` y el diccionario de predecesores.
+    Con `destino`, la búsqueda se detiene al fijar su distancia; las
+    distancias de los nodos que no llegaron a salir de la cola son provisionales.
+    Complejidad: O((V + E) log V)
+    '''
+    objetivos = None if destino is None else {destino}
+    return _dijkstra(grafo, origen, objetivos, Cola or ColaPorDefecto)
+
+################################################################################
+## A*
+################################################################################
+
+'''
+A* ordena la cola por g(n) + h(n): la distancia recorrida más una estimación
+de lo que falta. Si la heurística nunca sobreestima (es admisible), el camino
+encontrado es óptimo, y cuanto más se acerque a la distancia real menos nodos
+explora. Con h = 0 es exactamente Dijkstra.
+'''
+
+def heuristica_cero(nodo, destino):
+    return 0
+
+def heuristica_euclidiana(coordenadas, escala=1.0):
+    '''Línea recta entre coordenadas (x, y); `escala` = peso mínimo por unidad de distancia'''
+    def h(nodo, destino):
+        (x1, y1), (x2, y2) = coordenadas[nodo], coordenadas[destino]
+        return escala * math.hypot(x1 - x2, y1 - y2)
+    return h
+
+def heuristica_manhattan(coordenadas, escala=1.0):
+    '''Suma de diferencias en x e y: admisible en cuadrículas sin diagonales'''
+    def h(nodo, destino):
+        (x1, y1), (x2, y2) = coordenadas[nodo], coordenadas[destino]
+        return escala * (abs(x1 - x2) + abs(y1 - y2))
+    return h
+
+def a_estrella(grafo, origen, destino, heuristica=heuristica_cero, Cola=None):
+    '''Devuelve (distancia, camino); (INFINITO, None) si no hay camino'''
+    Cola = Cola or ColaPorDefecto
+    distancias = {origen: 0}
+    previos = {origen: None}
+    cola = Cola()
+    cola.encolar(origen, heuristica(origen, destino))
+
+    while not cola.esta_vacia():
+        nodo = cola.desencolar()
+        if nodo == destino:
+            return distancias[nodo], reconstruir_camino(previos, origen, destino)
+
+        distancia = distancias[nodo]
+        for vecino, peso in _aristas(grafo, nodo):
+            nueva = distancia + peso
+            if nueva < distancias.get(vecino, INFINITO):
+                distancias[vecino] = nueva
+                previos[vecino] = nodo
+                cola.encolar(vecino, nueva + heuristica(vecino, destino))
+
+    return INFINITO, None
+
+################################################################################
+## Dijkstra bidireccional
+################################################################################
+
+'''
+Se lanzan dos búsquedas a la vez: una desde el origen sobre el grafo y otra
+desde el destino sobre el grafo invertido. Cada vez que una arista conecta
+nodos alcanzados por ambas se actualiza el mejor camino conocido. Se puede
+parar cuando la suma de las distancias en el frente de las dos colas ya no
+mejora ese camino. Cada búsqueda cubre un "radio" de la mitad, así que en
+grafos tipo mapa se exploran muchos menos nodos.
+'''
+
+def dijkstra_bidireccional(grafo, origen, destino, inverso=None, Cola=None):
+    '''
+    Devuelve (distancia, camino); (INFINITO, None) si no hay camino.
+    Para muchas consultas, conviene calcular `inverso` una vez con invertir_grafo().
+    '''
+    if origen == destino:
+        return 0, [origen]
+    Cola = Cola or ColaPorDefecto
+    grafos = (grafo, inverso if inverso is not None else invertir_grafo(grafo))
+    distancias = ({origen: 0}, {destino: 0})
+    previos = ({origen: None}, {destino: None})
+    colas = (Cola(), Cola())
+    colas[0].encolar(origen, 0)
+    colas[1].encolar(destino, 0)
+
+    mejor = INFINITO
+    encuentro = None
+    while not colas[0].esta_vacia() and not colas[1].esta_vacia():
+        if (distancias[0][colas[0].ver_frente()] + distancias[1][colas[1].ver_frente()]) >= mejor:
+            break
+
+        # Avanzar el lado con el frente más pequeño mantiene las búsquedas equilibradas
+        lado = 0 if len(colas[0]) <= len(colas[1]) else 1
+        propias, ajenas = distancias[lado], distancias[1 - lado]
+        nodo = colas[lado].desencolar()
+        distancia = propias[nodo]
+
+        for vecino, peso in _aristas(grafos[lado], nodo):
+            nueva = distancia + peso
+            if nueva < propias.get(vecino, INFINITO):
+                propias[vecino] = nueva
+                previos[lado][vecino] = nodo
+                colas[lado].encolar(vecino, nueva)
+                if vecino in ajenas and nueva + ajenas[vecino] < mejor:
+                    mejor = nueva + ajenas[vecino]
+                    encuentro = vecino
+
+    if encuentro is None:
+        return INFINITO, None
+
+    # Mitad desde el origen hasta el punto de encuentro, y de ahí al destino
+    camino = reconstruir_camino(previos[0], origen, encuentro)
+    nodo = previos[1][encuentro]
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = previos[1][nodo]
+    return mejor, camino
+
+################################################################################
+## Consultas por lotes
+################################################################################
+
+def muchos_a_muchos(grafo, origenes, destinos, Cola=None):
+    '''
+    Matriz de distancias {origen: {destino: distancia}}. Se lanza un Dijkstra
+    por origen que se detiene en cuanto ha fijado todos los destinos, en lugar
+    de una búsqueda por cada par.
+    '''
+    destinos = list(destinos)
+    matriz = {}
+    for origen in origenes:
+        distancias, _ = _dijkstra(grafo, origen, set(destinos), Cola or ColaPorDefecto)
+        matriz[origen] = {destino: distancias.get(destino, INFINITO) for destino in destinos}
+    return matriz
+
+def camino_mas_corto(grafo, origen, destino, metodo="dijkstra", heuristica=None, Cola=None):
+    '''Punto de entrada común: metodo = "dijkstra", "a_estrella" o "bidireccional"'''
+    if metodo == "dijkstra":
+        distancias, previos = dijkstra(grafo, origen, destino, Cola)
+        return distancias.get(destino, INFINITO), reconstruir_camino(previos, origen, destino)
+    if metodo == "a_estrella":
+        return a_estrella(grafo, origen, destino, heuristica or heuristica_cero, Cola)
+    if metodo == "bidireccional":
+        return dijkstra_bidireccional(grafo, origen, destino, Cola=Cola)
+    raise ValueError(f"Método desconocido: {metodo}")
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+# Otros archivos pueden importar este módulo, así que el ejemplo solo se
+# ejecuta cuando se lanza directamente
+if __name__ == "__main__":
+    import random
+    import time
+
+    ciudades = {
+        'A': {'B': 4, 'C': 2},
+        'B': {'D': 5},
+        'C': {'B': 1, 'D': 8, 'E': 10},
+        'D': {'E': 2},
+        'E': {},
+    }
+    for metodo in ("dijkstra", "a_estrella", "bidireccional"):
+        distancia, camino = camino_mas_corto(ciudades, 'A', 'E', metodo)
+        print(f"{metodo}: A -> E = {distancia} por {camino}")
+    print(f"Matriz: {muchos_a_muchos(ciudades, ['A', 'C'], ['D', 'E'])}")
+
+    # Cuadrícula de lado x lado con pesos aleatorios (~4 aristas por nodo)
+    lado = 400
+    random.seed(1)
+    coordenadas = {}
+    cuadricula = {}
+    for x in range(lado):
+        for y in range(lado):
+            nodo = x * lado + y
+            coordenadas[nodo] = (x, y)
+            cuadricula[nodo] = [(vx * lado + vy, random.uniform(1, 3))
+                                for vx, vy in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                                if 0 <= vx < lado and 0 <= vy < lado]
+    aristas = sum(len(vecinos) for vecinos in cuadricula.values())
+    print(f"\nCuadrícula: {len(cuadricula)} nodos, {aristas} aristas")
+
+    # Del centro a un punto cercano: las búsquedas con parada temprana no
+    # necesitan recorrer toda la cuadrícula
+    centro = lado // 2
+    origen, destino = centro * lado + centro, (centro + 40) * lado + centro + 40
+    inverso = invertir_grafo(cuadricula)
+    # Peso mínimo 1 por paso: la distancia Manhattan nunca sobreestima
+    manhattan = heuristica_manhattan(coordenadas, escala=1.0)
+
+    pruebas = [
+        ("Dijkstra completo", lambda Cola: dijkstra(cuadricula, origen, Cola=Cola)[0][destino]),
+        ("Dijkstra hasta el destino", lambda Cola: dijkstra(cuadricula, origen, destino, Cola)[0][destino]),
+        ("A* (Manhattan)", lambda Cola: a_estrella(cuadricula, origen, destino, manhattan, Cola)[0]),
+        ("Bidireccional", lambda Cola: dijkstra_bidireccional(cuadricula, origen, destino, inverso, Cola)[0]),
+    ]
+    for Cola in (ColaPrioridadIndexada, ColaHeapq):
+        if Cola is None:
+            continue
+        print(f"\nCola: {Cola.__name__}")
+        for nombre, prueba in pruebas:
+            inicio = time.perf_counter()
+            distancia = prueba(Cola)
+            print(f"  {nombre:<26} {distancia:10.3f}  {time.perf_counter() - inicio:.3f} s")
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Dijkstra con un montón cuesta O((V + E) log V); parar al fijar el destino
+   evita explorar el resto del grafo
+2. A* con una heurística admisible encuentra el mismo camino explorando menos
+3. La búsqueda bidireccional reduce el área explorada a dos "círculos" de la
+   mitad de radio
+4. Para lotes de consultas, un Dijkstra por origen sirve a todos sus destinos
+5. Una cola indexada mantiene una entrada por nodo; heapq con entradas
+   repetidas usa más memoria pero tiene el montón implementado en C
+'''
@@ -0,0 +1,282 @@
+"""
+  Grafos en Formato CSR (Compressed Sparse Row)
+
+  bfs y dfs en 03-Heaps-Stacks-and-Queues.py recorren un diccionario de
+  cadenas a listas de Python. Cada arista cuesta un puntero de 8 bytes más una
+  referencia a una cadena, cada vértice un diccionario y una lista, y los
+  visitados se guardan en un set de cadenas.
+
+  GrafoCSR guarda el grafo completo en dos arrays de enteros contiguos:
+
+      desplazamientos: [0, 2, 5, 7, ...]   (n + 1 posiciones)
+      vecinos:         [1, 2, 0, 3, 4, ...] (una posición por arista)
+
+  Los vecinos del vértice v son vecinos[desplazamientos[v]:desplazamientos[v + 1]].
+  Los vértices son enteros 0..n-1; un diccionario traduce etiquetas a ids y
+  una lista hace la traducción inversa. Los visitados son un bytearray de n bytes.
+"""
+
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+################################################################################
+## Construcción
+################################################################################
+
+class GrafoCSR:
+    def __init__(self, desplazamientos, vecinos, etiquetas, dirigido):
+        self.desplazamientos = desplazamientos  # array('q'), n + 1 posiciones
+        self.vecinos = vecinos                  # array('i') o array('q'), una por arista
+        self.etiquetas = etiquetas              # id -> etiqueta
+        self.ids = {etiqueta: i for i, etiqueta in enumerate(etiquetas)}
+        self.dirigido = dirigido
+
+    @classmethod
+    def desde_aristas(cls, aristas, dirigido=False, etiquetas=()):
+        '''
+        Construye el grafo a partir de pares (origen, destino) de etiquetas.
+        Sin `dirigido`, cada arista se guarda en los dos sentidos. `etiquetas`
+        permite fijar el orden de los ids o incluir vértices aislados.
+        '''
+        ids = {}
+        for etiqueta in etiquetas:
+            ids.setdefault(etiqueta, len(ids))
+
+        # Primera pasada: traducir a ids en dos arrays compactos. En un grafo
+        # no dirigido, la arista inversa va justo detrás para que cada vértice
+        # vea sus vecinos en el mismo orden que con un diccionario de listas
+        origenes = array('q')
+        destinos = array('q')
+        for u, v in aristas:
+            iu = ids.setdefault(u, len(ids))
+            iv = ids.setdefault(v, len(ids))
+            origenes.append(iu)
+            destinos.append(iv)
+            if not dirigido:
+                origenes.append(iv)
+                destinos.append(iu)
+
+        n = len(ids)
+        desplazamientos, vecinos = cls._agrupar_por_origen(origenes, destinos, n)
+        return cls(desplazamientos, vecinos, list(ids), dirigido)
+
+    @classmethod
+    def desde_diccionario(cls, grafo, dirigido=True):
+        '''
+        Convierte un diccionario de adyacencia como el de 03 (nodo -> lista de
+        vecinos). Por defecto se respeta tal cual: si ya contiene los dos
+        sentidos de cada arista, no hace falta duplicarlas.
+        '''
+        aristas = ((u, v) for u, vecinos in grafo.items() for v in vecinos)
+        return cls.desde_aristas(aristas, dirigido, etiquetas=grafo)
+
+    @staticmethod
+    def _agrupar_por_origen(origenes, destinos, n):
+        '''Ordenamiento por conteo de las aristas según su origen: O(n + E)'''
+        # Ids de 32 bits si caben: la mitad de memoria para el array más grande
+        tipo = 'i' if n < 2**31 else 'q'
+
+        if np is not None:
+            o = np.frombuffer(origenes, dtype=np.int64)
+            d = np.frombuffer(destinos, dtype=np.int64)
+            grados = np.bincount(o, minlength=n)
+            desplazamientos = array('q', bytes(8))
+            desplazamientos.frombytes(np.cumsum(grados, dtype=np.int64).tobytes())
+            # argsort estable: los vecinos de cada vértice conservan el orden de entrada
+            vecinos = array(tipo)
+            vecinos.frombytes(d[np.argsort(o, kind="stable")].astype(tipo).tobytes())
+            return desplazamientos, vecinos
+
+        grados = [0] * n
+        for u in origenes:
+            grados[u] += 1
+        desplazamientos = array('q', [0]) * (n + 1)
+        total = 0
+        for v, grado in enumerate(grados):
+            total += grado
+            desplazamientos[v + 1] = total
+
+        siguiente = array('q', desplazamientos[:n])
+        vecinos = array(tipo, [0]) * len(destinos)
+        for u, v in zip(origenes, destinos):
+            vecinos[siguiente[u]] = v
+            siguiente[u] += 1
+        return desplazamientos, vecinos
+
+    ############################################################################
+    ## Consultas
+    ############################################################################
+
+    def __len__(self):
+        return len(self.etiquetas)
+
+    def num_aristas(self):
+        '''Aristas guardadas (en un grafo no dirigido, cada una cuenta dos veces)'''
+        return len(self.vecinos)
+
+    def id_de(self, etiqueta):
+        return self.ids[etiqueta]
+
+    def etiqueta_de(self, id_vertice):
+        return self.etiquetas[id_vertice]
+
+    def a_etiquetas(self, ids):
+        etiquetas = self.etiquetas
+        return [etiquetas[i] for i in ids]
+
+    def grado(self, v):
+        return self.desplazamientos[v + 1] - self.desplazamientos[v]
+
+    def vecinos_de(self, v):
+        return self.vecinos[self.desplazamientos[v]:self.desplazamientos[v + 1]]
+
+    def bytes_usados(self):
+        '''Memoria de los buffers del grafo (sin contar las etiquetas)'''
+        return (self.desplazamientos.itemsize * len(self.desplazamientos)
+                + self.vecinos.itemsize * len(self.vecinos))
+
+    ############################################################################
+    ## Recorridos
+    ############################################################################
+
+    def bfs(self, inicio, visitados=None):
+        '''
+        Búsqueda en anchura desde la etiqueta `inicio`. Devuelve un array con
+        los ids en orden de visita (a_etiquetas() los traduce).
+        '''
+        desplazamientos, vecinos = self.desplazamientos, self.vecinos
+        if visitados is None:
+            visitados = bytearray(len(self))
+        origen = self.ids[inicio]
+        visitados[origen] = 1
+        orden = array('q', [origen])
+
+        # `orden` hace a la vez de cola: se lee con un índice que avanza
+        i = 0
+        while i < len(orden):
+            v = orden[i]
+            i += 1
+            for w in vecinos[desplazamientos[v]:desplazamientos[v + 1]]:
+                if not visitados[w]:
+                    visitados[w] = 1
+                    orden.append(w)
+        return orden
+
+    def dfs(self, inicio, visitados=None):
+        '''
+        Búsqueda en profundidad iterativa desde la etiqueta `inicio`, con el
+        mismo orden de visita que dfs en 03. Devuelve un array de ids.
+        '''
+        desplazamientos, vecinos = self.desplazamientos, self.vecinos
+        if visitados is None:
+            visitados = bytearray(len(self))
+        orden = array('q')
+        pila = [self.ids[inicio]]
+
+        while pila:
+            v = pila.pop()
+            if visitados[v]:
+                continue
+            visitados[v] = 1
+            orden.append(v)
+            # Los vecinos se apilan invertidos con una rebanada del array (en C),
+            # para visitarlos en su orden original
+            inicio_v, fin_v = desplazamientos[v], desplazamientos[v + 1]
+            if fin_v > inicio_v:
+                pila.extend(vecinos[fin_v - 1:inicio_v - 1 if inicio_v else None:-1])
+        return orden
+
+    def componentes_conexas(self):
+        '''
+        Devuelve (número de componentes, array con la componente de cada id).
+        En un grafo dirigido se siguen las aristas en su sentido, así que para
+        componentes débilmente conexas hay que construirlo con dirigido=False.
+        '''
+        n = len(self)
+        componente = array('q', [-1]) * n
+        visitados = bytearray(n)
+        numero = 0
+        for v in range(n):
+            if visitados[v]:
+                continue
+            for w in self.bfs(self.etiquetas[v], visitados):
+                componente[w] = numero
+            numero += 1
+        return numero, componente
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+# Otros archivos importan este módulo, así que el ejemplo solo se ejecuta
+# cuando se lanza directamente
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+
+    def bfs_diccionario(grafo, inicio):
+        # bfs de 03 sin los print
+        visitados = {inicio}
+        cola = deque([inicio])
+        orden = []
+        while cola:
+            vertice = cola.popleft()
+            orden.append(vertice)
+            for vecino in grafo[vertice]:
+                if vecino not in visitados:
+                    visitados.add(vecino)
+                    cola.append(vecino)
+        return orden
+
+    # Grafo aleatorio no dirigido con etiquetas de texto, como en 03
+    n, m = 200_000, 1_000_000  # Con 10M de aristas las diferencias son las mismas
+    random.seed(1)
+    aristas = [(f"v{random.randrange(n)}", f"v{random.randrange(n)}") for _ in range(m)]
+
+    diccionario = {}
+    for u, v in aristas:
+        diccionario.setdefault(u, []).append(v)
+        diccionario.setdefault(v, []).append(u)
+    csr = GrafoCSR.desde_aristas(aristas)
+
+    # Las cadenas de las etiquetas son las mismas en los dos casos y no se cuentan
+    memoria_diccionario = sys.getsizeof(diccionario) + sum(sys.getsizeof(l) for l in diccionario.values())
+    memoria_etiquetas = sys.getsizeof(csr.ids) + sys.getsizeof(csr.etiquetas)
+
+    print(f"{len(csr)} vértices, {csr.num_aristas()} aristas guardadas")
+    print(f"Diccionario de listas: {memoria_diccionario / 1e6:.1f} MB")
+    print(f"CSR: {csr.bytes_usados() / 1e6:.1f} MB de buffers + {memoria_etiquetas / 1e6:.1f} MB de etiquetas")
+
+    inicio = time.perf_counter()
+    orden_diccionario = bfs_diccionario(diccionario, "v0")
+    print(f"\nBFS diccionario: {time.perf_counter() - inicio:.3f} s")
+
+    inicio = time.perf_counter()
+    orden_csr = csr.bfs("v0")
+    print(f"BFS CSR:         {time.perf_counter() - inicio:.3f} s")
+    print(f"¿Mismo orden? {csr.a_etiquetas(orden_csr) == orden_diccionario}")
+
+    inicio = time.perf_counter()
+    numero, _ = csr.componentes_conexas()
+    print(f"Componentes conexas: {numero} ({time.perf_counter() - inicio:.3f} s)")
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Dos arrays de enteros sustituyen a millones de listas y cadenas: cada
+   arista ocupa 4 bytes en lugar de un puntero más un objeto
+2. Los vecinos de un vértice son un tramo contiguo, así que recorrerlos es
+   leer memoria seguida
+3. Un bytearray de visitados ocupa 1 byte por vértice frente a las entradas
+   de un set
+4. Las etiquetas se traducen a ids una vez al construir; los recorridos solo
+   manejan enteros
+'''
@@ -0,0 +1,310 @@
+"""
+  BFS en Paralelo por Niveles
+
+  bfs en 03-Heaps-Stacks-and-Queues.py (y GrafoCSR.bfs en 12-csr-graph.py)
+  usan un solo núcleo. Este archivo recorre el grafo nivel a nivel repartiendo
+  cada nivel entre varios procesos:
+
+  - el grafo CSR (desplazamientos y vecinos) se publica una sola vez en
+    memoria compartida y los procesos lo leen sin copiarlo
+  - en cada nivel, cada proceso devuelve los ids que descubre; el proceso
+    principal los combina con las banderas de visitados y forma la frontera
+    siguiente
+  - las fronteras pequeñas se expanden en el propio proceso principal: enviar
+    un puñado de vértices a otro proceso cuesta más que expandirlos
+  - cuando la frontera es grande se cambia a recorrido "de abajo arriba"
+    (direction-optimizing BFS): en lugar de expandir la frontera, cada vértice
+    no visitado busca un vecino en la frontera y para en cuanto lo encuentra
+"""
+
+import importlib
+import os
+import re
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+csr = importlib.import_module("12-csr-graph")
+
+################################################################################
+## Estado compartido de los procesos trabajadores
+################################################################################
+
+'''
+Bloques de memoria compartida (n = vértices, E = aristas guardadas):
+
+    desplazamientos   int64 x (n + 1)    solo lectura
+    vecinos           int32 x E          solo lectura
+    visitados         1 byte x n         lo escribe el proceso principal entre niveles
+    frontera          1 byte x n         ídem: 1 si el vértice está en la frontera
+    ids_frontera      int64 x n          ídem: los ids de la frontera, seguidos
+
+Las banderas son de un byte (no de un bit) para que los trabajadores las lean
+con una simple indexación.
+
+El coste de un nivel de arriba abajo es proporcional a la frontera y a sus
+aristas, nunca a n: el proceso principal solo marca los vértices nuevos, y
+cada trabajador evita repetidos con sus propias banderas y después borra solo
+las que tocó. Si no, un grafo con muchos niveles (un camino, por ejemplo)
+costaría O(n) por nivel y O(n²) en total. El paso de abajo arriba sí recorre
+los n vértices, pero solo se usa cuando la frontera es una fracción de n.
+'''
+
+_ESTADO = {}
+
+def _vista(memoria, formato):
+    return memoria.buf.cast(formato)
+
+def _inicializar_trabajador(nombres, formato_vecinos, n):
+    '''Se ejecuta una vez en cada proceso: abre los bloques compartidos'''
+    memorias = {clave: shared_memory.SharedMemory(name=nombre) for clave, nombre in nombres.items()}
+    _ESTADO["memorias"] = memorias
+    _ESTADO["desplazamientos"] = _vista(memorias["desplazamientos"], 'q')
+    _ESTADO["vecinos"] = _vista(memorias["vecinos"], formato_vecinos)
+    _ESTADO["visitados"] = memorias["visitados"].buf
+    _ESTADO["frontera"] = memorias["frontera"].buf
+    _ESTADO["ids_frontera"] = _vista(memorias["ids_frontera"], 'q')
+    _ESTADO["marcas"] = bytearray(n)  # Propias del proceso: repetidos dentro de una tarea
+
+def _expandir_arriba_abajo(inicio, fin):
+    '''Devuelve los vecinos no visitados de ids_frontera[inicio:fin], sin repetir'''
+    desplazamientos, vecinos = _ESTADO["desplazamientos"], _ESTADO["vecinos"]
+    visitados, marcas = _ESTADO["visitados"], _ESTADO["marcas"]
+    encontrados = array('q')
+    for v in _ESTADO["ids_frontera"][inicio:fin].tolist():
+        for w in vecinos[desplazamientos[v]:desplazamientos[v + 1]].tolist():
+            if not visitados[w] and not marcas[w]:
+                marcas[w] = 1
+                encontrados.append(w)
+    for w in encontrados:
+        marcas[w] = 0
+    return encontrados.tobytes()
+
+def _expandir_abajo_arriba(inicio, fin):
+    '''Devuelve los vértices no visitados de [inicio, fin) con un vecino en la frontera'''
+    desplazamientos, vecinos = _ESTADO["desplazamientos"], _ESTADO["vecinos"]
+    frontera = _ESTADO["frontera"]
+    encontrados = array('q')
+    # re.finditer localiza los bytes 0 (no visitados) en C
+    for coincidencia in re.finditer(b"\x00", _ESTADO["visitados"][inicio:fin].tobytes()):
+        v = inicio + coincidencia.start()
+        for w in vecinos[desplazamientos[v]:desplazamientos[v + 1]].tolist():
+            if frontera[w]:
+                encontrados.append(v)
+                break
+    return encontrados.tobytes()
+
+################################################################################
+## BFS paralelo
+################################################################################
+
+class BFSParalelo:
+    '''
+    Publica un GrafoCSR en memoria compartida y mantiene un grupo de procesos
+    para lanzar búsquedas. Se usa como gestor de contexto:
+
+        with BFSParalelo(grafo, trabajadores=4) as buscador:
+            niveles, pasos = buscador.bfs("v0")
+
+    La vista de abajo arriba recorre los vecinos de cada vértice como si fueran
+    sus predecesores, así que solo se usa en grafos no dirigidos.
+    '''
+
+    def __init__(self, grafo, trabajadores=None, alfa=20, minimo_paralelo=2000):
+        self.grafo = grafo
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.alfa = alfa  # De abajo arriba cuando la frontera supera n / alfa
+        self.minimo_paralelo = minimo_paralelo  # Fronteras menores se expanden aquí
+        self.n = n = len(grafo)
+
+        self._memorias = {}
+        self._crear("desplazamientos", grafo.desplazamientos)
+        self._crear("vecinos", grafo.vecinos)
+        for clave, tamaño in (("visitados", n), ("frontera", n), ("ids_frontera", 8 * n)):
+            self._memorias[clave] = shared_memory.SharedMemory(create=True, size=max(1, tamaño))
+
+        nombres = {clave: memoria.name for clave, memoria in self._memorias.items()}
+        self._ejecutor = ProcessPoolExecutor(
+            max_workers=self.trabajadores, initializer=_inicializar_trabajador,
+            initargs=(nombres, grafo.vecinos.typecode, n))
+
+    def _crear(self, clave, datos):
+        memoria = shared_memory.SharedMemory(create=True, size=max(1, len(datos) * datos.itemsize))
+        memoria.buf[:len(datos) * datos.itemsize] = datos.tobytes()
+        self._memorias[clave] = memoria
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        self._ejecutor.shutdown()
+        for memoria in self._memorias.values():
+            memoria.close()
+            memoria.unlink()
+
+    def _repartir(self, total):
+        '''Divide [0, total) en un tramo por trabajador'''
+        limites = [total * k // self.trabajadores for k in range(self.trabajadores + 1)]
+        return limites[:-1], limites[1:]
+
+    def _expandir_local(self, frontera, visitados):
+        '''Nivel de arriba abajo en el proceso principal (fronteras pequeñas)'''
+        desplazamientos, vecinos = self.grafo.desplazamientos, self.grafo.vecinos
+        siguiente = array('q')
+        for v in frontera:
+            for w in vecinos[desplazamientos[v]:desplazamientos[v + 1]]:
+                if not visitados[w]:
+                    visitados[w] = 1
+                    siguiente.append(w)
+        return siguiente
+
+    def _combinar(self, resultados, visitados):
+        '''Une los ids de cada trabajador y quita los repetidos entre ellos'''
+        siguiente = array('q')
+        for datos in resultados:
+            encontrados = array('q')
+            encontrados.frombytes(datos)
+            for w in encontrados:
+                if not visitados[w]:
+                    visitados[w] = 1
+                    siguiente.append(w)
+        return siguiente
+
+    def bfs(self, inicio):
+        '''
+        Devuelve (niveles, pasos): un array con el nivel de cada id (-1 si no es
+        alcanzable) y, por nivel, (modo, tamaño de la frontera siguiente, segundos).
+        '''
+        n = self.n
+        origen = self.grafo.id_de(inicio)
+        niveles = array('i', [-1]) * n
+        niveles[origen] = 0
+        pasos = []
+
+        visitados = self._memorias["visitados"].buf
+        banderas_frontera = self._memorias["frontera"].buf
+        ids_frontera = self._memorias["ids_frontera"].buf
+        visitados[:n] = bytes(n)  # Una vez por búsqueda, no por nivel
+        visitados[origen] = 1
+
+        frontera = array('q', [origen])
+        nivel = 0
+        while frontera:
+            comienzo = time.perf_counter()
+            if not self.grafo.dirigido and len(frontera) > n / self.alfa:
+                modo = "abajo-arriba"
+                for v in frontera:
+                    banderas_frontera[v] = 1
+                resultados = self._ejecutor.map(_expandir_abajo_arriba, *self._repartir(n))
+                siguiente = self._combinar(resultados, visitados)
+                for v in frontera:
+                    banderas_frontera[v] = 0
+            elif len(frontera) >= self.minimo_paralelo:
+                modo = "arriba-abajo"
+                ids_frontera[:8 * len(frontera)] = frontera.tobytes()
+                resultados = self._ejecutor.map(_expandir_arriba_abajo, *self._repartir(len(frontera)))
+                siguiente = self._combinar(resultados, visitados)
+            else:
+                modo = "local"
+                siguiente = self._expandir_local(frontera, visitados)
+
+            nivel += 1
+            for v in siguiente:
+                niveles[v] = nivel
+            frontera = siguiente
+            pasos.append((modo, len(frontera), time.perf_counter() - comienzo))
+
+        return niveles, pasos
+
+def bfs_paralelo(grafo, inicio, trabajadores=None):
+    '''BFS de una sola consulta (crea y libera el grupo de procesos)'''
+    with BFSParalelo(grafo, trabajadores) as buscador:
+        return buscador.bfs(inicio)[0]
+
+################################################################################
+## Banco de pruebas: escalado con el número de procesos
+################################################################################
+
+def comparar_trabajadores(grafo, inicio, trabajadores=(1, 2, 4, 8)):
+    '''Mide el BFS secuencial de GrafoCSR y el paralelo con distintos procesos'''
+    comienzo = time.perf_counter()
+    orden = grafo.bfs(inicio)
+    secuencial = time.perf_counter() - comienzo
+    print(f"Secuencial (GrafoCSR.bfs): {secuencial:.3f} s, {len(orden)} vértices alcanzados")
+
+    resultados = {}
+    for cantidad in trabajadores:
+        with BFSParalelo(grafo, cantidad) as buscador:
+            comienzo = time.perf_counter()
+            niveles, pasos = buscador.bfs(inicio)
+            transcurrido = time.perf_counter() - comienzo
+        alcanzados = sum(1 for nivel in niveles if nivel >= 0)
+        modos = ", ".join(f"{sum(1 for paso in pasos if paso[0] == modo)} {modo}"
+                          for modo in ("local", "arriba-abajo", "abajo-arriba"))
+        print(f"{cantidad:>2} procesos: {transcurrido:.3f} s  (x{secuencial / transcurrido:.2f} "
+              f"frente al secuencial)  alcanzados {alcanzados}  niveles: {modos}")
+        resultados[cantidad] = transcurrido
+    return resultados
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+# Los procesos trabajadores pueden importar este archivo, así que el ejemplo
+# solo se ejecuta cuando se lanza directamente
+if __name__ == "__main__":
+    import random
+
+    random.seed(1)
+    n, m = 200_000, 1_000_000
+    aristas = [(random.randrange(n), random.randrange(n)) for _ in range(m)]
+    grafo = csr.GrafoCSR.desde_aristas(aristas, etiquetas=range(n))
+    print(f"Grafo: {len(grafo)} vértices, {grafo.num_aristas()} aristas guardadas, "
+          f"{os.cpu_count()} núcleos\n")
+
+    with BFSParalelo(grafo, trabajadores=2) as buscador:
+        niveles, pasos = buscador.bfs(0)
+    for numero, (modo, tamaño, segundos) in enumerate(pasos, 1):
+        print(f"Nivel {numero}: {modo:<13} frontera siguiente {tamaño:>7}  {segundos:.3f} s")
+
+    # Los niveles deben coincidir con el BFS secuencial
+    esperados = array('i', [-1]) * len(grafo)
+    orden = grafo.bfs(0)
+    esperados[0] = 0
+    for v in orden:
+        for w in grafo.vecinos_de(v):
+            if esperados[w] == -1:
+                esperados[w] = esperados[v] + 1
+    print(f"¿Mismos niveles que el BFS secuencial? {niveles == esperados}\n")
+
+    comparar_trabajadores(grafo, 0, trabajadores=(1, 2, 4))
+
+    # Un camino tiene n niveles de un solo vértice: todos se expanden en el
+    # proceso principal y el coste total sigue siendo O(n)
+    camino = csr.GrafoCSR.desde_aristas(((i, i + 1) for i in range(49_999)), etiquetas=range(50_000))
+    print()
+    comparar_trabajadores(camino, 0, trabajadores=(2,))
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Un BFS por niveles se paraleliza repartiendo la frontera: dentro de un
+   nivel, los vértices se pueden expandir en cualquier orden
+2. Con el grafo en memoria compartida, cada proceso solo recibe dos enteros
+   por tarea; nada del grafo se serializa
+3. Cada proceso devuelve solo los ids que descubre y el principal descarta
+   los repetidos con las banderas de visitados: no hay que sincronizarlos, y
+   cada nivel cuesta en proporción a su frontera, no al tamaño del grafo
+4. Con una frontera grande, "de abajo arriba" examina muchas menos aristas:
+   cada vértice para en el primer vecino que encuentra en la frontera
+5. Las fronteras pequeñas no compensan el viaje a otro proceso: en un grafo
+   con muchos niveles, como un camino, casi todo se expande en el principal
+6. La mejora depende de los núcleos disponibles; con uno solo, el reparto y la
+   combinación de niveles solo añaden coste
+'''
@@ -0,0 +1,118 @@
+"""
+  Introsort Compartido
+
+  quick_sort en 6-sorting-algorithms.py y quick_sort_con_key en 04-lambdas.py
+  usan el mismo introsort en su sitio. Este archivo es su única implementación:
+
+  - pivote por mediana de tres, o "ninther" (mediana de tres medianas) en
+    rangos grandes
+  - partición en tres vías: los duplicados quedan colocados de una vez
+  - ordenamiento por inserción en los rangos pequeños
+  - heap sort del núcleo de 10-heap-kernel.py cuando la recursión pasa de
+    2*log2(n) niveles, lo que garantiza O(n log n)
+
+  Los archivos de esta carpeta lo cargan con importlib.import_module("14-introsort");
+  desde la raíz del repositorio, con
+  importlib.import_module("02-data-structures-and-algorithms.14-introsort").
+"""
+
+import importlib
+
+# El núcleo de montones se carga igual que este archivo: como módulo suelto o
+# dentro del paquete "02-data-structures-and-algorithms"
+monton = importlib.import_module(f"{__package__}.10-heap-kernel" if __package__ else "10-heap-kernel")
+
+def introsort(arr, key=None):
+    '''
+    Ordena `arr` en su sitio y lo devuelve. Con `key`, cada clave se calcula una
+    sola vez (decorar-ordenar-desdecorar) y el índice desempata, de modo que el
+    resultado es estable.
+    '''
+    if key is None:
+        _introsort(arr, 0, len(arr), 2 * len(arr).bit_length())
+        return arr
+
+    decorados = [(key(x), i, x) for i, x in enumerate(arr)]
+    _introsort(decorados, 0, len(decorados), 2 * len(decorados).bit_length())
+    arr[:] = [x for _, _, x in decorados]
+    return arr
+
+UMBRAL_INSERCION = 16
+
+def _introsort(arr, inicio, fin, profundidad):
+    '''Ordena arr[inicio:fin]'''
+    while fin - inicio > UMBRAL_INSERCION:
+        if profundidad == 0:
+            _heap_sort_rango(arr, inicio, fin)
+            return
+        profundidad -= 1
+
+        menor, mayor = _particion_tres_vias(arr, inicio, fin, _elegir_pivote(arr, inicio, fin))
+
+        # Recursión sobre la parte pequeña y bucle sobre la grande: la pila
+        # nunca pasa de log2(n) llamadas
+        if menor - inicio < fin - mayor:
+            _introsort(arr, inicio, menor, profundidad)
+            inicio = mayor
+        else:
+            _introsort(arr, mayor, fin, profundidad)
+            fin = menor
+
+    _insercion_rango(arr, inicio, fin)
+
+def _mediana_de_tres(a, b, c):
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+def _elegir_pivote(arr, inicio, fin):
+    medio = (inicio + fin) // 2
+    ultimo = fin - 1
+    if fin - inicio < 128:
+        return _mediana_de_tres(arr[inicio], arr[medio], arr[ultimo])
+    # Ninther: mediana de las medianas de tres grupos de tres
+    paso = (fin - inicio) // 8
+    return _mediana_de_tres(
+        _mediana_de_tres(arr[inicio], arr[inicio + paso], arr[inicio + 2 * paso]),
+        _mediana_de_tres(arr[medio - paso], arr[medio], arr[medio + paso]),
+        _mediana_de_tres(arr[ultimo - 2 * paso], arr[ultimo - paso], arr[ultimo]))
+
+def _particion_tres_vias(arr, inicio, fin, pivote):
+    '''
+    Bandera holandesa de Dijkstra. Devuelve (menor, mayor) tales que
+    arr[inicio:menor] < pivote, arr[menor:mayor] == pivote y arr[mayor:fin] > pivote
+    '''
+    menor, i, mayor = inicio, inicio, fin
+    while i < mayor:
+        valor = arr[i]
+        if valor < pivote:
+            arr[menor], arr[i] = valor, arr[menor]
+            menor += 1
+            i += 1
+        elif pivote < valor:
+            mayor -= 1
+            arr[mayor], arr[i] = valor, arr[mayor]
+        else:
+            i += 1
+    return menor, mayor
+
+def _insercion_rango(arr, inicio, fin):
+    for i in range(inicio + 1, fin):
+        clave = arr[i]
+        j = i - 1
+        while j >= inicio and clave < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = clave
+
+def _heap_sort_rango(arr, inicio, fin):
+    '''Heap sort sobre arr[inicio:fin] (el montón empieza en `inicio`)'''
+    n = fin - inicio
+    monton.construir_monton(arr, inicio=inicio, tamaño=n)
+    for ultimo in range(n - 1, 0, -1):
+        arr[inicio], arr[inicio + ultimo] = arr[inicio + ultimo], arr[inicio]
+        monton.hundir(arr, 0, ultimo, inicio=inicio)
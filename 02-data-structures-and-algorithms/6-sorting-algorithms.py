@@ -10,9 +10,29 @@ Son fundamentales en ciencias de la computación y se utilizan constantemente
 en aplicaciones del mundo real.
 '''
 
-import time
+import heapq
+import json
+import math
+import operator
+import os
+import pickle
+import platform
 import random
-import matplotlib.pyplot as plt
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+# Núcleo de montones e introsort compartidos (el nombre con guiones obliga a usar importlib)
+import importlib
+monton = importlib.import_module("10-heap-kernel")
+ordenacion = importlib.import_module("14-introsort")
 
 ################################################################################
 ## Algoritmos de Ordenamiento Simples
@@ -71,25 +91,68 @@ def insertion_sort(arr):
 ## Algoritmos de Ordenamiento Eficientes
 ################################################################################
 
-def merge_sort(arr):
+def merge_sort(arr, procesos=1):
     '''
     Ordenamiento por mezcla: divide la lista, ordena las partes y las combina.
     Complejidad: O(n log n) - Muy eficiente pero usa memoria adicional
+
+    En lugar de dividir con arr[:medio] y arr[medio:] en cada nivel (O(n log n)
+    listas temporales), se mezcla de abajo hacia arriba alternando entre la
+    lista y un único búfer del mismo tamaño (búfer "ping-pong").
+    Con procesos > 1 se usa merge_sort_paralelo.
     '''
-    if len(arr) <= 1:
-        return arr
-    
-    # Dividir la lista en mitades
-    medio = len(arr) // 2
-    izquierda = arr[:medio]
-    derecha = arr[medio:]
-    
-    # Llamadas recursivas para ordenar ambas mitades
-    izquierda = merge_sort(izquierda)
-    derecha = merge_sort(derecha)
-    
-    # Combinar las mitades ordenadas
-    return merge(izquierda, derecha)
+    if procesos > 1:
+        return merge_sort_paralelo(arr, procesos)
+    return _merge_sort_buffer(list(arr))
+
+TRAMO_INSERCION = 32
+
+def _merge_sort_buffer(datos):
+    '''Ordena `datos` (lo modifica) y devuelve la lista que contiene el resultado'''
+    n = len(datos)
+
+    # Los tramos pequeños se ordenan por inserción: ahorra las primeras pasadas
+    for inicio in range(0, n, TRAMO_INSERCION):
+        fin = min(inicio + TRAMO_INSERCION, n)
+        for i in range(inicio + 1, fin):
+            clave = datos[i]
+            j = i - 1
+            while j >= inicio and clave < datos[j]:
+                datos[j + 1] = datos[j]
+                j -= 1
+            datos[j + 1] = clave
+
+    origen = datos
+    destino = [None] * n
+    ancho = TRAMO_INSERCION
+    while ancho < n:
+        for inicio in range(0, n, 2 * ancho):
+            medio = min(inicio + ancho, n)
+            fin = min(inicio + 2 * ancho, n)
+            _mezclar_tramos(origen, destino, inicio, medio, fin)
+        # Los papeles se intercambian: no se reserva memoria nueva en cada pasada
+        origen, destino = destino, origen
+        ancho *= 2
+    return origen
+
+def _mezclar_tramos(origen, destino, inicio, medio, fin):
+    '''Mezcla origen[inicio:medio] y origen[medio:fin] en destino[inicio:fin]'''
+    i, j, k = inicio, medio, inicio
+    while i < medio and j < fin:
+        # Se toma de la derecha solo si es estrictamente menor: mezcla estable
+        if origen[j] < origen[i]:
+            destino[k] = origen[j]
+            j += 1
+        else:
+            destino[k] = origen[i]
+            i += 1
+        k += 1
+
+    # Copiar el resto de la parte que no se ha agotado
+    if i < medio:
+        destino[k:fin] = origen[i:medio]
+    else:
+        destino[k:fin] = origen[j:fin]
 
 def merge(izquierda, derecha):
     '''Función auxiliar para combinar dos listas ordenadas'''
@@ -110,57 +173,426 @@ def merge(izquierda, derecha):
     resultado.extend(derecha[j:])
     return resultado
 
-def quick_sort(arr):
+def quick_sort(arr, key=None):
     '''
-    Ordenamiento rápido: elige un pivote y particiona la lista.
-    Complejidad: O(n log n) promedio, O(n²) peor caso - Muy eficiente en la práctica
+    Ordenamiento rápido (introsort): elige un pivote y particiona la lista en su sitio.
+    Complejidad: O(n log n) incluso en el peor caso - Muy eficiente en la práctica
+
+    - Pivote: mediana de tres (o "ninther", mediana de tres medianas, en rangos
+      grandes), así que las listas ordenadas o invertidas no son el peor caso
+    - Partición en tres vías (< pivote, == pivote, > pivote): los duplicados
+      quedan colocados de una vez
+    - Los rangos pequeños se terminan con ordenamiento por inserción
+    - Si la recursión pasa de 2*log2(n) niveles, el rango se ordena con heap
+      sort, que garantiza O(n log n)
+
+    Ordena `arr` en su sitio y lo devuelve. Con `key`, cada clave se calcula una
+    sola vez (decorar-ordenar-desdecorar) y el índice desempata, de modo que el
+    resultado es estable.
+
+    La implementación se comparte con 04-lambdas.py en 14-introsort.py.
     '''
-    if len(arr) <= 1:
-        return arr
-    
-    # Elegir pivote (aquí usamos el último elemento)
-    pivote = arr[-1]
-    
-    # Particionar la lista
-    menores = [x for x in arr[:-1] if x <= pivote]
-    mayores = [x for x in arr[:-1] if x > pivote]
-    
-    # Llamadas recursivas y combinación
-    return quick_sort(menores) + [pivote] + quick_sort(mayores)
+    return ordenacion.introsort(arr, key=key)
 
-def heap_sort(arr):
+def heap_sort(arr, key=None, d=2):
     '''
     Ordenamiento por montículo: usa una estructura de datos de montón.
     Complejidad: O(n log n) - Eficiente y usa ordenamiento in-place
+
+    Usa el núcleo compartido de 10-heap-kernel.py: hundimiento iterativo de
+    Floyd, montones d-arios y key=
     '''
-    def heapify(arr, n, i):
-        # Convertir un árbol binario en un montón (heap)
-        mayor = i
-        izq = 2 * i + 1
-        der = 2 * i + 2
-        
-        if izq < n and arr[izq] > arr[mayor]:
-            mayor = izq
-        
-        if der < n and arr[der] > arr[mayor]:
-            mayor = der
-        
-        if mayor != i:
-            arr[i], arr[mayor] = arr[mayor], arr[i]
-            heapify(arr, n, mayor)
-    
+    return monton.heap_sort(arr, key=key, d=d)
+
+################################################################################
+## Merge Sort en Paralelo
+################################################################################
+
+'''
+Con decenas de millones de números, merge_sort ocupa un solo núcleo durante
+minutos. La versión paralela:
+
+1. Divide la lista en tantos tramos como procesos
+2. Cada proceso ordena su tramo con merge_sort
+3. Los tramos ordenados se combinan con una mezcla de k vías usando un montón
+   (heapq.merge): O(n log k)
+
+Para listas de enteros o floats (y para array.array) los datos no se envían
+serializados a cada proceso: se copian una sola vez a un bloque de
+multiprocessing.shared_memory y cada proceso lee y escribe su tramo en él.
+'''
+
+def _formato_numerico(arr):
+    '''Código de formato para shared_memory, o None si los datos no son numéricos'''
+    if isinstance(arr, array):
+        return arr.typecode
+    if all(type(x) is int for x in arr):
+        try:
+            array('q', arr)  # Enteros de 64 bits con signo
+        except OverflowError:
+            return None
+        return 'q'
+    if all(type(x) is float for x in arr):
+        return 'd'
+    return None
+
+def _ordenar_tramo(tramo):
+    return _merge_sort_buffer(tramo)
+
+def _ordenar_tramo_compartido(nombre, formato, inicio, fin):
+    '''Ordena en su sitio el tramo [inicio, fin) del bloque de memoria compartida'''
+    memoria = shared_memory.SharedMemory(name=nombre)
+    vista = memoria.buf.cast(formato)
+    try:
+        tramo = _merge_sort_buffer(vista[inicio:fin].tolist())
+        vista[inicio:fin] = array(formato, tramo)
+    finally:
+        vista.release()
+        memoria.close()
+
+def merge_sort_paralelo(arr, procesos=None, tamaño_minimo=50_000):
+    '''
+    Merge sort repartido entre procesos. Devuelve una lista nueva (o un
+    array.array del mismo tipo si la entrada es un array).
+    Por debajo de `tamaño_minimo` elementos, crear procesos cuesta más de lo que ahorra.
+    '''
+    procesos = procesos or os.cpu_count()
     n = len(arr)
-    
-    # Construir un max-heap
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
-    
-    # Extraer elementos uno por uno
-    for i in range(n - 1, 0, -1):
-        arr[0], arr[i] = arr[i], arr[0]
-        heapify(arr, i, 0)
-    
-    return arr
+    if procesos <= 1 or n < tamaño_minimo:
+        resultado = _merge_sort_buffer(list(arr))
+        return array(arr.typecode, resultado) if isinstance(arr, array) else resultado
+
+    limites = [n * i // procesos for i in range(procesos + 1)]
+    rangos = list(zip(limites, limites[1:]))
+    formato = _formato_numerico(arr)
+
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        if formato is None:
+            # Datos genéricos: cada tramo viaja serializado con pickle
+            tramos = list(executor.map(_ordenar_tramo, (arr[i:f] for i, f in rangos)))
+            return list(heapq.merge(*tramos))
+
+        datos = arr if isinstance(arr, array) else array(formato, arr)
+        memoria = shared_memory.SharedMemory(create=True, size=max(1, n * datos.itemsize))
+        vista = memoria.buf.cast(formato)
+        try:
+            vista[:n] = datos
+            del datos
+            list(executor.map(_ordenar_tramo_compartido,
+                              [memoria.name] * len(rangos), [formato] * len(rangos),
+                              [i for i, _ in rangos], [f for _, f in rangos]))
+
+            tramos = [vista[i:f].tolist() for i, f in rangos]
+            resultado = heapq.merge(*tramos)
+            if isinstance(arr, array):
+                return array(formato, resultado)
+            return list(resultado)
+        finally:
+            vista.release()
+            memoria.close()
+            memoria.unlink()
+
+################################################################################
+## Ordenamiento Externo
+################################################################################
+
+'''
+Todos los algoritmos anteriores necesitan la lista completa en memoria. Para
+archivos más grandes que la RAM (registros de decenas de GB) se usa un
+ordenamiento externo:
+
+1. Leer la entrada como un flujo y acumular elementos hasta llenar el
+   presupuesto de memoria
+2. Ordenar ese tramo en memoria (Timsort, como python_sort) y volcarlo a un
+   archivo temporal en bloques serializados con pickle
+3. Mezclar todos los tramos con heapq.merge. De cada tramo solo se mantiene un
+   bloque en memoria, así que la lectura anticipada está acotada
+4. Si hay demasiados tramos para abrirlos a la vez, se mezclan por grupos en
+   varias pasadas
+'''
+
+def _escribir_tramo(elementos, directorio, elementos_por_bloque):
+    '''Vuelca los elementos (ya ordenados) a un archivo temporal y devuelve su ruta'''
+    iterador = iter(elementos)
+    with tempfile.NamedTemporaryFile(dir=directorio, suffix=".tramo", delete=False) as archivo:
+        while bloque := list(islice(iterador, elementos_por_bloque)):
+            pickle.dump(bloque, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+    return archivo.name
+
+def _leer_tramo(ruta):
+    '''Genera los elementos de un tramo cargando un solo bloque cada vez'''
+    with open(ruta, "rb") as archivo:
+        while True:
+            try:
+                bloque = pickle.load(archivo)
+            except EOFError:
+                return
+            yield from bloque
+
+def ordenamiento_externo(datos, key=None, memoria_maxima=64 * 1024 * 1024,
+                         elementos_por_bloque=1024, max_vias=64, directorio=None):
+    '''
+    Ordena un iterable de cualquier tamaño y devuelve un generador con el resultado.
+
+    - key: función de clave, como en sorted()
+    - memoria_maxima: bytes (aproximados, según sys.getsizeof) de cada tramo en memoria
+    - elementos_por_bloque: tamaño de los bloques con que se escriben y leen los tramos
+    - max_vias: máximo de tramos que se mezclan a la vez
+    - directorio: dónde crear los archivos temporales (por defecto, el del sistema)
+
+    Los archivos temporales se borran al agotar o cerrar el generador.
+    '''
+    with tempfile.TemporaryDirectory(dir=directorio, prefix="ordenamiento_") as temporal:
+        tramos = []
+        lote = []
+        ocupado = 0
+
+        for elemento in datos:
+            lote.append(elemento)
+            ocupado += sys.getsizeof(elemento) + 8  # + el puntero dentro de la lista
+            if ocupado >= memoria_maxima:
+                lote.sort(key=key)
+                tramos.append(_escribir_tramo(lote, temporal, elementos_por_bloque))
+                lote = []
+                ocupado = 0
+
+        lote.sort(key=key)
+        if not tramos:
+            # Todo cabía en memoria: no hace falta tocar el disco
+            yield from lote
+            return
+        if lote:
+            tramos.append(_escribir_tramo(lote, temporal, elementos_por_bloque))
+        del lote
+
+        # Mezclar por grupos consecutivos hasta que queden como mucho max_vias
+        # tramos. Mantener el orden de los tramos conserva la estabilidad:
+        # heapq.merge desempata a favor del primer iterable
+        while len(tramos) > max_vias:
+            siguientes = []
+            for i in range(0, len(tramos), max_vias):
+                grupo = tramos[i:i + max_vias]
+                mezcla = heapq.merge(*map(_leer_tramo, grupo), key=key)
+                siguientes.append(_escribir_tramo(mezcla, temporal, elementos_por_bloque))
+                for ruta in grupo:
+                    os.remove(ruta)
+            tramos = siguientes
+
+        yield from heapq.merge(*map(_leer_tramo, tramos), key=key)
+
+################################################################################
+## Ordenamientos sin Comparaciones
+################################################################################
+
+'''
+Ningún algoritmo basado en comparaciones baja de O(n log n). Si las claves son
+enteros acotados o cadenas de bytes de ancho fijo, se puede ordenar sin
+comparar elementos:
+
+- Counting sort: cuenta cuántas veces aparece cada valor y reconstruye la
+  lista. O(n + k), siendo k el rango de valores (max - min + 1)
+- Radix sort LSD: reparte los elementos en 256 cubetas según un byte de la
+  clave, empezando por el menos significativo. Cada pasada es estable, así que
+  tras procesar todos los bytes la lista queda ordenada. O(p * n), siendo p el
+  número de bytes de la clave
+
+Con NumPy (opcional) los histogramas y repartos de cada pasada se hacen de
+forma vectorizada sobre el búfer completo.
+'''
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TIPOS_ENTEROS_ARRAY = "bBhHiIlLqQ"
+
+# Costes con listas en nanosegundos, medidos con CPython 3.11: una comparación
+# de sorted() (que hace unas n·log2(n)), cada elemento y cada valor del rango en
+# counting sort, y cada elemento en cada pasada de radix. Con listas, radix
+# casi nunca compensa; counting sort sí gana a sorted() cuando hay muchos
+# elementos en un rango pequeño
+COSTE_COMPARACION_LISTA = 10
+COSTE_CONTEO_ELEMENTO = 120
+COSTE_CONTEO_RANGO = 300
+COSTE_RADIX_LISTA = 160
+
+def _como_numpy(arr):
+    '''Vista NumPy de un ndarray o array.array de enteros, o None si no aplica'''
+    if np is None:
+        return None
+    if isinstance(arr, np.ndarray):
+        if arr.dtype.kind not in "iu":
+            raise TypeError(f"Se necesitan enteros, no {arr.dtype}")
+        return arr
+    if isinstance(arr, array) and arr.typecode in TIPOS_ENTEROS_ARRAY:
+        return np.frombuffer(arr, dtype=arr.typecode)
+    return None
+
+def _como_entrada(arr, resultado):
+    '''Devuelve el resultado con el mismo tipo de contenedor que la entrada'''
+    if isinstance(arr, array):
+        salida = array(arr.typecode)
+        if np is not None and isinstance(resultado, np.ndarray):
+            salida.frombytes(resultado.tobytes())
+        else:
+            salida.extend(resultado)
+        return salida
+    return resultado
+
+def _comprobar_enteros(valores):
+    if not all(type(v) is int for v in valores):
+        raise TypeError("Solo se pueden ordenar enteros")
+
+def counting_sort(arr):
+    '''
+    Ordenamiento por conteo para enteros.
+    Complejidad: O(n + k) - Ideal cuando el rango k es pequeño respecto a n
+    '''
+    vector = _como_numpy(arr)
+    if vector is not None:
+        if len(vector) == 0:
+            return _como_entrada(arr, vector.copy())
+        # Restar en int64 evita desbordar tipos pequeños como int8
+        minimo = int(vector.min())
+        conteos = np.bincount((vector.astype(np.int64) - minimo).astype(np.intp))
+        valores = np.arange(minimo, minimo + len(conteos)).astype(vector.dtype)
+        return _como_entrada(arr, np.repeat(valores, conteos))
+
+    valores = list(arr)
+    _comprobar_enteros(valores)
+    if not valores:
+        return _como_entrada(arr, valores)
+
+    # Counter cuenta en C; el bucle de Python solo recorre el rango
+    conteos = Counter(valores)
+    resultado = []
+    for valor in range(min(conteos), max(conteos) + 1):
+        repeticiones = conteos.get(valor)
+        if repeticiones:
+            resultado.extend([valor] * repeticiones)
+    return _como_entrada(arr, resultado)
+
+def radix_sort(arr, key=None):
+    '''
+    Radix sort LSD con dígitos de 8 bits. Ordena enteros (también negativos) o
+    cadenas de bytes del mismo ancho. Con `key`, la clave de cada elemento debe
+    ser de uno de esos tipos. Es estable.
+    Complejidad: O(p * n), con p = bytes necesarios para representar el rango
+    '''
+    vector = _como_numpy(arr) if key is None else None
+    if vector is not None:
+        return _como_entrada(arr, _radix_numpy(vector))
+
+    elementos = list(arr)
+    if not elementos:
+        return _como_entrada(arr, elementos)
+    claves = elementos if key is None else [key(e) for e in elementos]
+
+    if all(type(c) is bytes for c in claves):
+        ancho = len(claves[0])
+        if any(len(c) != ancho for c in claves):
+            raise ValueError("Las claves de bytes deben tener todas el mismo ancho")
+        orden = range(len(claves))
+        # Del último byte al primero
+        for posicion in range(ancho - 1, -1, -1):
+            cubetas = [[] for _ in range(256)]
+            for i in orden:
+                cubetas[claves[i][posicion]].append(i)
+            orden = [i for cubeta in cubetas for i in cubeta]
+        return _como_entrada(arr, [elementos[i] for i in orden])
+
+    _comprobar_enteros(claves)
+    # Restar el mínimo convierte los negativos en desplazamientos >= 0
+    minimo = min(claves)
+    pasadas = range(0, (max(claves) - minimo).bit_length(), 8)
+
+    if key is None:
+        # Sin clave se reparten directamente los valores
+        for desplazamiento in pasadas:
+            cubetas = [[] for _ in range(256)]
+            for valor in elementos:
+                cubetas[((valor - minimo) >> desplazamiento) & 0xFF].append(valor)
+            elementos = [valor for cubeta in cubetas for valor in cubeta]
+        return _como_entrada(arr, elementos)
+
+    orden = range(len(claves))
+    for desplazamiento in pasadas:
+        cubetas = [[] for _ in range(256)]
+        for i in orden:
+            cubetas[((claves[i] - minimo) >> desplazamiento) & 0xFF].append(i)
+        orden = [i for cubeta in cubetas for i in cubeta]
+    return _como_entrada(arr, [elementos[i] for i in orden])
+
+def _radix_numpy(vector):
+    '''Radix sort LSD vectorizado: cada pasada es un histograma y un reparto estable'''
+    if len(vector) == 0:
+        return vector.copy()
+    minimo = vector.min()
+    # Diferencias con el mínimo como uint64 (la aritmética entera de NumPy es
+    # modular, así que el resultado es correcto aunque int64 se desborde)
+    if vector.dtype.kind == "u":
+        desplazados = vector.astype(np.uint64) - np.uint64(minimo)
+    else:
+        desplazados = (vector.astype(np.int64) - np.int64(minimo)).view(np.uint64)
+
+    orden = np.arange(len(vector))
+    bits = int(desplazados.max()).bit_length()
+    for desplazamiento in range(0, bits, 8):
+        digitos = ((desplazados[orden] >> np.uint64(desplazamiento)) & np.uint64(0xFF)).astype(np.uint8)
+        histograma = np.bincount(digitos, minlength=256)
+        if histograma.max() == len(vector):
+            continue  # Todos caen en la misma cubeta: la pasada no cambia nada
+        # argsort estable sobre uint8 es, a su vez, un reparto por cubetas
+        orden = orden[np.argsort(digitos, kind="stable")]
+    return vector[orden]
+
+def elegir_ordenamiento_enteros(n, rango, vectorizado=False):
+    '''
+    Estima qué algoritmo es más barato para n enteros con `rango` valores
+    posibles. Devuelve "counting_sort", "radix_sort" o "python_sort".
+    '''
+    if n < 64:
+        return "python_sort"
+    pasadas = max(1, math.ceil((rango - 1).bit_length() / 8))
+
+    # Con NumPy todas las alternativas son bucles en C y basta con contar
+    # operaciones por elemento; con listas se usan los costes medidos, todos en
+    # la misma escala
+    if vectorizado:
+        coste_comparaciones = n * math.log2(n)
+        coste_conteo = n + rango
+        coste_radix = 4 * pasadas * n
+    else:
+        coste_comparaciones = COSTE_COMPARACION_LISTA * n * math.log2(n)
+        coste_conteo = COSTE_CONTEO_ELEMENTO * n + COSTE_CONTEO_RANGO * rango
+        coste_radix = COSTE_RADIX_LISTA * pasadas * n
+
+    if coste_conteo <= min(coste_radix, coste_comparaciones):
+        return "counting_sort"
+    if coste_radix < coste_comparaciones:
+        return "radix_sort"
+    return "python_sort"
+
+def ordenar_enteros(arr):
+    '''Ordena enteros con el algoritmo que elegir_ordenamiento_enteros considere más barato'''
+    vector = _como_numpy(arr)
+    if vector is None:
+        datos = list(arr)
+        _comprobar_enteros(datos)
+        minimo, maximo = (min(datos), max(datos)) if datos else (0, 0)
+    else:
+        datos = vector
+        minimo, maximo = (int(vector.min()), int(vector.max())) if len(vector) else (0, 0)
+
+    eleccion = elegir_ordenamiento_enteros(len(datos), maximo - minimo + 1, vector is not None)
+    if eleccion == "counting_sort":
+        return counting_sort(arr)
+    if eleccion == "radix_sort":
+        return radix_sort(arr)
+    if vector is not None:
+        return _como_entrada(arr, np.sort(vector, kind="stable"))
+    return _como_entrada(arr, sorted(datos))
 
 ################################################################################
 ## Algoritmos de Ordenamiento de Python
@@ -182,67 +614,382 @@ def python_sorted(arr):
     '''
     return sorted(arr)
 
+################################################################################
+## Ordenamiento Adaptativo
+################################################################################
+
+'''
+En lugar de elegir a mano un algoritmo en cada llamada, ordenar() examina una
+muestra barata de la entrada y decide:
+
+- tamaño y tipo de las claves (enteros o no)
+- grado de orden: fracción de descensos (a[i+1] < a[i]) en pares muestreados
+- proporción de duplicados en la muestra
+
+Con enteros sin key, el rango exacto decide si counting/radix sort compensan
+(ver elegir_ordenamiento_enteros). Para el resto, el motor sale de una tabla
+medida: TABLA_MOTORES_MEDIDA viene con el archivo (se midió una vez con
+calibrar_ordenar), y calibrar_ordenar() rellena TABLA_MOTORES con mediciones
+de la máquina actual, que tienen prioridad. Una clase que no está en ninguna
+de las dos usa Timsort, que en CPython ganó en todas las clases medidas.
+
+Cada decisión queda registrada en ESTADISTICAS_ORDENAR junto con su origen
+(rango de enteros, calibrada, tabla medida o sin medir), y el banco de
+pruebas la incluye en su informe.
+'''
+
+MOTORES = {
+    "insertion_sort": insertion_sort,
+    "merge_sort": merge_sort,
+    "heap_sort": heap_sort,
+    "python_sort": python_sort,
+}
+
+# Clase de entrada -> motor más rápido, medido con
+# calibrar_ordenar(tamaños=(32, 2000, 20000)) en CPython 3.11
+TABLA_MOTORES_MEDIDA = {
+    ("enteros", "grande", "casi_ordenada", "muchos_duplicados"): "python_sort",
+    ("enteros", "grande", "casi_ordenada", "pocos_duplicados"): "python_sort",
+    ("enteros", "grande", "desordenada", "muchos_duplicados"): "python_sort",
+    ("enteros", "grande", "desordenada", "pocos_duplicados"): "python_sort",
+    ("enteros", "grande", "ordenada", "muchos_duplicados"): "python_sort",
+    ("enteros", "grande", "ordenada", "pocos_duplicados"): "python_sort",
+    ("enteros", "pequeña", "casi_ordenada", "pocos_duplicados"): "python_sort",
+    ("enteros", "pequeña", "desordenada", "pocos_duplicados"): "python_sort",
+    ("enteros", "pequeña", "ordenada", "pocos_duplicados"): "python_sort",
+    ("otros", "grande", "desordenada", "pocos_duplicados"): "python_sort",
+    ("otros", "pequeña", "desordenada", "pocos_duplicados"): "python_sort",
+}
+
+# Mediciones en esta máquina (se rellena con calibrar_ordenar)
+TABLA_MOTORES = {}
+
+# (clase, motor, origen) -> {"llamadas": ..., "elementos": ..., "tiempo_ns": ...}
+ESTADISTICAS_ORDENAR = {}
+
+def perfilar(datos, key=None, tamaño_muestra=256):
+    '''Describe la entrada a partir de unos cientos de posiciones: O(tamaño_muestra)'''
+    n = len(datos)
+    # Con listas pequeñas, perfilar no puede costar más que ordenar: 1 de cada 8
+    paso = max(1, (n - 1) // min(tamaño_muestra, n // 8 + 1))
+    muestra = datos[0:n - 1:paso]
+    siguientes = datos[1:n:paso]
+    if key is not None:
+        muestra = list(map(key, muestra))
+        siguientes = list(map(key, siguientes))
+    descensos = sum(map(operator.lt, siguientes, muestra))
+
+    try:
+        duplicados = 1 - len(set(muestra)) / len(muestra) if muestra else 0.0
+    except TypeError:  # Claves no hashables
+        duplicados = 0.0
+
+    enteros = bool(muestra) and all(type(x) is int for x in muestra)
+    return {
+        "n": n,
+        "enteros": enteros,
+        "rango_muestra": max(muestra) - min(muestra) + 1 if enteros else None,
+        "descensos": descensos / len(muestra) if muestra else 0.0,
+        "duplicados": duplicados,
+    }
+
+def clasificar(perfil):
+    '''Reduce un perfil a una clase discreta, que es la clave de TABLA_MOTORES'''
+    if perfil["descensos"] == 0:
+        orden = "ordenada"
+    elif perfil["descensos"] < 0.05 or perfil["descensos"] > 0.95:
+        orden = "casi_ordenada"  # También casi invertida: Timsort la invierte por tramos
+    else:
+        orden = "desordenada"
+    return (
+        "enteros" if perfil["enteros"] else "otros",
+        "pequeña" if perfil["n"] <= 64 else "grande",
+        orden,
+        "muchos_duplicados" if perfil["duplicados"] >= 0.5 else "pocos_duplicados",
+    )
+
+def _elegir_motor(datos, key, perfil):
+    clase = clasificar(perfil)
+    if perfil["enteros"] and key is None and perfil["descensos"] > 0:
+        # El rango real es al menos el de la muestra, y con más rango counting y
+        # radix solo empeoran: si la muestra ya descarta no compararlos, no hace
+        # falta recorrer la lista. Si no, decide el rango exacto (O(n) en C).
+        # La muestra no garantiza que todo sean enteros: un solo float fuera de
+        # ella haría fallar a counting y radix, así que se comprueba la lista entera
+        if (elegir_ordenamiento_enteros(len(datos), perfil["rango_muestra"]) != "python_sort"
+                and set(map(type, datos)) == {int}):
+            eleccion = elegir_ordenamiento_enteros(len(datos), max(datos) - min(datos) + 1)
+            if eleccion != "python_sort":
+                return clase, eleccion, "rango de enteros"
+    if clase in TABLA_MOTORES:
+        return clase, TABLA_MOTORES[clase], "calibrada"
+    if clase in TABLA_MOTORES_MEDIDA:
+        return clase, TABLA_MOTORES_MEDIDA[clase], "tabla medida"
+    return clase, "python_sort", "sin medir"
+
+def _ejecutar_motor(motor, datos, key):
+    if motor == "counting_sort":
+        return counting_sort(datos)
+    if motor == "radix_sort":
+        return radix_sort(datos)
+    if motor == "python_sort":
+        # `datos` ya es una copia propia: se ordena en su sitio sin copiar otra vez
+        datos.sort(key=key)
+        return datos
+    if key is None:
+        return MOTORES[motor](datos)
+    if motor == "heap_sort":
+        return heap_sort(datos, key=key)
+    # Los demás no aceptan key: decorar-ordenar-desdecorar
+    decorados = MOTORES[motor]([(key(x), i, x) for i, x in enumerate(datos)])
+    return [x for _, _, x in decorados]
+
+def ordenar(datos, key=None):
+    '''Devuelve una lista nueva ordenada, eligiendo el motor según el perfil de la entrada'''
+    datos = list(datos)
+    if len(datos) < 2:
+        return datos
+
+    clase, motor, origen = _elegir_motor(datos, key, perfilar(datos, key))
+
+    inicio = time.perf_counter_ns()
+    resultado = _ejecutar_motor(motor, datos, key)
+    transcurrido = time.perf_counter_ns() - inicio
+
+    registro = ESTADISTICAS_ORDENAR.setdefault(
+        (clase, motor, origen), {"llamadas": 0, "elementos": 0, "tiempo_ns": 0})
+    registro["llamadas"] += 1
+    registro["elementos"] += len(datos)
+    registro["tiempo_ns"] += transcurrido
+    return resultado
+
+def informe_ordenar():
+    '''Imprime las decisiones registradas por ordenar() y las devuelve como lista'''
+    filas = [{"clase": "/".join(clase), "motor": motor, "origen": origen, **registro}
+             for (clase, motor, origen), registro in sorted(ESTADISTICAS_ORDENAR.items())]
+    print(f"\n{'Clase de entrada':<55} {'Motor':<14} {'Origen':<17} {'Llamadas':>8} {'ns/elemento':>12}")
+    for fila in filas:
+        print(f"{fila['clase']:<55} {fila['motor']:<14} {fila['origen']:<17} {fila['llamadas']:>8} "
+              f"{fila['tiempo_ns'] / fila['elementos']:>12.1f}")
+    return filas
+
+def calibrar_ordenar(tamaños=(32, 2000), repeticiones=3):
+    '''
+    Mide los motores de comparación con cada distribución de generar_datos y
+    guarda en TABLA_MOTORES el más rápido para la clase de entrada resultante.
+    Esas entradas tienen prioridad sobre TABLA_MOTORES_MEDIDA
+    '''
+    for distribucion in DISTRIBUCIONES:
+        for tamaño in tamaños:
+            datos = generar_datos(distribucion, tamaño)
+            clase = clasificar(perfilar(datos))
+            tiempos = {}
+            for nombre, motor in MOTORES.items():
+                if nombre == "insertion_sort" and tamaño > 5000:
+                    continue  # O(n²): no tiene opciones con listas grandes
+                tiempos[nombre] = medir(motor, datos, repeticiones)["mediana_ns"]
+            TABLA_MOTORES[clase] = min(tiempos, key=tiempos.get)
+            print(f"{'/'.join(clase):<55} -> {TABLA_MOTORES[clase]}")
+    return TABLA_MOTORES
+
 ################################################################################
 ## Comparación de Rendimiento
 ################################################################################
 
-def comparar_algoritmos(tamaños=[100, 500, 1000, 2000], repeticiones=3):
-    '''Compara el rendimiento de diferentes algoritmos de ordenamiento'''
-    algoritmos = {
-        "Bubble Sort": bubble_sort,
-        "Selection Sort": selection_sort,
-        "Insertion Sort": insertion_sort,
-        "Merge Sort": merge_sort,
-        "Quick Sort": quick_sort,
-        "Heap Sort": heap_sort,
-        "Python Sort": python_sort
+'''
+Medir una sola vez con time.time() da números muy ruidosos. El banco de pruebas:
+
+- usa time.perf_counter_ns(), el reloj de mayor resolución disponible
+- hace ejecuciones de calentamiento que no se cuentan
+- repite cada medición y resume con la mediana y el rango intercuartílico (IQR)
+- prueba varias distribuciones de entrada, no solo números aleatorios
+- mide el pico de memoria con tracemalloc en una ejecución aparte (tracemalloc
+  ralentiza el código, así que no se mezcla con la medición de tiempo)
+- guarda los resultados en JSON y los compara con una línea base anterior
+'''
+
+ALGORITMOS = {
+    "Bubble Sort": bubble_sort,
+    "Selection Sort": selection_sort,
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort,
+    "Quick Sort": quick_sort,
+    "Heap Sort": heap_sort,
+    "Python Sort": python_sort,
+    "Counting Sort": counting_sort,
+    "Radix Sort": radix_sort,
+    "Enteros (auto)": ordenar_enteros,
+    "Ordenar (auto)": ordenar
+}
+
+# Los únicos algoritmos a los que se permite rechazar la entrada con TypeError
+SOLO_ENTEROS = {"Counting Sort", "Radix Sort", "Enteros (auto)"}
+
+def generar_datos(distribucion, n, semilla=0):
+    '''Genera una lista de n elementos con la distribución indicada'''
+    aleatorio = random.Random(semilla)
+    if distribucion == "aleatoria":
+        return [aleatorio.randint(1, 10000) for _ in range(n)]
+    if distribucion == "ordenada":
+        return list(range(n))
+    if distribucion == "inversa":
+        return list(range(n, 0, -1))
+    if distribucion == "pocos_unicos":
+        return [aleatorio.randint(1, 10) for _ in range(n)]
+    if distribucion == "sierra":
+        # Tramos ascendentes que se repiten: 0, 1, ..., 99, 0, 1, ...
+        return [i % 100 for i in range(n)]
+    if distribucion == "cadenas":
+        return [f"clave{aleatorio.randint(1, 10000):05d}" for _ in range(n)]
+    if distribucion == "tuplas":
+        return [(aleatorio.randint(1, 100), aleatorio.random()) for _ in range(n)]
+    raise ValueError(f"Distribución desconocida: {distribucion}")
+
+DISTRIBUCIONES = ["aleatoria", "ordenada", "inversa", "pocos_unicos", "sierra", "cadenas", "tuplas"]
+
+def medir(algoritmo, datos, repeticiones=5, calentamiento=1):
+    '''
+    Ejecuta `algoritmo` sobre copias de `datos` y devuelve un diccionario con
+    la mediana y el IQR del tiempo (ns) y el pico de memoria (bytes)
+    '''
+    for _ in range(calentamiento):
+        algoritmo(datos.copy())
+
+    tiempos = []
+    for _ in range(repeticiones):
+        copia = datos.copy()  # La copia no se incluye en el tiempo
+        inicio = time.perf_counter_ns()
+        algoritmo(copia)
+        tiempos.append(time.perf_counter_ns() - inicio)
+
+    # Medición de memoria en una ejecución aparte
+    copia = datos.copy()
+    tracemalloc.start()
+    algoritmo(copia)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    if len(tiempos) >= 2:
+        q1, _, q3 = statistics.quantiles(tiempos, n=4)
+    else:
+        q1 = q3 = tiempos[0]
+    return {
+        "mediana_ns": statistics.median(tiempos),
+        "iqr_ns": q3 - q1,
+        "minimo_ns": min(tiempos),
+        "pico_bytes": pico,
     }
-    
-    resultados = {nombre: [] for nombre in algoritmos}
-    
-    for tamaño in tamaños:
-        print(f"\nProbando con listas de tamaño {tamaño}:")
-        
-        for _ in range(repeticiones):
-            # Crear la misma lista aleatoria para todos los algoritmos
-            lista = [random.randint(1, 10000) for _ in range(tamaño)]
-            
+
+def comparar_algoritmos(tamaños=[100, 500, 1000, 2000], distribuciones=DISTRIBUCIONES,
+                        algoritmos=None, repeticiones=5, calentamiento=1,
+                        salida_json=None, linea_base=None, umbral=0.10, graficar=False):
+    '''
+    Compara el rendimiento de diferentes algoritmos de ordenamiento.
+
+    - salida_json: ruta donde guardar los resultados
+    - linea_base: ruta de un JSON anterior; se informan las regresiones cuya
+      mediana empeore más del `umbral` (10% por defecto)
+    - graficar: dibuja los resultados con matplotlib (se importa solo si se pide)
+
+    Las estadísticas de ordenar() se reinician al empezar, de modo que el
+    informe final muestra solo las decisiones tomadas durante la comparación.
+    '''
+    algoritmos = algoritmos or ALGORITMOS
+    resultados = []
+    ESTADISTICAS_ORDENAR.clear()
+
+    for distribucion in distribuciones:
+        for tamaño in tamaños:
+            datos = generar_datos(distribucion, tamaño)
+            print(f"\nDistribución '{distribucion}', tamaño {tamaño}:")
+
             for nombre, algoritmo in algoritmos.items():
-                lista_copia = lista.copy()
-                
-                # Medir tiempo de ejecución
-                inicio = time.time()
-                algoritmo(lista_copia)
-                fin = time.time()
-                
-                tiempo = fin - inicio
-                print(f"{nombre}: {tiempo:.6f} segundos")
-                
-                resultados[nombre].append((tamaño, tiempo))
-    
-    # Graficar resultados
-    plt.figure(figsize=(12, 8))
-    
-    for nombre, datos in resultados.items():
-        tamaños_alg = [dato[0] for dato in datos]
-        tiempos = [dato[1] for dato in datos]
-        
-        # Calcular promedios para cada tamaño
-        tamaños_unicos = sorted(set(tamaños_alg))
-        tiempos_promedio = []
-        
-        for t in tamaños_unicos:
-            tiempos_t = [tiempos[i] for i in range(len(tiempos)) if tamaños_alg[i] == t]
-            tiempos_promedio.append(sum(tiempos_t) / len(tiempos_t))
-        
-        plt.plot(tamaños_unicos, tiempos_promedio, marker='o', label=nombre)
-    
-    plt.title("Comparación de Algoritmos de Ordenamiento")
-    plt.xlabel("Tamaño de la lista")
-    plt.ylabel("Tiempo (segundos)")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("comparacion_algoritmos.png")
+                try:
+                    medicion = medir(algoritmo, datos, repeticiones, calentamiento)
+                except RecursionError:
+                    # Un algoritmo recursivo con mala elección de pivote puede superar el límite de recursión
+                    print(f"  {nombre:<15} RecursionError")
+                    continue
+                except TypeError:
+                    # Counting y Radix Sort solo aceptan enteros (o bytes); en
+                    # cualquier otro algoritmo es un error que no se debe ocultar
+                    if nombre not in SOLO_ENTEROS:
+                        raise
+                    print(f"  {nombre:<15} no aplicable")
+                    continue
+
+                print(f"  {nombre:<15} mediana {medicion['mediana_ns'] / 1e6:10.3f} ms  "
+                      f"IQR {medicion['iqr_ns'] / 1e6:8.3f} ms  "
+                      f"pico {medicion['pico_bytes'] / 1024:8.1f} KB")
+                resultados.append({"algoritmo": nombre, "distribucion": distribucion,
+                                   "n": tamaño, **medicion})
+
+    despachos = informe_ordenar() if ESTADISTICAS_ORDENAR else []
+
+    if salida_json:
+        guardar_resultados(resultados, salida_json, despachos)
+    if linea_base:
+        regresiones = comparar_con_linea_base(resultados, linea_base, umbral)
+        print(f"\n{len(regresiones)} regresiones respecto a {linea_base}")
+        for r in regresiones:
+            print(f"  {r['algoritmo']} ({r['distribucion']}, n={r['n']}): "
+                  f"{r['anterior_ns'] / 1e6:.3f} ms -> {r['actual_ns'] / 1e6:.3f} ms (x{r['factor']:.2f})")
+    if graficar:
+        graficar_resultados(resultados)
+
+    return resultados
+
+def guardar_resultados(resultados, ruta, despachos=()):
+    '''Guarda los resultados en JSON junto con datos del entorno y las decisiones de ordenar()'''
+    documento = {
+        "metadatos": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "resultados": resultados,
+        "despachos": list(despachos),
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(documento, archivo, indent=2)
+
+def comparar_con_linea_base(resultados, ruta, umbral=0.10):
+    '''Devuelve las mediciones cuya mediana empeora más de `umbral` respecto a la línea base'''
+    with open(ruta, encoding="utf-8") as archivo:
+        anteriores = {
+            (r["algoritmo"], r["distribucion"], r["n"]): r
+            for r in json.load(archivo)["resultados"]
+        }
+
+    regresiones = []
+    for r in resultados:
+        anterior = anteriores.get((r["algoritmo"], r["distribucion"], r["n"]))
+        if anterior is None:
+            continue
+        factor = r["mediana_ns"] / anterior["mediana_ns"]
+        if factor > 1 + umbral:
+            regresiones.append({**r, "anterior_ns": anterior["mediana_ns"],
+                                "actual_ns": r["mediana_ns"], "factor": factor})
+    return regresiones
+
+def graficar_resultados(resultados):
+    # matplotlib tarda en importarse: solo se carga cuando se pide un gráfico
+    import matplotlib.pyplot as plt
+
+    for distribucion in sorted({r["distribucion"] for r in resultados}):
+        plt.figure(figsize=(12, 8))
+        for nombre in dict.fromkeys(r["algoritmo"] for r in resultados):
+            puntos = [(r["n"], r["mediana_ns"] / 1e9) for r in resultados
+                      if r["algoritmo"] == nombre and r["distribucion"] == distribucion]
+            if puntos:
+                plt.plot(*zip(*puntos), marker='o', label=nombre)
+
+        plt.title(f"Comparación de Algoritmos de Ordenamiento ({distribucion})")
+        plt.xlabel("Tamaño de la lista")
+        plt.ylabel("Tiempo mediano (segundos)")
+        plt.legend()
+        plt.grid(True)
+        plt.savefig(f"comparacion_algoritmos_{distribucion}.png")
     plt.show()
 
 ################################################################################
@@ -259,9 +1006,62 @@ print(f"Merge Sort: {merge_sort(lista_ejemplo.copy())}")
 print(f"Quick Sort: {quick_sort(lista_ejemplo.copy())}")
 print(f"Heap Sort: {heap_sort(lista_ejemplo.copy())}")
 print(f"Python Sort: {python_sort(lista_ejemplo.copy())}")
+print(f"Counting Sort: {counting_sort(lista_ejemplo)}")
+print(f"Radix Sort: {radix_sort(lista_ejemplo)}")
+
+# Radix sort con claves de bytes de ancho fijo y con key
+direcciones = [b"\x0a\x00\x00\x02", b"\x0a\x00\x00\x01", b"\xc0\xa8\x01\x01"]
+print(f"Radix Sort (bytes): {radix_sort(direcciones)}")
+print(f"Radix Sort (key): {radix_sort(['pera', 'kiwi', 'banana'], key=len)}")
+
+# El despachador elige counting sort para muchos enteros en un rango pequeño,
+# y sorted() para pocos enteros en un rango enorme
+edades = [random.randint(0, 120) for _ in range(200_000)]
+print(f"Elección para 200000 edades: {elegir_ordenamiento_enteros(len(edades), 121)}")
+print(f"Elección para 1000 ids de 32 bits: {elegir_ordenamiento_enteros(1000, 2**32)}")
+
+# Ordenamiento externo de un registro por marca de tiempo, con un presupuesto
+# de memoria pequeño para forzar varios tramos en disco
+with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False, encoding="utf-8") as registro:
+    ruta_registro = registro.name
+    for _ in range(50_000):
+        registro.write(f"{random.randint(0, 10**9):010d} INFO evento {random.randint(1, 100)}\n")
+
+with open(ruta_registro, encoding="utf-8") as registro:
+    marca_de_tiempo = lambda linea: linea[:10]
+    ordenadas = list(ordenamiento_externo(registro, key=marca_de_tiempo, memoria_maxima=512 * 1024))
+
+with open(ruta_registro, encoding="utf-8") as registro:
+    print(f"\nOrdenamiento externo correcto: {ordenadas == sorted(registro, key=marca_de_tiempo)}")
+os.remove(ruta_registro)
+
+# Ordenamiento adaptativo: cada entrada se perfila y se elige un motor
+print(f"\nOrdenar (auto): {ordenar(lista_ejemplo)}")
+ordenar(edades)
+ordenar(generar_datos("cadenas", 5000))
+ordenar(generar_datos("tuplas", 5000), key=lambda t: t[1])
+informe_ordenar()
 
 # Comparar rendimiento (descomenta para ejecutar)
-# comparar_algoritmos()
+# comparar_algoritmos(salida_json="linea_base.json")
+# comparar_algoritmos(linea_base="linea_base.json")  # Detectar regresiones
+# comparar_algoritmos(graficar=True)
+# calibrar_ordenar()  # Sustituir la tabla medida por mediciones de esta máquina
+
+# merge_sort_paralelo crea procesos: en sistemas que usan "spawn" (Windows,
+# macOS) los procesos importan este archivo, así que solo se lanza si se
+# ejecuta directamente
+if __name__ == "__main__":
+    numeros = [random.randint(-10**9, 10**9) for _ in range(300_000)]
+
+    inicio = time.perf_counter()
+    secuencial = merge_sort(numeros)
+    print(f"\nMerge Sort secuencial: {time.perf_counter() - inicio:.3f} s")
+
+    inicio = time.perf_counter()
+    paralelo = merge_sort(numeros, procesos=os.cpu_count() or 1)
+    print(f"Merge Sort paralelo ({os.cpu_count()} núcleos): {time.perf_counter() - inicio:.3f} s")
+    print(f"¿Mismo resultado? {paralelo == secuencial == sorted(numeros)}")
 
 ################################################################################
 # Aplicaciones Prácticas
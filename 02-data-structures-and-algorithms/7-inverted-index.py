@@ -0,0 +1,425 @@
+"""
+  Índice Invertido en Python
+
+  Este archivo amplía el índice invertido de 02-hash-tables.py hasta un
+  pequeño motor de búsqueda capaz de manejar millones de documentos en memoria:
+  listas de apariciones (postings) de enteros comprimidas, intersección por
+  búsqueda galopante y ranking BM25.
+"""
+
+import heapq
+import math
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+################################################################################
+## Compresión de listas de apariciones: delta + varint
+################################################################################
+
+'''
+Guardar un set de cadenas ("doc1", "doc2"...) por palabra ocupa decenas de
+bytes por aparición. Si los documentos se identifican con enteros crecientes,
+cada lista de apariciones está ordenada y basta con guardar la diferencia
+(delta) con el anterior. Esas diferencias suelen ser pequeñas, y con varint un
+número menor que 128 ocupa un solo byte:
+
+    ids:     [3, 7, 8, 200]
+    deltas:  [3, 4, 1, 192]
+    varint:  03 04 01 C0 01   (5 bytes)
+'''
+
+def codificar_varint(numero, destino):
+    '''Añade `numero` (entero >= 0) a `destino` usando 7 bits por byte'''
+    while numero >= 0x80:
+        destino.append((numero & 0x7F) | 0x80)
+        numero >>= 7
+    destino.append(numero)
+
+def decodificar_varints(datos):
+    '''Decodifica todos los varints de `datos` y los devuelve en una lista'''
+    resultado = []
+    numero = 0
+    desplazamiento = 0
+    for byte in datos:
+        numero |= (byte & 0x7F) << desplazamiento
+        if byte & 0x80:
+            desplazamiento += 7
+        else:
+            resultado.append(numero)
+            numero = 0
+            desplazamiento = 0
+    return resultado
+
+################################################################################
+## Listas de apariciones por bloques con tabla de saltos
+################################################################################
+
+'''
+Con una sola secuencia delta + varint, leer una aparición obliga a decodificar
+todas las anteriores, así que galopar no ahorraría nada. Por eso las apariciones
+se guardan en bloques de TAMAÑO_BLOQUE pares (doc, tf), y una tabla de saltos
+guarda por bloque su primer doc y su posición en los bytes:
+
+    primeros:   [3, 950, 2210, ...]
+    posiciones: [0, 190, 377, ...]
+
+Cada bloque se decodifica por separado (su primer delta se cuenta desde su
+primer doc), y un Cursor galopa por `primeros` y solo decodifica los bloques
+donde cae.
+'''
+
+TAMAÑO_BLOQUE = 128
+
+class ListaApariciones:
+    __slots__ = ("datos", "primeros", "posiciones", "ultimo", "cuenta")
+
+    def __init__(self):
+        self.datos = bytearray()     # Pares varint (delta de doc, tf)
+        self.primeros = array('q')   # Tabla de saltos: primer doc de cada bloque
+        self.posiciones = array('q') # y posición de cada bloque en `datos`
+        self.ultimo = 0
+        self.cuenta = 0
+
+    def __len__(self):
+        return self.cuenta
+
+    def agregar(self, doc, tf):
+        '''Añade un doc mayor que todos los anteriores'''
+        if self.cuenta % TAMAÑO_BLOQUE == 0:
+            self.primeros.append(doc)
+            self.posiciones.append(len(self.datos))
+            self.ultimo = doc
+        codificar_varint(doc - self.ultimo, self.datos)
+        codificar_varint(tf, self.datos)
+        self.ultimo = doc
+        self.cuenta += 1
+
+    def bloque(self, i):
+        '''Devuelve (docs, tfs) del bloque i'''
+        fin = self.posiciones[i + 1] if i + 1 < len(self.posiciones) else len(self.datos)
+        numeros = decodificar_varints(memoryview(self.datos)[self.posiciones[i]:fin])
+        docs = []
+        doc = self.primeros[i]
+        for delta in numeros[0::2]:
+            doc += delta
+            docs.append(doc)
+        return docs, numeros[1::2]
+
+    def decodificar(self):
+        '''Devuelve (docs, tfs) de la lista completa'''
+        docs, tfs = [], []
+        for i in range(len(self.primeros)):
+            docs_bloque, tfs_bloque = self.bloque(i)
+            docs += docs_bloque
+            tfs += tfs_bloque
+        return docs, tfs
+
+    def bytes_usados(self):
+        return sys.getsizeof(self.datos) + sys.getsizeof(self.primeros) + sys.getsizeof(self.posiciones)
+
+class Cursor:
+    '''Recorre una ListaApariciones hacia delante decodificando solo los bloques que visita'''
+
+    def __init__(self, lista):
+        self.lista = lista
+        self.numero_bloque = -1
+        self.docs = []
+        self.tfs = []
+        self.posicion = 0
+
+    def _cargar(self, i):
+        self.numero_bloque = i
+        self.docs, self.tfs = self.lista.bloque(i)
+        self.posicion = 0
+
+    def buscar(self, objetivo):
+        '''
+        Avanza hasta el primer doc >= objetivo y devuelve (doc, tf), o None si
+        no queda ninguno. Los objetivos deben llegar en orden creciente.
+        '''
+        if self.docs and objetivo <= self.docs[-1]:
+            self.posicion = _galopar(self.docs, objetivo, self.posicion)
+            return self.docs[self.posicion], self.tfs[self.posicion]
+
+        # Galopar por la tabla de saltos: el doc buscado está en el último
+        # bloque cuyo primer doc es <= objetivo
+        primeros = self.lista.primeros
+        i = _galopar(primeros, objetivo, max(self.numero_bloque, 0))
+        if i == len(primeros) or primeros[i] != objetivo:
+            i -= 1
+        i = max(i, self.numero_bloque + 1)  # El bloque cargado ya no tiene nada >= objetivo
+        if i >= len(primeros):
+            return None
+        self._cargar(i)
+        self.posicion = bisect_left(self.docs, objetivo)
+        if self.posicion == len(self.docs):
+            # Cae entre el final de este bloque y el principio del siguiente
+            if i + 1 >= len(primeros):
+                return None
+            self._cargar(i + 1)
+        return self.docs[self.posicion], self.tfs[self.posicion]
+
+################################################################################
+## Intersección con búsqueda galopante
+################################################################################
+
+def _galopar(lista, objetivo, inicio):
+    '''
+    Devuelve la primera posición >= inicio con lista[pos] >= objetivo.
+    Avanza en saltos de 1, 2, 4, 8... y termina con una búsqueda binaria en el
+    último tramo, así que cuesta O(log d) siendo d la distancia recorrida.
+    '''
+    salto = 1
+    fin = inicio
+    while fin < len(lista) and lista[fin] < objetivo:
+        inicio = fin + 1
+        fin += salto
+        salto *= 2
+    return bisect_left(lista, objetivo, inicio, min(fin + 1, len(lista)))
+
+def intersectar(listas):
+    '''
+    Intersección de listas ordenadas empezando por la más corta: cada candidato
+    de la lista pequeña se busca galopando en las demás, de modo que el coste
+    depende del tamaño de la lista más corta y no de la más larga.
+    '''
+    if not listas:
+        return []
+    listas = sorted(listas, key=len)
+    resultado = listas[0]
+
+    for lista in listas[1:]:
+        siguiente = []
+        posicion = 0
+        for doc in resultado:
+            posicion = _galopar(lista, doc, posicion)
+            if posicion == len(lista):
+                break
+            if lista[posicion] == doc:
+                siguiente.append(doc)
+        resultado = siguiente
+        if not resultado:
+            break
+
+    return resultado
+
+################################################################################
+## Índice invertido con ranking BM25
+################################################################################
+
+'''
+BM25 puntúa un documento d para una consulta sumando, por cada término t:
+
+    idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * |d| / longitud_media))
+
+- tf: apariciones de t en d
+- idf(t) = log(1 + (N - df + 0.5) / (df + 0.5)), con df = documentos que contienen t
+- k1 controla la saturación de tf y b la normalización por longitud
+'''
+
+class IndiceInvertido:
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+
+        # Por término: ListaApariciones y df (sin contar los eliminados)
+        self.apariciones = {}
+        self.frecuencia_documental = {}
+
+        # Por documento interno (entero): id externo, longitud en términos y
+        # términos distintos (para actualizar df al eliminarlo)
+        self.ids_externos = []
+        self.ids_internos = {}
+        self.longitudes = []
+        self.terminos_doc = []
+        self.eliminados = set()
+        self.longitud_total = 0
+
+    @staticmethod
+    def tokenizar(texto):
+        return re.findall(r"\w+", texto.lower())
+
+    def __len__(self):
+        return len(self.ids_internos)
+
+    def agregar_documento(self, doc_id, texto):
+        if doc_id in self.ids_internos:
+            raise ValueError(f"El documento {doc_id} ya está indexado")
+
+        # Los ids internos crecen siempre, así que las listas se amplían por el final
+        interno = len(self.ids_externos)
+        self.ids_externos.append(doc_id)
+        self.ids_internos[doc_id] = interno
+
+        terminos = self.tokenizar(texto)
+        self.longitudes.append(len(terminos))
+        self.longitud_total += len(terminos)
+
+        conteo = Counter(terminos)
+        self.terminos_doc.append(tuple(map(sys.intern, conteo)))
+        for termino, tf in conteo.items():
+            lista = self.apariciones.get(termino)
+            if lista is None:
+                lista = self.apariciones[termino] = ListaApariciones()
+            lista.agregar(interno, tf)
+            self.frecuencia_documental[termino] = self.frecuencia_documental.get(termino, 0) + 1
+
+    def eliminar_documento(self, doc_id):
+        '''
+        Marca el documento como eliminado. Las listas comprimidas no se tocan
+        hasta compactar(), que se lanza sola cuando los eliminados pasan del 20%,
+        pero df se actualiza ya para que el idf de BM25 sea correcto.
+        '''
+        interno = self.ids_internos.pop(doc_id, None)
+        if interno is None:
+            raise KeyError(f"Documento no encontrado: {doc_id}")
+
+        self.eliminados.add(interno)
+        self.longitud_total -= self.longitudes[interno]
+        for termino in self.terminos_doc[interno]:
+            self.frecuencia_documental[termino] -= 1
+        self.terminos_doc[interno] = None
+
+        if len(self.eliminados) > 0.2 * len(self.ids_externos):
+            self.compactar()
+
+    def compactar(self):
+        '''Reescribe las listas de apariciones sin los documentos eliminados'''
+        for termino, anterior in list(self.apariciones.items()):
+            lista = ListaApariciones()
+            for doc, tf in zip(*anterior.decodificar()):
+                if doc not in self.eliminados:
+                    lista.agregar(doc, tf)
+
+            if lista.cuenta:
+                self.apariciones[termino] = lista
+            else:
+                del self.apariciones[termino]
+                del self.frecuencia_documental[termino]
+
+        # Los ids internos no se reutilizan; solo se libera el id externo
+        for interno in self.eliminados:
+            self.ids_externos[interno] = None
+        self.eliminados.clear()
+
+    def buscar(self, consulta, k=10):
+        '''Documentos que contienen todos los términos, ordenados por BM25'''
+        terminos = list(dict.fromkeys(self.tokenizar(consulta)))
+        if not terminos or any(t not in self.apariciones for t in terminos):
+            return []
+
+        # Intersección como en intersectar(): solo la lista más corta se
+        # decodifica entera; en las demás un Cursor galopa hasta cada candidato
+        # y únicamente decodifica los bloques donde cae
+        terminos.sort(key=lambda t: len(self.apariciones[t]))
+        docs, tfs = self.apariciones[terminos[0]].decodificar()
+        cursores = [Cursor(self.apariciones[t]) for t in terminos[1:]]
+        coincidencias = []  # (doc, tf de cada término)
+        for doc, tf in zip(docs, tfs):
+            tfs_doc = [tf]
+            for cursor in cursores:
+                encontrado = cursor.buscar(doc)
+                if encontrado is None or encontrado[0] != doc:
+                    break
+                tfs_doc.append(encontrado[1])
+            else:
+                if doc not in self.eliminados:
+                    coincidencias.append((doc, tfs_doc))
+                continue
+            if encontrado is None:
+                break  # Una lista se agotó: no puede haber más coincidencias
+        if not coincidencias:
+            return []
+
+        n = len(self.ids_internos)
+        longitud_media = self.longitud_total / n
+        idfs = [math.log(1 + (n - df + 0.5) / (df + 0.5))
+                for df in (self.frecuencia_documental[t] for t in terminos)]
+        puntuaciones = {}
+        for doc, tfs_doc in coincidencias:
+            normalizacion = 1 - self.b + self.b * self.longitudes[doc] / longitud_media
+            puntuaciones[doc] = sum(idf * tf * (self.k1 + 1) / (tf + self.k1 * normalizacion)
+                                    for idf, tf in zip(idfs, tfs_doc))
+
+        mejores = heapq.nlargest(k, puntuaciones.items(), key=lambda par: par[1])
+        return [(self.ids_externos[doc], puntuacion) for doc, puntuacion in mejores]
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+print("--- Índice invertido con BM25 ---")
+
+documentos = {
+    "doc1": "Python es un lenguaje de programación versátil",
+    "doc2": "Las tablas hash son estructuras de datos eficientes",
+    "doc3": "Python utiliza tablas hash en sus diccionarios",
+    "doc4": "Las tablas hash de Python: tablas y más tablas",
+}
+
+indice = IndiceInvertido()
+for doc_id, contenido in documentos.items():
+    indice.agregar_documento(doc_id, contenido)
+
+consulta = "python tablas"
+print(f"Resultados para '{consulta}':")
+for doc_id, puntuacion in indice.buscar(consulta):
+    print(f"  {doc_id} ({puntuacion:.3f}): {documentos[doc_id]}")
+
+indice.eliminar_documento("doc4")
+print(f"Tras eliminar doc4: {indice.buscar(consulta)}")
+
+# Comparación de memoria con el índice de sets de cadenas
+import random
+import time
+
+print("\n--- Memoria de las listas de apariciones ---")
+
+vocabulario = [f"palabra{i}" for i in range(2000)]
+grande = IndiceInvertido()
+ingenuo = {}
+n_docs = 20000
+for i in range(n_docs):
+    doc_id = f"doc{i}"
+    texto = " ".join(random.choices(vocabulario, k=30))
+    grande.agregar_documento(doc_id, texto)
+    for palabra in set(texto.split()):
+        ingenuo.setdefault(palabra, set()).add(doc_id)
+
+# Las cadenas de los ids se comparten entre sets, así que se cuentan una vez
+bytes_comprimidos = sum(lista.bytes_usados() for lista in grande.apariciones.values())
+bytes_sets = (sum(sys.getsizeof(s) for s in ingenuo.values())
+              + sum(sys.getsizeof(doc_id) for doc_id in grande.ids_externos))
+print(f"Sets de cadenas: {bytes_sets / 1e6:.1f} MB")
+print(f"Delta + varint:  {bytes_comprimidos / 1e6:.1f} MB (con tablas de saltos)")
+print(f"Búsqueda 'palabra1 palabra2': {grande.buscar('palabra1 palabra2', k=3)}")
+
+# Un término raro y otro presente en todos los documentos: la búsqueda solo
+# decodifica los bloques de "comun" donde caen los 10 candidatos
+print("\n--- Término raro con término frecuente ---")
+for i in range(n_docs, 5 * n_docs):
+    grande.agregar_documento(f"doc{i}", "comun " + ("raro" if i % 8000 == 0 else ""))
+
+inicio = time.perf_counter()
+resultados = grande.buscar("raro comun")
+print(f"buscar('raro comun'): {len(resultados)} resultados en {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+inicio = time.perf_counter()
+grande.apariciones["comun"].decodificar()
+print(f"Decodificar la lista entera de 'comun': {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Identificar documentos con enteros crecientes permite comprimir las listas
+   con delta + varint (normalmente 1-2 bytes por aparición)
+2. Intersectar empezando por la lista más corta y galopando en las demás hace
+   que el coste dependa de la lista pequeña; con bloques y una tabla de saltos
+   solo se decodifican los bloques donde cae cada salto
+3. BM25 ordena los resultados por relevancia usando tf, df y la longitud del documento
+4. Las eliminaciones se marcan y se aplican en bloque al compactar
+'''
@@ -0,0 +1,155 @@
+"""
+  Conteo de Palabras en Paralelo
+
+  Este archivo lleva el conteo de frecuencias de 02-hash-tables.py y el
+  pipeline con Counter de 11-generator-expressions.py a archivos de varios GB:
+  el archivo se divide en fragmentos de bytes, cada fragmento se cuenta en un
+  proceso distinto y los contadores parciales se combinan en forma de árbol.
+"""
+
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+################################################################################
+## División del archivo en fragmentos de bytes
+################################################################################
+
+def dividir_en_fragmentos(ruta, tamaño_fragmento=64 * 1024 * 1024):
+    '''
+    Devuelve una lista de rangos (inicio, fin) en bytes que cubren el archivo.
+    Cada corte se mueve hasta el siguiente salto de línea para no partir una
+    palabra (ni un carácter UTF-8) entre dos fragmentos.
+    '''
+    tamaño_total = os.path.getsize(ruta)
+    fragmentos = []
+
+    with open(ruta, "rb") as archivo:
+        inicio = 0
+        while inicio < tamaño_total:
+            fin = inicio + tamaño_fragmento
+            if fin >= tamaño_total:
+                fin = tamaño_total
+            else:
+                archivo.seek(fin)
+                archivo.readline()  # avanzar hasta el final de la línea
+                fin = archivo.tell()
+            fragmentos.append((inicio, fin))
+            inicio = fin
+
+    return fragmentos
+
+################################################################################
+## Conteo de un fragmento (se ejecuta en un proceso trabajador)
+################################################################################
+
+def contar_fragmento(ruta, inicio, fin):
+    '''Cuenta las palabras del rango [inicio, fin) del archivo'''
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        datos = archivo.read(fin - inicio)
+
+    # Counter sobre la lista completa de palabras es mucho más rápido que
+    # actualizar un diccionario palabra a palabra en un bucle de Python
+    return Counter(datos.decode("utf-8", errors="replace").lower().split())
+
+def _fusionar(par):
+    izquierdo, derecho = par
+    izquierdo.update(derecho)
+    return izquierdo
+
+################################################################################
+## Reducción en árbol y top-k
+################################################################################
+
+def reducir_en_arbol(contadores, executor=None):
+    '''
+    Combina los contadores por parejas en rondas sucesivas (n -> n/2 -> ...).
+    Con un executor, las fusiones de cada ronda se hacen en paralelo y la
+    profundidad es log2(n) en lugar de n fusiones seguidas en un solo núcleo.
+    '''
+    contadores = list(contadores)
+    if not contadores:
+        return Counter()
+
+    while len(contadores) > 1:
+        pares = list(zip(contadores[0::2], contadores[1::2]))
+        sobrante = [contadores[-1]] if len(contadores) % 2 else []
+
+        if executor is not None:
+            contadores = list(executor.map(_fusionar, pares)) + sobrante
+        else:
+            contadores = [_fusionar(par) for par in pares] + sobrante
+
+    return contadores[0]
+
+def top_k(contador, k):
+    '''Las k palabras más frecuentes (exacto) usando un montón de tamaño k'''
+    return heapq.nlargest(k, contador.items(), key=lambda par: par[1])
+
+def contar_palabras(ruta, procesos=None, tamaño_fragmento=64 * 1024 * 1024):
+    '''Cuenta las palabras de un archivo repartiendo fragmentos entre procesos'''
+    fragmentos = dividir_en_fragmentos(ruta, tamaño_fragmento)
+
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        rutas = [ruta] * len(fragmentos)
+        inicios = [inicio for inicio, _ in fragmentos]
+        fines = [fin for _, fin in fragmentos]
+        parciales = executor.map(contar_fragmento, rutas, inicios, fines)
+        return reducir_en_arbol(parciales, executor)
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+# Los procesos trabajadores importan este archivo, así que el ejemplo solo se
+# ejecuta cuando se lanza directamente
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    vocabulario = [f"palabra{i}" for i in range(5000)] + ["python", "tabla", "hash"]
+
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False, encoding="utf-8") as archivo:
+        ruta = archivo.name
+        for _ in range(200000):
+            archivo.write(" ".join(random.choices(vocabulario, k=10)) + "\n")
+
+    print(f"Archivo de prueba: {os.path.getsize(ruta) / 1e6:.1f} MB")
+
+    # Conteo secuencial, palabra a palabra, como en 02-hash-tables.py
+    inicio = time.perf_counter()
+    secuencial = {}
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            for palabra in linea.lower().split():
+                if palabra in secuencial:
+                    secuencial[palabra] += 1
+                else:
+                    secuencial[palabra] = 1
+    print(f"Secuencial: {time.perf_counter() - inicio:.3f} s")
+
+    # Conteo paralelo por fragmentos
+    inicio = time.perf_counter()
+    paralelo = contar_palabras(ruta, tamaño_fragmento=4 * 1024 * 1024)
+    print(f"Paralelo ({os.cpu_count()} núcleos): {time.perf_counter() - inicio:.3f} s")
+
+    print(f"¿Mismo resultado? {paralelo == Counter(secuencial)}")
+    print(f"Top 3: {top_k(paralelo, 3)}")
+
+    os.remove(ruta)
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Cortar el archivo por bytes y ajustar cada corte al siguiente salto de línea
+   permite leer los fragmentos de forma independiente
+2. Cada proceso tiene su propio intérprete (sin GIL), así que el conteo escala
+   con el número de núcleos
+3. La reducción en árbol evita que un solo proceso fusione todos los parciales
+4. heapq.nlargest obtiene el top-k exacto sin ordenar todo el vocabulario
+'''
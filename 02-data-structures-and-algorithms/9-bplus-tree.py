@@ -0,0 +1,505 @@
+"""
+  Árbol B+ en Disco
+
+  04-binary-search-tree.py menciona los índices de bases de datos como
+  aplicación de los árboles de búsqueda, pero allí cada valor es un objeto Nodo
+  en memoria. Los índices reales usan árboles B+ guardados en páginas de tamaño
+  fijo dentro de un archivo, de modo que el conjunto de claves puede ser mucho
+  mayor que la memoria RAM.
+"""
+
+import os
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+################################################################################
+## ¿Qué es un árbol B+?
+################################################################################
+
+'''
+- Cada nodo es una página del archivo (4 KB) con cientos de claves, así que el
+  árbol es muy poco profundo: con 250 claves por página, 3 niveles bastan para
+  más de 15 millones de claves y una búsqueda lee solo 3 páginas.
+- Los nodos internos solo guardan claves separadoras e hijos.
+- Los valores están en las hojas, que forman una lista enlazada: un recorrido
+  por rango busca la primera hoja y luego avanza de hoja en hoja.
+
+Estructura del archivo:
+    página 0: metadatos (raíz, número de páginas)
+    página 1..n: nodos internos u hojas
+
+Las claves y los valores son enteros de 8 bytes.
+'''
+
+TAMAÑO_PAGINA = 4096
+
+# tipo (0 = hoja, 1 = interno), número de claves, página siguiente (solo hojas)
+CABECERA_PAGINA = struct.Struct("<BHQ")
+# magia, tamaño de página, raíz, número de páginas
+METADATOS = struct.Struct("<8sIQQ")
+MAGIA = b"ARBOLBP1"
+
+MAX_CLAVES_HOJA = (TAMAÑO_PAGINA - CABECERA_PAGINA.size) // 16
+MAX_CLAVES_INTERNO = (TAMAÑO_PAGINA - CABECERA_PAGINA.size - 8) // 16
+
+class Pagina:
+    __slots__ = ("id", "hoja", "claves", "hijos", "valores", "siguiente")
+
+    def __init__(self, id, hoja):
+        self.id = id
+        self.hoja = hoja
+        self.claves = []
+        self.hijos = []      # Solo nodos internos: len(claves) + 1 páginas
+        self.valores = []    # Solo hojas: un valor por clave
+        self.siguiente = 0   # Solo hojas: página de la hoja siguiente (0 = ninguna)
+
+    def codificar(self):
+        datos = bytearray(TAMAÑO_PAGINA)
+        n = len(self.claves)
+        CABECERA_PAGINA.pack_into(datos, 0, 0 if self.hoja else 1, n, self.siguiente)
+        posicion = CABECERA_PAGINA.size
+        struct.pack_into(f"<{n}q", datos, posicion, *self.claves)
+        posicion += 8 * n
+        if self.hoja:
+            struct.pack_into(f"<{n}q", datos, posicion, *self.valores)
+        else:
+            struct.pack_into(f"<{n + 1}Q", datos, posicion, *self.hijos)
+        return bytes(datos)
+
+    @classmethod
+    def decodificar(cls, id, datos):
+        tipo, n, siguiente = CABECERA_PAGINA.unpack_from(datos, 0)
+        pagina = cls(id, tipo == 0)
+        pagina.siguiente = siguiente
+        posicion = CABECERA_PAGINA.size
+        pagina.claves = list(struct.unpack_from(f"<{n}q", datos, posicion))
+        posicion += 8 * n
+        if pagina.hoja:
+            pagina.valores = list(struct.unpack_from(f"<{n}q", datos, posicion))
+        else:
+            pagina.hijos = list(struct.unpack_from(f"<{n + 1}Q", datos, posicion))
+        return pagina
+
+################################################################################
+## Caché de páginas (LRU) y registro de escritura anticipada (WAL)
+################################################################################
+
+'''
+Las páginas leídas se guardan decodificadas en una caché LRU de tamaño fijo.
+Las páginas modificadas ("sucias") no se escriben directamente en el archivo:
+
+1. confirmar() escribe primero todas las páginas sucias en el WAL (archivo
+   .wal), con un CRC por página y un registro final de confirmación, y hace fsync
+2. después las copia en su sitio dentro del archivo principal y hace fsync
+3. finalmente vacía el WAL
+
+Si el proceso se cae en el paso 2, al abrir de nuevo el árbol se encuentra un
+WAL completo y se vuelve a aplicar. Si se cae en el paso 1, el WAL no tiene
+registro de confirmación y se descarta: el archivo sigue en el estado anterior.
+Las páginas sucias no se desalojan de la caché hasta confirmarse.
+
+Nunca se confirma a mitad de una operación: una división de página modifica
+la hoja, la hoja nueva y el padre, y confirmar solo una parte dejaría en disco
+un árbol que ha perdido claves. Las páginas sucias pueden superar el tamaño de
+la caché mientras dura la operación; al terminar insertar o eliminar, si son
+demasiadas, se confirman todas juntas.
+'''
+
+REGISTRO_WAL = struct.Struct("<QI")  # id de página, crc32 de la página
+CONFIRMACION_WAL = 0xFFFFFFFFFFFFFFFF
+
+class ArbolBMas:
+    def __init__(self, ruta, paginas_en_cache=256):
+        self.ruta = ruta
+        self.ruta_wal = ruta + ".wal"
+        # Al menos un camino completo de la raíz a una hoja debe caber en la caché
+        self.paginas_en_cache = max(paginas_en_cache, 8)
+        self.cache = OrderedDict()
+        self.sucias = set()
+
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+        self.archivo = open(ruta, "w+b" if nuevo else "r+b")
+
+        if nuevo:
+            # Árbol vacío: la raíz es una hoja sin claves en la página 1
+            self.numero_paginas = 1
+            self.raiz = self._nueva_pagina(hoja=True).id
+            self.confirmar()
+        else:
+            self._recuperar_wal()
+            magia, tamaño, self.raiz, self.numero_paginas = METADATOS.unpack_from(self._leer_bloque(0))
+            if magia != MAGIA or tamaño != TAMAÑO_PAGINA:
+                raise ValueError(f"{ruta} no es un árbol B+ compatible")
+
+    # --- Acceso a páginas -----------------------------------------------------
+
+    def _leer_bloque(self, id):
+        self.archivo.seek(id * TAMAÑO_PAGINA)
+        return self.archivo.read(TAMAÑO_PAGINA)
+
+    def _pagina(self, id):
+        pagina = self.cache.get(id)
+        if pagina is not None:
+            self.cache.move_to_end(id)
+            return pagina
+
+        pagina = Pagina.decodificar(id, self._leer_bloque(id))
+        self.cache[id] = pagina
+        self._desalojar()
+        return pagina
+
+    def _desalojar(self):
+        # Quitar las páginas limpias usadas hace más tiempo
+        if len(self.cache) <= self.paginas_en_cache:
+            return
+        for id in list(self.cache):
+            if len(self.cache) <= self.paginas_en_cache:
+                break
+            if id not in self.sucias:
+                del self.cache[id]
+
+    def _marcar_sucia(self, pagina):
+        # La página pudo desalojarse (limpia) mientras se usaba: volver a retenerla
+        self.cache[pagina.id] = pagina
+        self.sucias.add(pagina.id)
+
+    def _fin_operacion(self):
+        # Solo entre operaciones: demasiadas páginas retenidas, confirmar para
+        # poder desalojarlas
+        if len(self.sucias) > self.paginas_en_cache:
+            self.confirmar()
+
+    def _nueva_pagina(self, hoja):
+        pagina = Pagina(self.numero_paginas, hoja)
+        self.numero_paginas += 1
+        self.cache[pagina.id] = pagina
+        self.sucias.add(pagina.id)
+        return pagina
+
+    # --- Confirmación y recuperación ------------------------------------------
+
+    def _metadatos(self):
+        datos = bytearray(TAMAÑO_PAGINA)
+        METADATOS.pack_into(datos, 0, MAGIA, TAMAÑO_PAGINA, self.raiz, self.numero_paginas)
+        return bytes(datos)
+
+    def _imagenes_pendientes(self):
+        # Páginas sucias codificadas más la página de metadatos
+        imagenes = [(id, self.cache[id].codificar()) for id in sorted(self.sucias)]
+        imagenes.append((0, self._metadatos()))
+        return imagenes
+
+    def _escribir_wal(self, imagenes):
+        with open(self.ruta_wal, "wb") as wal:
+            for id, datos in imagenes:
+                wal.write(REGISTRO_WAL.pack(id, zlib.crc32(datos)))
+                wal.write(datos)
+            wal.write(REGISTRO_WAL.pack(CONFIRMACION_WAL, len(imagenes)))
+            wal.flush()
+            os.fsync(wal.fileno())
+
+    def confirmar(self):
+        '''Hace duraderos todos los cambios pendientes de forma atómica'''
+        imagenes = self._imagenes_pendientes()
+
+        # 1. Escribir y sincronizar el WAL
+        self._escribir_wal(imagenes)
+
+        # 2. Aplicar las páginas en el archivo principal
+        self._aplicar(imagenes)
+
+        # 3. Vaciar el WAL
+        os.remove(self.ruta_wal)
+        self.sucias.clear()
+        self._desalojar()
+
+    def _aplicar(self, imagenes):
+        for id, datos in imagenes:
+            self.archivo.seek(id * TAMAÑO_PAGINA)
+            self.archivo.write(datos)
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+
+    def _recuperar_wal(self):
+        '''Vuelve a aplicar un WAL completo que quedó tras una caída'''
+        if not os.path.exists(self.ruta_wal):
+            return
+
+        imagenes = []
+        completo = False
+        with open(self.ruta_wal, "rb") as wal:
+            while True:
+                cabecera = wal.read(REGISTRO_WAL.size)
+                if len(cabecera) < REGISTRO_WAL.size:
+                    break
+                id, dato = REGISTRO_WAL.unpack(cabecera)
+                if id == CONFIRMACION_WAL:
+                    completo = dato == len(imagenes)
+                    break
+                datos = wal.read(TAMAÑO_PAGINA)
+                if len(datos) < TAMAÑO_PAGINA or zlib.crc32(datos) != dato:
+                    break
+                imagenes.append((id, datos))
+
+        # Un WAL incompleto corresponde a una confirmación que nunca terminó
+        if completo:
+            self._aplicar(imagenes)
+        os.remove(self.ruta_wal)
+
+    def descartar(self):
+        '''Deshace los cambios sin confirmar y vuelve al último estado en disco'''
+        self.cache.clear()
+        self.sucias.clear()
+        _, _, self.raiz, self.numero_paginas = METADATOS.unpack_from(self._leer_bloque(0))
+
+    def cerrar(self):
+        if self.sucias:
+            self.confirmar()
+        self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Con una excepción en curso, la última operación pudo quedar a medias:
+        # no se confirma nada y el archivo queda como tras la última confirmación
+        if exc_type is not None:
+            self.descartar()
+        self.cerrar()
+        return False
+
+    # --- Operaciones del árbol ------------------------------------------------
+
+    def _buscar_hoja(self, clave):
+        # Bajar desde la raíz guardando el camino de páginas internas
+        camino = []
+        pagina = self._pagina(self.raiz)
+        while not pagina.hoja:
+            camino.append(pagina)
+            pagina = self._pagina(pagina.hijos[bisect_right(pagina.claves, clave)])
+        return pagina, camino
+
+    def buscar(self, clave):
+        hoja, _ = self._buscar_hoja(clave)
+        i = bisect_left(hoja.claves, clave)
+        if i < len(hoja.claves) and hoja.claves[i] == clave:
+            return hoja.valores[i]
+        raise KeyError(f"Clave no encontrada: {clave}")
+
+    def contiene(self, clave):
+        try:
+            self.buscar(clave)
+            return True
+        except KeyError:
+            return False
+
+    def insertar(self, clave, valor):
+        self._insertar(clave, valor)
+        self._fin_operacion()
+
+    def _insertar(self, clave, valor):
+        hoja, camino = self._buscar_hoja(clave)
+        i = bisect_left(hoja.claves, clave)
+
+        # Si la clave existe, solo se actualiza el valor
+        if i < len(hoja.claves) and hoja.claves[i] == clave:
+            hoja.valores[i] = valor
+            self._marcar_sucia(hoja)
+            return
+
+        hoja.claves.insert(i, clave)
+        hoja.valores.insert(i, valor)
+        if len(hoja.claves) <= MAX_CLAVES_HOJA:
+            self._marcar_sucia(hoja)
+            return
+
+        # La hoja se desborda: dividirla en dos y subir la primera clave de la nueva
+        nueva = self._nueva_pagina(hoja=True)
+        medio = len(hoja.claves) // 2
+        nueva.claves, hoja.claves = hoja.claves[medio:], hoja.claves[:medio]
+        nueva.valores, hoja.valores = hoja.valores[medio:], hoja.valores[:medio]
+        nueva.siguiente, hoja.siguiente = hoja.siguiente, nueva.id
+        self._marcar_sucia(hoja)
+        self._insertar_en_padre(camino, hoja, nueva.claves[0], nueva)
+
+    def _insertar_en_padre(self, camino, izquierda, separador, derecha):
+        while camino:
+            padre = camino.pop()
+            i = bisect_right(padre.claves, separador)
+            padre.claves.insert(i, separador)
+            padre.hijos.insert(i + 1, derecha.id)
+            if len(padre.claves) <= MAX_CLAVES_INTERNO:
+                self._marcar_sucia(padre)
+                return
+
+            # El nodo interno también se desborda: la clave central sube un nivel
+            nuevo = self._nueva_pagina(hoja=False)
+            medio = len(padre.claves) // 2
+            separador = padre.claves[medio]
+            nuevo.claves, padre.claves = padre.claves[medio + 1:], padre.claves[:medio]
+            nuevo.hijos, padre.hijos = padre.hijos[medio + 1:], padre.hijos[:medio + 1]
+            self._marcar_sucia(padre)
+            izquierda, derecha = padre, nuevo
+
+        # Se dividió la raíz: el árbol crece un nivel
+        raiz = self._nueva_pagina(hoja=False)
+        raiz.claves = [separador]
+        raiz.hijos = [izquierda.id, derecha.id]
+        self.raiz = raiz.id
+
+    def eliminar(self, clave):
+        '''
+        Elimina la clave de su hoja sin fusionar páginas (como muchos motores,
+        las hojas poco llenas se reaprovechan en inserciones posteriores)
+        '''
+        hoja, _ = self._buscar_hoja(clave)
+        i = bisect_left(hoja.claves, clave)
+        if i == len(hoja.claves) or hoja.claves[i] != clave:
+            raise KeyError(f"Clave no encontrada: {clave}")
+        del hoja.claves[i]
+        del hoja.valores[i]
+        self._marcar_sucia(hoja)
+        self._fin_operacion()
+
+    def rango(self, lo, hi):
+        '''Genera los pares (clave, valor) con lo <= clave <= hi recorriendo las hojas enlazadas'''
+        hoja, _ = self._buscar_hoja(lo)
+        i = bisect_left(hoja.claves, lo)
+        while True:
+            claves, valores = hoja.claves, hoja.valores
+            while i < len(claves):
+                if claves[i] > hi:
+                    return
+                yield claves[i], valores[i]
+                i += 1
+            if hoja.siguiente == 0:
+                return
+            hoja = self._pagina(hoja.siguiente)
+            i = 0
+
+    def carga_masiva(self, pares, llenado=0.9):
+        '''
+        Construye el árbol de abajo arriba a partir de pares (clave, valor)
+        ordenados por clave: llena hojas consecutivas y luego cada nivel interno.
+        Es mucho más rápido que insertar una a una y deja las páginas llenas al
+        `llenado` indicado. Solo puede usarse con el árbol vacío.
+
+        Las claves pueden no caber en memoria: cada página se escribe en el
+        archivo en cuanto se llena y la caché puede desalojarla como cualquier
+        página limpia. Son páginas nuevas, a las que nada apunta hasta que al
+        final se confirman la raíz y los metadatos en el WAL, así que una caída
+        a mitad de la carga deja el árbol vacío de antes.
+        '''
+        if self._pagina(self.raiz).claves:
+            raise ValueError("carga_masiva requiere un árbol vacío")
+
+        por_hoja = max(1, int(MAX_CLAVES_HOJA * llenado))
+        nivel = []  # (primera clave, id de página) de cada nodo del nivel actual
+        hoja = None
+        anterior = None
+
+        for clave, valor in pares:
+            if anterior is not None and clave <= anterior:
+                raise ValueError("Las claves deben estar ordenadas y sin repetir")
+            anterior = clave
+
+            if hoja is None or len(hoja.claves) == por_hoja:
+                nueva = Pagina(self._reservar_pagina(), hoja=True)
+                if hoja is not None:
+                    hoja.siguiente = nueva.id
+                    self._escribir_directa(hoja)
+                nivel.append((clave, nueva.id))
+                hoja = nueva
+            hoja.claves.append(clave)
+            hoja.valores.append(valor)
+        if hoja is None:
+            return  # Sin pares: el árbol sigue vacío
+        self._escribir_directa(hoja)
+
+        # Construir los niveles internos hasta que quede una sola raíz
+        por_interno = max(2, int(MAX_CLAVES_INTERNO * llenado))
+        while len(nivel) > 1:
+            siguiente_nivel = []
+            for inicio in range(0, len(nivel), por_interno + 1):
+                grupo = nivel[inicio:inicio + por_interno + 1]
+                interno = Pagina(self._reservar_pagina(), hoja=False)
+                interno.hijos = [id for _, id in grupo]
+                interno.claves = [clave for clave, _ in grupo[1:]]
+                siguiente_nivel.append((grupo[0][0], interno.id))
+                self._escribir_directa(interno)
+            nivel = siguiente_nivel
+
+        # Las páginas deben estar en disco antes de que los metadatos apunten a ellas
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+        self.raiz = nivel[0][1]
+        self.confirmar()
+
+    def _reservar_pagina(self):
+        id = self.numero_paginas
+        self.numero_paginas += 1
+        return id
+
+    def _escribir_directa(self, pagina):
+        # Solo para páginas que aún no son alcanzables: no pasan por el WAL
+        self.archivo.seek(pagina.id * TAMAÑO_PAGINA)
+        self.archivo.write(pagina.codificar())
+        self.cache[pagina.id] = pagina
+        self._desalojar()
+
+################################################################################
+## Ejemplo de uso
+################################################################################
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    ruta = os.path.join(tempfile.mkdtemp(), "indice.bpt")
+    n = 200000
+
+    # Carga masiva desde datos ordenados, con una caché mucho menor que el
+    # árbol: las páginas terminadas van al archivo y se desalojan
+    inicio = time.perf_counter()
+    with ArbolBMas(ruta, paginas_en_cache=16) as arbol:
+        arbol.carga_masiva((clave * 2, clave) for clave in range(n))
+        print(f"Carga masiva de {n} claves: {time.perf_counter() - inicio:.3f} s, "
+              f"{os.path.getsize(ruta) / 1e6:.1f} MB en disco")
+        print(f"Páginas escritas: {arbol.numero_paginas}, páginas en caché: "
+              f"{len(arbol.cache)} (límite {arbol.paginas_en_cache})")
+        assert len(arbol.cache) <= arbol.paginas_en_cache
+
+    # Reabrir con una caché pequeña: solo se leen las páginas necesarias
+    with ArbolBMas(ruta, paginas_en_cache=32) as arbol:
+        print(f"buscar(1000) -> {arbol.buscar(1000)}")
+        print(f"¿Contiene 1001? {arbol.contiene(1001)}")
+
+        for clave in random.sample(range(2 * n), 5000):
+            arbol.insertar(clave, -clave)
+        arbol.eliminar(10)
+        print(f"Rango [0, 20]: {list(arbol.rango(0, 20))}")
+
+    # Simular una caída a mitad de una confirmación: el WAL está completo pero
+    # las páginas no llegaron al archivo principal
+    arbol = ArbolBMas(ruta)
+    arbol.insertar(-1, 123)
+    arbol._escribir_wal(arbol._imagenes_pendientes())
+    arbol.archivo.close()
+
+    with ArbolBMas(ruta) as recuperado:
+        print(f"Tras recuperar el WAL, buscar(-1) -> {recuperado.buscar(-1)}")
+
+################################################################################
+## Conclusiones
+################################################################################
+
+'''
+1. Las páginas de tamaño fijo con cientos de claves hacen el árbol muy poco
+   profundo: pocas lecturas de disco por búsqueda
+2. Las hojas enlazadas convierten un recorrido por rango en una lectura secuencial
+3. La carga masiva de abajo arriba evita las divisiones de páginas
+4. El WAL hace que cada confirmación sea atómica frente a caídas
+'''
@@ -80,18 +80,24 @@ for e in ordenados_por_nombre:
 # Recordando nuestros algoritmos de ordenamiento, podemos usar lambdas
 # para personalizar el criterio de ordenamiento
 
+import importlib
+
+# El introsort es el mismo que usa quick_sort en 6-sorting-algorithms.py. La
+# carpeta 02-data-structures-and-algorithms se importa como paquete desde la
+# raíz del repositorio (el nombre con guiones obliga a usar importlib)
+ordenacion = importlib.import_module("02-data-structures-and-algorithms.14-introsort")
+
 def quick_sort_con_key(arr, key=lambda x: x):
-    '''Quick sort que acepta una función key para determinar el orden'''
-    if len(arr) <= 1:
-        return arr
-    
-    pivote = arr[-1]
-    pivote_valor = key(pivote)
-    
-    menores = [x for x in arr[:-1] if key(x) <= pivote_valor]
-    mayores = [x for x in arr[:-1] if key(x) > pivote_valor]
-    
-    return quick_sort_con_key(menores, key) + [pivote] + quick_sort_con_key(mayores, key)
+    '''
+    Quick sort que acepta una función key para determinar el orden.
+
+    La key se evalúa una sola vez por elemento: se ordenan tuplas
+    (clave, índice, elemento) y al final se extraen los elementos
+    (decorar-ordenar-desdecorar). El índice desempata, así que el orden es
+    estable y nunca se comparan los elementos en sí.
+    Devuelve una lista nueva; la original no se modifica.
+    '''
+    return ordenacion.introsort(list(arr), key=key)
 
 # Ejemplo: ordenar una lista de tuplas por el segundo elemento
 datos = [(1, 5), (3, 2), (2, 8), (4, 3)]